@@ -0,0 +1,56 @@
+"""
+Eventos por segundo do `ModeloFalhas` em redes com milhares de arestas ao longo de um ano simulado.
+
+Uso: python -m benchmarks.bench_falhas [--arestas 5000] [--horas 8760]
+"""
+import argparse
+import random
+import time
+
+import networkx as nx
+import simpy
+
+from src.simulacao import Simulacao
+
+
+def criar_rede(n_arestas, semente=0):
+    rng = random.Random(semente)
+    grafo = nx.gnm_random_graph(max(2, n_arestas // 3), n_arestas, seed=semente, directed=True)
+    for u, v in grafo.edges:
+        grafo[u][v].update(custo=rng.uniform(1, 10), capacidade=rng.uniform(50, 100))
+    return grafo
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--arestas", type=int, default=5000)
+    parser.add_argument("--horas", type=float, default=8760)
+    parser.add_argument("--mtbf", type=float, default=500.0)
+    parser.add_argument("--mttr", type=float, default=12.0)
+    parser.add_argument("--transportes", type=int, default=20)
+    args = parser.parse_args()
+
+    for n_transportes in sorted({0, args.transportes}):
+        grafo = criar_rede(args.arestas)
+        rng = random.Random(1)
+        env = simpy.Environment()
+        simulacao = Simulacao(env, grafo, rng=random.Random(2), verbose=False)
+        modelo = simulacao.modelar_falhas(mtbf=args.mtbf, mttr=args.mttr)
+        nos = list(grafo.nodes)
+        for _ in range(n_transportes):
+            env.process(simulacao.transportar_petroleo(rng.choice(nos), rng.choice(nos)))
+
+        inicio = time.perf_counter()
+        env.run(until=args.horas)
+        duracao = time.perf_counter() - inicio
+
+        print(f"Rede: {grafo.number_of_nodes()} nós | {grafo.number_of_edges()} arestas | "
+              f"{args.horas:.0f} h simuladas | {n_transportes} processos de transporte")
+        print(f"  Eventos de falha/reparo: {modelo.n_eventos} | eventos registrados: {len(simulacao.historico)}")
+        print(f"  Tempo: {duracao:.2f}s | {modelo.n_eventos / duracao:,.0f} eventos de falha/s | "
+              f"desvios de rota: {simulacao.desvios}")
+        if n_transportes:
+            print(f"  Cache de rotas: {simulacao.cache_rotas.estatisticas()}")
+
+if __name__ == "__main__":
+    main()
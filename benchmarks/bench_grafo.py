@@ -0,0 +1,125 @@
+"""
+`GrafoCompacto` contra `networkx.DiGraph` em uma rede sintética grande (~1 milhão de arestas).
+
+Mede, para as mesmas arestas e atributos: memória retida por aresta (tracemalloc), tempo
+de construção a partir dos arrays, tempo de carga do disco (.npz contra pickle do
+networkx) e latência da rota mínima. Sai com código 1 se a memória, a construção ou a
+carga não forem pelo menos `--fator` vezes melhores que no networkx.
+
+Uso: python -m benchmarks.bench_grafo [--distribuidoras 320000] [--consultas 5] [--fator 10]
+"""
+import argparse
+import gc
+import os
+import pickle
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import networkx as nx
+
+from src.grafo_compacto import GrafoCompacto, gerar_rede_sintetica
+
+
+def cronometrar(funcao):
+    gc.collect()
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return resultado, time.perf_counter() - inicio
+
+
+def memoria_retida(funcao):
+    """Bytes alocados por `funcao` que continuam vivos no seu retorno."""
+    gc.collect()
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    resultado = funcao()
+    depois = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del resultado
+    return depois - antes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--refinarias", type=int, default=50)
+    parser.add_argument("--terminais", type=int, default=2000)
+    parser.add_argument("--portos", type=int, default=20)
+    parser.add_argument("--distribuidoras", type=int, default=320_000)
+    parser.add_argument("--consultas", type=int, default=5)
+    parser.add_argument("--fator", type=float, default=10.0, help="Ganho mínimo exigido em memória, construção e carga")
+    args = parser.parse_args()
+
+    grafo, geracao = cronometrar(lambda: gerar_rede_sintetica(args.refinarias, args.terminais, args.portos,
+                                                              args.distribuidoras))
+    m = grafo.number_of_edges()
+    print(f"Rede: {len(grafo):,} nós, {m:,} arestas | gerada em {geracao:.2f} s", flush=True)
+
+    # Mesmos dados brutos para os dois: nomes, pares de índices e colunas de atributos
+    nomes, origens, destinos = list(grafo.nomes), grafo.origens.copy(), grafo.destinos.copy()
+    colunas = {nome: grafo.atributos[nome].copy() for nome in ("custo", "distancia", "capacidade")}
+    nos = {nome: coluna.copy() for nome, coluna in grafo.atributos_nos.items()}
+    arestas_nx = [(nomes[u], nomes[v], {"custo": c, "distancia": d, "capacidade": k})
+                  for u, v, c, d, k in zip(origens.tolist(), destinos.tolist(),
+                                           *(colunas[nome].tolist() for nome in ("custo", "distancia", "capacidade")))]
+    nos_nx = [(nome, {"tipo": t, "x": x, "y": y})
+              for nome, t, x, y in zip(nomes, *(nos[chave].tolist() for chave in ("tipo", "x", "y")))]
+
+    def construir_compacto():
+        return GrafoCompacto(nomes, origens, destinos, colunas, nos)
+
+    def construir_networkx():
+        g = nx.DiGraph()
+        g.add_nodes_from(nos_nx)
+        g.add_edges_from(arestas_nx)
+        return g
+
+    compacto, tempo_compacto = cronometrar(construir_compacto)
+    original, tempo_networkx = cronometrar(construir_networkx)
+    memoria_compacto = memoria_retida(construir_compacto) / m
+    memoria_networkx = memoria_retida(construir_networkx) / m
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        npz, pkl = os.path.join(diretorio, "rede.npz"), os.path.join(diretorio, "rede.pkl")
+        compacto.salvar(npz)
+        with open(pkl, "wb") as arquivo:
+            pickle.dump(original, arquivo, protocol=pickle.HIGHEST_PROTOCOL)
+        _, carga_compacto = cronometrar(lambda: GrafoCompacto.carregar(npz))
+
+        def carregar_pickle():
+            with open(pkl, "rb") as arquivo:
+                return pickle.load(arquivo)
+        _, carga_networkx = cronometrar(carregar_pickle)
+        tamanhos = os.path.getsize(npz), os.path.getsize(pkl)
+
+    rng = random.Random(1)
+    pares = [(rng.choice(nomes[:args.portos + args.refinarias + args.terminais]), rng.choice(nomes))
+             for _ in range(args.consultas)]
+    _, rota_compacto = cronometrar(lambda: [compacto.caminho_minimo(o, d) for o, d in pares])
+    _, rota_networkx = cronometrar(lambda: [nx.has_path(original, o, d) and nx.shortest_path(original, o, d, weight="custo")
+                                            for o, d in pares])
+
+    linhas = [
+        ("memória (bytes/aresta)", memoria_compacto, memoria_networkx, "{:.0f}"),
+        ("construção (s)", tempo_compacto, tempo_networkx, "{:.2f}"),
+        ("carga do disco (s)", carga_compacto, carga_networkx, "{:.3f}"),
+        ("arquivo (MB)", tamanhos[0] / 1e6, tamanhos[1] / 1e6, "{:.1f}"),
+        ("rota mínima (s/consulta)", rota_compacto / len(pares), rota_networkx / len(pares), "{:.3f}"),
+    ]
+    print(f"\n{'':<26} {'GrafoCompacto':>14} {'networkx':>12} {'ganho':>8}")
+    ganhos = {}
+    for nome, compacto_valor, networkx_valor, formato in linhas:
+        ganhos[nome] = networkx_valor / compacto_valor if compacto_valor else float("inf")
+        print(f"{nome:<26} {formato.format(compacto_valor):>14} {formato.format(networkx_valor):>12} {ganhos[nome]:>7.1f}x")
+
+    abaixo = [nome for nome in ("memória (bytes/aresta)", "construção (s)", "carga do disco (s)") if ganhos[nome] < args.fator]
+    if abaixo:
+        print(f"\nGanho abaixo de {args.fator:.0f}x: {', '.join(abaixo)}")
+        sys.exit(1)
+    print(f"\nMemória, construção e carga ao menos {args.fator:.0f}x melhores que no networkx")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Tempo de partida da linha de comando: cada medida é um processo Python novo, como
+quando o simulador é chamado em lote por um escalonador.
+
+Mede a mediana do tempo de parede de `python -m src --help` e da importação usada por
+cada subcomando, e lista os módulos mais caros segundo `python -X importtime`. Sai com
+código 1 se `--help` passar de `--alvo-ms`.
+
+Uso: python -m benchmarks.bench_importacao [--repeticoes 7] [--alvo-ms 150] [--top 10]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Comando Python executado em processo novo para cada caso
+CASOS = {
+    "python (vazio)": "pass",
+    "--help": "import sys; sys.argv = ['src', '--help']\ntry:\n import runpy; runpy.run_module('src', run_name='__main__')\nexcept SystemExit: pass",
+    "src.cli": "import src.cli",
+    "simulate": "import src.cli, simpy, src.cenarios, src.simulacao, src.resultados",
+    "route": "import src.cli, src.cenarios, src.cache_rotas, networkx",
+    "refine": "import src.cli, src.cenarios, src.models.refinery",
+    "report": "import src.cli, src.cenarios, src.relatorios, src.resultados",
+    "generate": "import src.cli, src.grafo_compacto, scipy.spatial",
+}
+
+
+def _executar(codigo, *opcoes):
+    return subprocess.run([sys.executable, *opcoes, "-c", codigo], cwd=RAIZ, capture_output=True, text=True, check=True)
+
+
+def medir(codigo, repeticoes):
+    """Mediana (ms) do tempo de parede de um processo Python que executa `codigo`."""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        _executar(codigo)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tempos)
+
+
+def modulos_mais_caros(codigo, top=10):
+    """
+    Módulos com maior tempo acumulado de importação, segundo `-X importtime`.
+
+    :return: Lista de (módulo, tempo acumulado em ms), do mais caro ao mais barato
+    """
+    saida = _executar(codigo, "-X", "importtime").stderr
+    tempos = []
+    for linha in saida.splitlines():
+        if not linha.startswith("import time:") or "cumulative" in linha:
+            continue
+        _, acumulado, nome = (parte.strip() for parte in linha[len("import time:"):].split("|"))
+        tempos.append((nome.strip(), int(acumulado) / 1000))
+    return sorted(tempos, key=lambda item: item[1], reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticoes", type=int, default=7)
+    parser.add_argument("--alvo-ms", type=float, default=150.0, help="Limite para `python -m src --help`")
+    parser.add_argument("--top", type=int, default=10, help="Módulos listados por caso (0 = nenhum)")
+    args = parser.parse_args()
+
+    resultados = {}
+    for nome, codigo in CASOS.items():
+        resultados[nome] = medir(codigo, args.repeticoes)
+        print(f"{nome:<16} {resultados[nome]:>8.1f} ms", flush=True)
+
+    if args.top:
+        for nome in ("--help", "simulate"):
+            print(f"\nMódulos mais caros ({nome}):")
+            for modulo, ms in modulos_mais_caros(CASOS[nome], args.top):
+                print(f"  {modulo:<40} {ms:>8.1f} ms")
+
+    if resultados["--help"] > args.alvo_ms:
+        print(f"\n--help levou {resultados['--help']:.1f} ms (alvo: {args.alvo_ms:.0f} ms)")
+        sys.exit(1)
+    print(f"\n--help dentro do alvo de {args.alvo_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Vazão (amostras/s) do `PreditorFalhasOnline` comparada à previsão amostra a amostra do modelo original.
+
+Uso: python -m benchmarks.bench_previsao [--amostras 1000000]
+"""
+import argparse
+import contextlib
+import io
+import random
+import time
+import warnings
+
+import numpy as np
+import simpy
+import networkx as nx
+
+from src.models.previsao_falhas import PreditorFalhasOnline, SimulacaoML
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--amostras", type=int, default=1_000_000)
+    parser.add_argument("--lote", type=int, default=65536)
+    args = parser.parse_args()
+
+    grafo = nx.gnm_random_graph(50, 200, seed=0, directed=True)
+    env = simpy.Environment()
+    simulacao = SimulacaoML(env, grafo, rng=random.Random(0), verbose=False)
+    simulacao.modelar_falhas(mtbf=100.0, mttr=10.0)
+    for u, v in list(grafo.edges)[:50]:
+        env.process(simulacao.transportar_petroleo(u, v))
+    env.run(until=2000)
+    print(f"Histórico: {len(simulacao.historico)} eventos")
+
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        floresta = simulacao.treinar_modelo_falhas()
+    print(f"RandomForest (treino completo): {time.perf_counter() - inicio:.2f}s")
+
+    inicio = time.perf_counter()
+    preditor = PreditorFalhasOnline().consumir(simulacao.historico)
+    print(f"Online (partial_fit):           {time.perf_counter() - inicio:.2f}s")
+
+    rng = np.random.default_rng(1)
+    tempos = rng.uniform(0, 2000, args.amostras)
+    fluxos = rng.uniform(0, 100, args.amostras)
+    colunas = rng.integers(0, preditor.n_hash_arestas, args.amostras)
+
+    n_individuais = 500
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+        warnings.simplefilter("ignore")  # O modelo original foi treinado com nomes de colunas
+        for t, f in zip(tempos[:n_individuais], fluxos[:n_individuais]):
+            simulacao.prever_falha(floresta, t, f)
+    taxa_individual = n_individuais / (time.perf_counter() - inicio)
+
+    inicio = time.perf_counter()
+    for i in range(0, args.amostras, args.lote):
+        preditor.prever_proba(tempos[i:i + args.lote], fluxos[i:i + args.lote], colunas[i:i + args.lote])
+    taxa_lote = args.amostras / (time.perf_counter() - inicio)
+
+    inicio = time.perf_counter()
+    rotulos = (rng.random(args.amostras) < 0.05).astype(np.int8)
+    for i in range(0, args.amostras, args.lote):
+        preditor.atualizar(tempos[i:i + args.lote], fluxos[i:i + args.lote], colunas[i:i + args.lote], rotulos[i:i + args.lote])
+    taxa_treino = args.amostras / (time.perf_counter() - inicio)
+
+    print(f"prever_falha (uma amostra por chamada): {taxa_individual:>14,.0f} amostras/s")
+    print(f"prever_proba (lotes de {args.lote}):       {taxa_lote:>14,.0f} amostras/s")
+    print(f"atualizar    (lotes de {args.lote}):       {taxa_treino:>14,.0f} amostras/s")
+
+
+if __name__ == "__main__":
+    main()
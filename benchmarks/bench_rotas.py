@@ -0,0 +1,84 @@
+"""
+Latência por consulta do `OtimizadorRotas.a_star` em grafos grandes, com e sem pré-processamento ALT.
+
+Uso: python -m benchmarks.bench_rotas [--nos 100000] [--consultas 200]
+"""
+import argparse
+import math
+import random
+import time
+
+from src.otimizacao import OtimizadorRotas
+
+
+def criar_malha_logistica(n_nos, semente=0):
+    """Malha quadrada com coordenadas, custos e distâncias aleatórios, ~2 arestas por nó."""
+    rng = random.Random(semente)
+    lado = math.ceil(math.sqrt(n_nos))
+    otimizador = OtimizadorRotas()
+    for i in range(lado):
+        for j in range(lado):
+            otimizador.adicionar_no((i, j), x=i * 10.0, y=j * 10.0)
+    for i in range(lado):
+        for j in range(lado):
+            for vizinho in ((i + 1, j), (i, j + 1)):
+                if vizinho[0] < lado and vizinho[1] < lado:
+                    distancia = 10.0 * rng.uniform(1.0, 1.5)
+                    otimizador.adicionar_aresta((i, j), vizinho, custo=rng.uniform(1, 10),
+                                                distancia=distancia, capacidade=rng.uniform(50, 100))
+    return otimizador, lado
+
+
+def custo_rota(otimizador, rota, criterio):
+    indice = {"custo": 1, "distancia": 2}[criterio]
+    return sum(min(a[indice] for a in otimizador.nos[u] if a[0] == v) for u, v in zip(rota, rota[1:]))
+
+
+def medir(otimizador, pares, criterio):
+    inicio = time.perf_counter()
+    rotas = [otimizador.a_star(origem, destino, criterio) for origem, destino in pares]
+    return (time.perf_counter() - inicio) / len(pares), rotas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nos", type=int, default=100_000)
+    parser.add_argument("--consultas", type=int, default=200)
+    parser.add_argument("--marcos", type=int, default=8)
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    otimizador, lado = criar_malha_logistica(args.nos)
+    print(f"Grafo: {lado * lado} nós | construção {time.perf_counter() - inicio:.2f}s")
+
+    rng = random.Random(1)
+    pares = [((rng.randrange(lado), rng.randrange(lado)), (rng.randrange(lado), rng.randrange(lado)))
+             for _ in range(args.consultas)]
+
+    coordenadas = otimizador.coordenadas
+    for criterio in ("custo", "distancia"):
+        otimizador.coordenadas = {}  # Sem coordenadas a busca original equivale a Dijkstra
+        latencia_dijkstra, rotas_dijkstra = medir(otimizador, pares, criterio)
+        otimizador.coordenadas = coordenadas
+        latencia_euclides, rotas_euclides = medir(otimizador, pares, criterio)
+
+        inicio = time.perf_counter()
+        otimizador.preparar(n_marcos=args.marcos, criterios=(criterio,))
+        preparo = time.perf_counter() - inicio
+        latencia_alt, rotas_alt = medir(otimizador, pares, criterio)
+
+        otimos = [custo_rota(otimizador, r, criterio) for r in rotas_dijkstra]
+        def n_otimas(rotas):
+            return sum(math.isclose(custo_rota(otimizador, r, criterio), o) for r, o in zip(rotas, otimos))
+
+        print(f"[{criterio}] preparo ALT: {preparo:.2f}s")
+        print(f"  {'sem heurística (Dijkstra)':28s} {latencia_dijkstra * 1e3:8.2f} ms/consulta")
+        print(f"  {'heurística euclidiana':28s} {latencia_euclides * 1e3:8.2f} ms/consulta | "
+              f"rotas ótimas {n_otimas(rotas_euclides)}/{len(pares)}")
+        print(f"  {'ALT + CSR':28s} {latencia_alt * 1e3:8.2f} ms/consulta | "
+              f"rotas ótimas {n_otimas(rotas_alt)}/{len(pares)} | "
+              f"ganho sobre Dijkstra {latencia_dijkstra / latencia_alt:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
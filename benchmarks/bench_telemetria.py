@@ -0,0 +1,114 @@
+"""
+Vazão da ingestão de telemetria: leituras por segundo de relógio, em um núcleo, do arquivo
+(binário e CSV) e de um socket TCP local até a `Simulacao` e o `PreditorFalhasOnline`.
+
+Gera leituras sintéticas com sementes fixas para as arestas do cenário, verifica que
+nenhuma leitura foi perdida e sai com código 1 se algum caso ficar abaixo de `--alvo`.
+
+Uso: python -m benchmarks.bench_telemetria [--leituras 1000000] [--alvo 100000]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import simpy
+
+from src.cenarios import Cenario
+from src.models.previsao_falhas import PreditorFalhasOnline
+from src.simulacao import Simulacao
+from src.telemetria import (DestinoPreditor, DestinoSimulacao, IngestorTelemetria, criar_leituras, gravar_leituras,
+                            ler_arquivo)
+from src.utils.metricas import metricas
+
+
+def gerar_leituras(n, sensores, horas=24.0, semente=0):
+    """Leituras ordenadas no tempo, com uma parada de 1 h no sensor 1 (vazão quase nula)."""
+    rng = np.random.default_rng(semente)
+    tempos = np.sort(rng.uniform(0, horas, n))
+    ids = rng.integers(0, len(sensores), n)
+    vazoes = rng.uniform(60, 90, n)
+    vazoes[(ids == 1) & (tempos > horas / 4) & (tempos < horas / 4 + 1)] = 0.5
+    return criar_leituras(tempos, ids, vazoes, rng.uniform(2.5e6, 3.5e6, n))
+
+
+def criar_ingestor(grafo, sensores):
+    simulacao = Simulacao(simpy.Environment(), grafo.copy(), verbose=False)
+    rng = np.random.default_rng(1)
+    preditor = PreditorFalhasOnline().atualizar(rng.uniform(0, 24, 200), rng.uniform(0, 100, 200),
+                                                rng.integers(0, 32, 200), rng.integers(0, 2, 200))
+    destinos = [DestinoSimulacao(simulacao, sensores, vazao_minima=10.0),
+                DestinoPreditor(preditor, sensores, historico=simulacao.historico)]
+    return IngestorTelemetria(sensores, destinos=destinos)
+
+
+async def _via_socket(ingestor, caminho):
+    servidor = await ingestor.servir("127.0.0.1", 0)
+    porta = servidor.sockets[0].getsockname()[1]
+    _, escritor = await asyncio.open_connection("127.0.0.1", porta)
+    with open(caminho, "rb") as arquivo:
+        while True:
+            dados = arquivo.read(1 << 20)
+            if not dados:
+                break
+            escritor.write(dados)
+            await escritor.drain()  # Espera o servidor consumir: contrapressão de ponta a ponta
+    escritor.close()
+    await escritor.wait_closed()
+    servidor.close()
+    return await ingestor.concluir()
+
+
+def medir(nome, executar, ingestor, n_esperado):
+    inicio = time.perf_counter()
+    asyncio.run(executar(ingestor))
+    duracao = time.perf_counter() - inicio
+    if ingestor.leituras != n_esperado:
+        raise RuntimeError(f"{nome}: {ingestor.leituras} leituras ingeridas de {n_esperado}")
+    vazao = ingestor.leituras / duracao
+    print(f"{nome:<16} {ingestor.leituras:>10,} leituras em {duracao:6.2f} s  {vazao:>12,.0f} leituras/s"
+          f"  ({ingestor.janelas} janelas, {ingestor.esperas} esperas na fila)", flush=True)
+    return vazao
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--leituras", type=int, default=1_000_000)
+    parser.add_argument("--alvo", type=float, default=100_000, help="Leituras por segundo exigidas em cada caso")
+    parser.add_argument("--config", default="data/input_config.json")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.ERROR)
+    metricas.ativo = False
+    grafo = Cenario.carregar(args.config).criar_grafo()
+    sensores = list(grafo.edges)
+    leituras = gerar_leituras(args.leituras, sensores)
+    n_csv = min(args.leituras, 200_000)  # Gerar o CSV é mais lento que ingeri-lo
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        binario, csv = os.path.join(diretorio, "leituras.bin"), os.path.join(diretorio, "leituras.csv")
+        gravar_leituras(binario, leituras)
+        gravar_leituras(csv, leituras[:n_csv], "csv")
+        resultados = {
+            "arquivo binário": medir("arquivo binário", lambda i: i.executar(ler_arquivo(binario)),
+                                     criar_ingestor(grafo, sensores), args.leituras),
+            "arquivo CSV": medir("arquivo CSV", lambda i: i.executar(ler_arquivo(csv)),
+                                 criar_ingestor(grafo, sensores), n_csv),
+            "socket TCP": medir("socket TCP", lambda i: _via_socket(i, binario),
+                                criar_ingestor(grafo, sensores), args.leituras),
+        }
+
+    abaixo = {nome: vazao for nome, vazao in resultados.items() if vazao < args.alvo}
+    for nome, vazao in abaixo.items():
+        print(f"ABAIXO DO ALVO {nome}: {vazao:,.0f} < {args.alvo:,.0f} leituras/s")
+    if abaixo:
+        sys.exit(1)
+    print(f"Todos os casos acima de {args.alvo:,.0f} leituras/s")
+
+
+if __name__ == "__main__":
+    main()
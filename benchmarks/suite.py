@@ -0,0 +1,271 @@
+"""
+Suíte de benchmarks dos modelos e do motor de simulação, com sementes fixas.
+
+Mede o tempo por operação (mínimo e mediana entre repetições) e o pico de memória
+(tracemalloc) de cada caso, em redes sintéticas do grafo de demonstração (4 nós) até
+100 mil nós. Os resultados podem ser gravados como linha de base em JSON e comparados
+com uma linha de base anterior; regressões acima da tolerância fazem o processo sair com
+código 1.
+
+Uso: python -m benchmarks.suite [--tamanhos 4 1000 10000 100000] [--salvar base.json] [--comparar base.json]
+"""
+import argparse
+import gc
+import json
+import logging
+import math
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+import networkx as nx
+import simpy
+
+from src.models.pipeline import Pipeline
+from src.models.refinery import Refinery
+from src.models.transiente import ModeloTransiente
+from src.otimizacao import OtimizadorRotas
+from src.simulacao import Simulacao
+from src.utils.metricas import metricas
+
+VERSAO = 1
+TAMANHOS = (4, 1_000, 10_000, 100_000)
+PARAMETROS_DUTO = dict(diametro=0.2032, comprimento=27000, rugosidade=0.0001, viscosidade=0.05,
+                       pressao_inicial=3500000, pressao_final=2500000, perda_carga=0.02, capacidade_maxima=83.3)
+
+
+def grafo_demo():
+    """Grafo de 4 nós usado em `main.py`."""
+    grafo = nx.DiGraph()
+    grafo.add_edge("Refinaria_A", "Porto", custo=5, distancia=120, capacidade=80)
+    grafo.add_edge("Porto", "Distribuidora", custo=7, distancia=90, capacidade=60)
+    grafo.add_edge("Refinaria_B", "Porto", custo=4, distancia=100, capacidade=70)
+    grafo.add_edge("Refinaria_B", "Distribuidora", custo=10, distancia=200, capacidade=90)
+    return grafo
+
+
+def criar_rede_sintetica(n_nos, semente=0):
+    """Malha quadrada com ~n_nos nós e arestas nos dois sentidos; o grafo de demonstração se n_nos <= 4."""
+    if n_nos <= 4:
+        return grafo_demo()
+    rng = random.Random(semente)
+    lado = math.ceil(math.sqrt(n_nos))
+    grafo = nx.DiGraph()
+    for i in range(lado):
+        for j in range(lado):
+            for vizinho in ((i + 1, j), (i, j + 1)):
+                if vizinho[0] < lado and vizinho[1] < lado:
+                    atributos = dict(custo=rng.uniform(1, 10), distancia=10.0 * rng.uniform(1.0, 1.5), capacidade=rng.uniform(50, 100))
+                    grafo.add_edge((i, j), vizinho, **atributos)
+                    grafo.add_edge(vizinho, (i, j), **atributos)
+    return grafo
+
+
+def para_otimizador(grafo):
+    otimizador = OtimizadorRotas()
+    for no in grafo.nodes:
+        otimizador.adicionar_no(no)
+    for u, v, dados in grafo.edges(data=True):
+        if not grafo.has_edge(v, u) or str(u) < str(v):  # `adicionar_aresta` já cria os dois sentidos
+            otimizador.adicionar_aresta(u, v, dados["custo"], dados["distancia"], dados["capacidade"])
+    return otimizador
+
+
+def pares_consulta(grafo, n, semente=1):
+    if grafo.number_of_nodes() <= 4:
+        return [("Refinaria_A", "Distribuidora"), ("Refinaria_B", "Distribuidora")] * (n // 2)
+    rng = random.Random(semente)
+    nos = list(grafo.nodes)
+    return [(rng.choice(nos), rng.choice(nos)) for _ in range(n)]
+
+
+# Cada caso recebe o tamanho da rede e devolve (função medida, número de operações por execução)
+
+def caso_pipeline(_tamanho):
+    duto = Pipeline(**PARAMETROS_DUTO)
+    rng = random.Random(0)
+    entradas = [rng.uniform(0, 120) for _ in range(10_000)]
+    return (lambda: [duto.calcular_fluxo(e) for e in entradas]), len(entradas)
+
+
+def caso_refinaria(_tamanho):
+    refinaria = Refinery(capacidade_processamento=200000, eficiencia=0.9)
+    rng = random.Random(0)
+    entradas = [rng.uniform(0, 120) for _ in range(10_000)]
+    return (lambda: [refinaria.processar_petroleo(e) for e in entradas]), len(entradas)
+
+
+def caso_a_star(tamanho):
+    grafo = criar_rede_sintetica(tamanho)
+    otimizador = para_otimizador(grafo)
+    if tamanho > 4:
+        otimizador.preparar()  # Pré-processamento ALT fora da medição, como no uso real
+    pares = pares_consulta(grafo, 20)
+    return (lambda: [otimizador.a_star(o, d, "custo") for o, d in pares]), len(pares)
+
+
+def caso_melhor_rota(tamanho):
+    grafo = criar_rede_sintetica(tamanho)
+    simulacao = Simulacao(simpy.Environment(), grafo, verbose=False)
+    pares = pares_consulta(grafo, 20)
+
+    def consultar(origem, destino):
+        simulacao.cache_rotas.limpar()  # A cada consulta: os pares se repetem e mediriam acertos do cache
+        return simulacao.encontrar_melhor_rota(origem, destino)
+
+    def executar():
+        return [consultar(o, d) for o, d in pares]
+    return executar, len(pares)
+
+
+def caso_simulacao(tamanho, duracao=100.0):
+    grafo = criar_rede_sintetica(tamanho)
+    pares = pares_consulta(grafo, 10, semente=2)
+
+    def executar():
+        env = simpy.Environment()
+        simulacao = Simulacao(env, grafo.copy(), rng=random.Random(3), verbose=False)
+        for origem, destino in pares:
+            env.process(simulacao.transportar_petroleo(origem, destino))
+        simulacao.modelar_falhas(mtbf=200.0, mttr=8.0)
+        simulacao.executar(duracao)
+        return simulacao
+    return executar, 1
+
+
+def caso_transiente(_tamanho, n_dutos=10, dias=30):
+    """Um mês com passo de 1 minuto em 10 dutos, com troca de lote a cada 12 h; operação = um passo."""
+    rng = random.Random(0)
+    dutos = [dict(PARAMETROS_DUTO, comprimento=rng.uniform(10_000, 50_000)) for _ in range(n_dutos)]
+    passos = dias * 24 * 60
+    vazoes = [[50 + 20 * math.sin(n / 300 + d) for d in range(n_dutos)] for n in range(passos)]
+    produtos = [(n // 720) % 3 for n in range(passos)]
+
+    def executar():
+        modelo = ModeloTransiente(dutos, produtos=("leve", "medio", "pesado"), vazao_inicial=50)
+        return modelo.avancar(vazoes, produtos)
+    return executar, passos
+
+
+CASOS = {
+    "pipeline.calcular_fluxo": (caso_pipeline, False),      # (fábrica, depende do tamanho da rede)
+    "refinaria.processar_petroleo": (caso_refinaria, False),
+    "transiente.avancar": (caso_transiente, False),
+    "rotas.a_star": (caso_a_star, True),
+    "rotas.encontrar_melhor_rota": (caso_melhor_rota, True),
+    "simulacao.simpy": (caso_simulacao, True),
+}
+
+
+def medir(executar, n_operacoes, repeticoes, orcamento_s=10.0, amostra_min_s=0.05):
+    """
+    A primeira execução serve de aquecimento e mede o pico de memória sob o tracemalloc.
+    Cada amostra cronometrada repete a função até durar ao menos `amostra_min_s`, para que
+    casos de microssegundos não fiquem dominados por ruído; casos lentos tomam menos
+    amostras, dentro de `orcamento_s`.
+    """
+    tracemalloc.start()
+    executar()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    inicio = time.perf_counter()
+    executar()
+    duracao = max(time.perf_counter() - inicio, 1e-9)
+    laco = max(1, math.ceil(amostra_min_s / duracao))
+    n_amostras = max(1, min(repeticoes, int(orcamento_s / (duracao * laco))))
+
+    tempos = []
+    for _ in range(n_amostras):
+        gc.collect()
+        gc.disable()  # Como no timeit: coletas do GC não entram na amostra
+        try:
+            inicio = time.perf_counter()
+            for _ in range(laco):
+                executar()
+            tempos.append((time.perf_counter() - inicio) / (n_operacoes * laco))
+        finally:
+            gc.enable()
+    return {"tempo_op_s": min(tempos), "mediana_op_s": statistics.median(tempos),
+            "operacoes": n_operacoes, "pico_memoria_bytes": pico}
+
+
+def executar_suite(tamanhos=TAMANHOS, casos=None, repeticoes=5, saida=sys.stdout):
+    """Executa os casos selecionados e retorna o dicionário de resultados (formato da linha de base)."""
+    nivel = logging.getLogger().level
+    logging.getLogger().setLevel(logging.ERROR)  # Log desligado: mede o modelo, não o I/O
+    ativo = metricas.ativo
+    metricas.ativo = False  # Sem cronômetros internos nas medições
+    resultados = {}
+    try:
+        for nome in casos or CASOS:
+            fabrica, por_tamanho = CASOS[nome]
+            for tamanho in (tamanhos if por_tamanho else tamanhos[:1]):
+                chave = f"{nome}[{tamanho}]" if por_tamanho else nome
+                executar, n_operacoes = fabrica(tamanho)
+                resultados[chave] = medir(executar, n_operacoes, repeticoes)
+                r = resultados[chave]
+                print(f"{chave:<40} {r['tempo_op_s'] * 1e6:>14,.2f} µs/op  (mediana {r['mediana_op_s'] * 1e6:,.2f})"
+                      f"  pico {r['pico_memoria_bytes'] / 2**20:>8.2f} MiB", file=saida, flush=True)
+    finally:
+        logging.getLogger().setLevel(nivel)
+        metricas.ativo = ativo
+    return {
+        "versao": VERSAO,
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "resultados": resultados,
+    }
+
+
+def comparar(atual, base, tolerancia=0.25, tolerancia_memoria=0.25):
+    """
+    Compara com uma linha de base e retorna as regressões encontradas.
+
+    :param tolerancia: Aumento relativo aceito no tempo por operação (0.25 = 25%)
+    :param tolerancia_memoria: Aumento relativo aceito no pico de memória
+    :return: Lista de (caso, métrica, valor da base, valor atual)
+    """
+    regressoes = []
+    for chave, resultado in atual["resultados"].items():
+        anterior = base.get("resultados", {}).get(chave)
+        if anterior is None:
+            continue
+        if resultado["tempo_op_s"] > anterior["tempo_op_s"] * (1 + tolerancia):
+            regressoes.append((chave, "tempo_op_s", anterior["tempo_op_s"], resultado["tempo_op_s"]))
+        if resultado["pico_memoria_bytes"] > anterior["pico_memoria_bytes"] * (1 + tolerancia_memoria) + 4096:
+            regressoes.append((chave, "pico_memoria_bytes", anterior["pico_memoria_bytes"], resultado["pico_memoria_bytes"]))
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=list(TAMANHOS))
+    parser.add_argument("--casos", nargs="+", choices=list(CASOS))
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--salvar", help="Grava os resultados como linha de base JSON")
+    parser.add_argument("--comparar", help="Linha de base JSON para detectar regressões")
+    parser.add_argument("--tolerancia", type=float, default=0.25)
+    args = parser.parse_args()
+
+    atual = executar_suite(args.tamanhos, args.casos, args.repeticoes)
+    if args.salvar:
+        with open(args.salvar, "w", encoding="utf-8") as f:
+            json.dump(atual, f, indent=2)
+        print(f"Linha de base gravada em {args.salvar}")
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            base = json.load(f)
+        regressoes = comparar(atual, base, args.tolerancia, args.tolerancia)
+        for chave, metrica, antes, depois in regressoes:
+            print(f"REGRESSÃO {chave} {metrica}: {antes:.6g} -> {depois:.6g} ({depois / antes - 1:+.0%})")
+        if regressoes:
+            sys.exit(1)
+        print("Sem regressões em relação à linha de base.")
+
+
+if __name__ == "__main__":
+    main()
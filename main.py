@@ -1,92 +1,97 @@
 import logging
-import simpy
-import numpy as np
-import matplotlib.pyplot as plt
-import networkx as nx
-from src.models.pipeline import Pipeline
-from src.models.refinery import Refinery
-from src.visualizacao import plot_fluxo_tempo
-from src.simulacao import Simulacao
-from matplotlib.backends.backend_pdf import PdfPages
+import sys
+from src.utils.logger import configurar_logging
+
+# simpy, numpy, networkx e matplotlib são importados só dentro das funções que os usam,
+# para que processos curtos (ex.: varreduras) não paguem a importação de tudo
 
 logger = logging.getLogger(__name__)
 
-def simular_fluxo(usar_simpy=True):
+def simular_fluxo(usar_simpy=True, caminho_config="data/input_config.json"):
     """Função para rodar a simulação do fluxo de petróleo e otimização de rotas."""
+    import simpy
+    from src.cache_rotas import CacheRotas
+    from src.cenarios import Cenario
+    from src.relatorios import Relatorio, figura_fluxo_duto, figura_fluxo_eventos, figura_produtos, fluxo_transiente
+    from src.resultados import EscritorResultados, LeitorResultados
     
-    # 🔹 Parâmetros do duto
-    parametros_duto = {
-        "diametro": 0.2032,
-        "comprimento": 27000,
-        "rugosidade": 0.0001,
-        "viscosidade": 0.05,
-        "pressao_inicial": 3500000,
-        "pressao_final": 2500000,
-        "perda_carga": 0.02,
-        "capacidade_maxima": 83.3  
-    }
+    # 🔹 Cenário (duto, refinaria, rede e simulação) lido do arquivo de configuração
+    cenario = Cenario.carregar(caminho_config)
+    parametros_duto = cenario.config["pipeline"]
     
-    pipeline = Pipeline(**parametros_duto)
-    tempo = np.linspace(0, 24, 50)
-    fluxo = np.sin(tempo / 4) * 10 + parametros_duto["capacidade_maxima"]
+    pipeline = cenario.criar_pipeline()
+    # 🔹 Regime transiente: entrada variável em passos de 6 minutos, saída calculada com o empacotamento do duto
+    tempo, fluxo, fluxo_saida = fluxo_transiente(pipeline, parametros_duto["capacidade_maxima"])
     vazao_duto = pipeline.calcular_fluxo(parametros_duto["capacidade_maxima"])
     
-    logger.info(f"Vazão do Duto: {vazao_duto:.2f} m³/h")
+    logger.info("Vazão do Duto: %.2f m³/h", vazao_duto)
 
-    # 🔹 Criando gráfico do fluxo de petróleo
-    fig1, ax1 = plt.subplots(figsize=(8, 5))
-    ax1.plot(tempo, fluxo, 'bo-', label="Fluxo de Petróleo")
-    ax1.set_xlabel("Tempo (horas)")
-    ax1.set_ylabel("Fluxo (barris/hora)")
-    ax1.set_title("Variação do Fluxo de Petróleo no Duto")
-    ax1.legend()
-    ax1.grid(True)
+    # 🔹 Relatório montado sob demanda: as figuras só são construídas ao gravar o PDF
+    relatorio = Relatorio("graficos_fluxo_petroleo.pdf")
+    relatorio.adicionar(figura_fluxo_duto, tempo, fluxo, fluxo_saida)  # Gráfico de fluxo
     
-    refinaria = Refinery(capacidade_processamento=200000, eficiencia=0.9)
+    refinaria = cenario.criar_refinaria()
     produtos_refinados = refinaria.processar_petroleo(vazao_duto)
     
-    logger.info(f"Produtos refinados: {produtos_refinados}")
+    logger.info("Produtos refinados: %s", produtos_refinados)
 
-    # 🔹 Criando gráfico dos produtos refinados
-    fig2, ax2 = plt.subplots(figsize=(8, 5))
-    produtos = list(produtos_refinados.keys())
-    quantidades = list(produtos_refinados.values())
-    ax2.bar(produtos, quantidades, color=['red', 'blue', 'green'])
-    ax2.set_xlabel("Produtos Refinados")
-    ax2.set_ylabel("Quantidade (m³)")
-    ax2.set_title("Distribuição de Produtos Refinados")
-    ax2.grid(axis="y")
+    relatorio.adicionar(figura_produtos, produtos_refinados)  # Gráfico de produtos refinados
 
     # 🔹 Criando a estrutura do Grafo com NetworkX
-    grafo = nx.DiGraph()
-    grafo.add_edge("Refinaria_A", "Porto", custo=5, capacidade=80)
-    grafo.add_edge("Porto", "Distribuidora", custo=7, capacidade=60)
-    grafo.add_edge("Refinaria_B", "Porto", custo=4, capacidade=70)
-    grafo.add_edge("Refinaria_B", "Distribuidora", custo=10, capacidade=90)
+    grafo = cenario.criar_grafo()
+
+    cache_rotas = CacheRotas()
+    melhor_rota = cache_rotas.rota(grafo, "Refinaria_A", "Distribuidora", "custo")
+    logger.info("📍 Melhor Rota para transporte de petróleo: %s", melhor_rota)
 
-    melhor_rota = nx.shortest_path(grafo, source="Refinaria_A", target="Distribuidora", weight="custo")
-    logger.info(f"📍 Melhor Rota para transporte de petróleo: {melhor_rota}")
+    planejador = cenario.criar_planejador(grafo)  # None se a rede não define fontes e sumidouros
+    if planejador is not None:
+        planejador.resolver()
+        logger.info("🚰 Fluxo máximo até as distribuidoras: %s | Custo mínimo: %s", planejador.fluxo_total, planejador.custo_total)
     
     if usar_simpy:
         env = simpy.Environment()
-        simulacao = Simulacao(env, grafo)
-        
-        env.process(simulacao.transportar_petroleo("Refinaria_A", "Distribuidora"))
-        env.process(simulacao.introduzir_falhas("Refinaria_A", "Porto"))
-
-        env.run(until=50)  # Tempo da simulação
+        with EscritorResultados("data/output_results.bin") as escritor:
+            # Transportes e falhas em todas as arestas definidos no cenário
+            simulacao = cenario.criar_simulacao(env, grafo, historico=escritor)
 
-        simulacao.gerar_grafico_fluxo()  # Mostra o gráfico com falhas após a simulação
+            simulacao.executar(cenario.config.get("simulacao", {}).get("duracao", 50))  # Tempo da simulação (padrão da CLI)
 
-    # 🔹 Salvando os gráficos em PDF
-    with PdfPages("graficos_fluxo_petroleo.pdf") as pdf:
-        pdf.savefig(fig1)  # Gráfico de fluxo
-        pdf.savefig(fig2)  # Gráfico de produtos refinados
+        # 🔹 Resultados lidos do disco via memory-map
+        resultados = LeitorResultados("data/output_results.bin")
+        resultados.exportar_csv("data/output_results.csv")
+        relatorio.adicionar(figura_fluxo_eventos, resultados.tempos, resultados.fluxos)  # Fluxo com falhas, lido do disco
 
-    plt.show()
+    # 🔹 Salvando os gráficos em PDF (backend Agg, sem janelas)
+    relatorio.salvar()
     print("✅ Simulação e otimização concluídas!")
 
+def executar_varredura(caminho_config="data/input_config.json"):
+    """Executa a varredura definida no arquivo de configuração; resultados já calculados vêm do cache."""
+    from src.cenarios import ExecutorCenarios, carregar_config, expandir_varredura
+
+    cenarios = expandir_varredura(carregar_config(caminho_config))
+    executor = ExecutorCenarios()
+    resultados = executor.executar(cenarios)
+    logger.info("📊 Varredura: %d cenários | %d calculados | %d do cache", len(cenarios), executor.calculados, executor.acertos)
+    return cenarios, resultados
+
 if __name__ == "__main__":
+    configurar_logging(formato="json" if "--log-json" in sys.argv else "texto")
+    if "--perfil" in sys.argv:
+        # Onde o tempo da simulação é gasto: cProfile + cronômetros por componente
+        from src.utils.metricas import metricas
+        from src.utils.perfil import perfilar
+        metricas.ativo = True
+        _, relatorio_perfil = perfilar(simular_fluxo, usar_simpy=True)
+        print(relatorio_perfil)
+        print(metricas.exportar_json())
+        sys.exit(0)
+    if "--varredura" in sys.argv:
+        for cenario, resultado in zip(*executar_varredura()):
+            print(f"Perda {cenario['pipeline']['perda_carga']:.2f} | vazão {resultado['vazao_duto']:.2f} m³/h | "
+                  f"fluxo máximo {resultado.get('fluxo_maximo', 0):.1f}")
+        sys.exit(0)
     print("Rodando Simulação Normal...")
     simular_fluxo(usar_simpy=False)
     print("\nRodando Simulação com Falhas...")
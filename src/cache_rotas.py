@@ -0,0 +1,186 @@
+from collections import OrderedDict
+
+CRITERIOS = ("custo", "distancia", "capacidade")  # Os mesmos do `OtimizadorRotas`
+
+
+def validar_criterio(criterio):
+    if criterio not in CRITERIOS:
+        raise ValueError(f"Critério desconhecido: {criterio!r} (use {', '.join(CRITERIOS)})")
+
+
+def peso_criterio(criterio, valor):
+    """
+    Peso não negativo de uma aresta na busca: o próprio atributo, ou 1 se ausente.
+
+    Capacidade maior é melhor, então o peso é o inverso (1 / capacidade) e a busca
+    favorece os dutos de maior capacidade; capacidade zero torna a aresta inutilizável.
+    """
+    if valor is None:
+        return 1
+    if criterio == "capacidade":
+        return 1 / valor if valor > 0 else float("inf")
+    return valor
+
+
+class CacheRotas:
+    """
+    Cache LRU de rotas indexado por (origem, destino, critério).
+
+    Um índice reverso aresta -> chaves permite invalidar apenas as rotas que passam por
+    uma aresta alterada, sem esvaziar o cache inteiro.
+    """
+
+    def __init__(self, capacidade=1024):
+        """
+        :param capacidade: Número máximo de rotas mantidas; a menos usada recentemente sai primeiro
+        """
+        self.capacidade = capacidade
+        self._entradas = OrderedDict()
+        self._por_aresta = {}
+        self._versoes = {}  # Chave -> relógio no momento do cálculo
+        self.relogio = 0
+        self.acertos = 0
+        self.falhas = 0
+        self.remocoes = 0
+        self.invalidacoes = 0
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def _remover(self, chave):
+        rota = self._entradas.pop(chave)
+        del self._versoes[chave]
+        if rota is None:
+            return
+        for aresta in zip(rota, rota[1:]):
+            chaves = self._por_aresta.get(aresta)
+            if chaves is not None:
+                chaves.discard(chave)
+                if not chaves:
+                    del self._por_aresta[aresta]
+
+    def obter(self, origem, destino, criterio="custo"):
+        """Retorna a rota em cache, ou None se ausente."""
+        chave = (origem, destino, criterio)
+        rota = self._entradas.get(chave)
+        if rota is None and chave not in self._entradas:
+            self.falhas += 1
+            return None
+        self._entradas.move_to_end(chave)
+        self.acertos += 1
+        return rota
+
+    def armazenar(self, origem, destino, criterio, rota):
+        """Guarda uma rota (None = sem caminho) e remove a menos usada se o cache estiver cheio."""
+        chave = (origem, destino, criterio)
+        if chave in self._entradas:
+            self._remover(chave)
+        self._entradas[chave] = rota
+        self._versoes[chave] = self.relogio
+        self.relogio += 1
+        if rota is not None:
+            for aresta in zip(rota, rota[1:]):
+                self._por_aresta.setdefault(aresta, set()).add(chave)
+        while len(self._entradas) > self.capacidade:
+            self._remover(next(iter(self._entradas)))
+            self.remocoes += 1
+
+    def rota(self, grafo, origem, destino, criterio="custo"):
+        """
+        Retorna a melhor rota, calculando-a com Dijkstra apenas em caso de falha no cache.
+
+        Arestas com atributo `ativa=False` são ignoradas. Retorna None se não houver caminho.
+        Um `GrafoCompacto` usa a própria busca (`caminho_minimo`), sem networkx.
+        Os pesos seguem `peso_criterio`; um critério fora de `CRITERIOS` gera ValueError.
+        """
+        validar_criterio(criterio)
+        chave = (origem, destino, criterio)
+        if chave in self._entradas:
+            self._entradas.move_to_end(chave)
+            self.acertos += 1
+            return self._entradas[chave]
+
+        self.falhas += 1
+        caminho_minimo = getattr(grafo, "caminho_minimo", None)
+        if caminho_minimo is not None:
+            rota = caminho_minimo(origem, destino, criterio)
+            self.armazenar(origem, destino, criterio, rota)
+            return rota
+
+        import networkx as nx
+
+        peso = lambda u, v, dados: peso_criterio(criterio, dados.get(criterio)) if dados.get("ativa", True) else None
+        try:
+            rota = nx.shortest_path(grafo, source=origem, target=destino, weight=peso)
+        except (nx.NetworkXNoPath, nx.NodeNotFound):
+            rota = None
+        self.armazenar(origem, destino, criterio, rota)
+        return rota
+
+    def invalidar_aresta(self, origem, destino):
+        """Remove as rotas que passam pela aresta origem -> destino."""
+        chaves = self._por_aresta.pop((origem, destino), set())
+        for chave in list(chaves):
+            self._remover(chave)
+        self.invalidacoes += len(chaves)
+        return len(chaves)
+
+    def invalidar_criterio(self, criterio):
+        """Remove todas as rotas de um critério (ex.: quando um peso diminui e outras rotas podem melhorar)."""
+        chaves = [chave for chave in self._entradas if chave[2] == criterio]
+        for chave in chaves:
+            self._remover(chave)
+        self.invalidacoes += len(chaves)
+        return len(chaves)
+
+    def invalidar_desde(self, versao):
+        """
+        Remove as rotas calculadas a partir de `versao` do relógio.
+
+        Usado quando uma aresta volta a ficar ativa: só as rotas calculadas enquanto ela
+        estava inativa podem ter deixado de ser ótimas.
+        """
+        chaves = [chave for chave, v in self._versoes.items() if v >= versao]
+        for chave in chaves:
+            self._remover(chave)
+        self.invalidacoes += len(chaves)
+        return len(chaves)
+
+    def limpar(self):
+        self.invalidacoes += len(self._entradas)
+        self._entradas.clear()
+        self._por_aresta.clear()
+        self._versoes.clear()
+
+    def estado(self):
+        """Conteúdo do cache em estruturas simples (listas e números), na ordem LRU, para gravar em um checkpoint."""
+        return {
+            "capacidade": self.capacidade,
+            "entradas": [[*chave, rota, self._versoes[chave]] for chave, rota in self._entradas.items()],
+            "relogio": self.relogio,
+            "contadores": [self.acertos, self.falhas, self.remocoes, self.invalidacoes],
+        }
+
+    @classmethod
+    def de_estado(cls, estado):
+        """Cache com o conteúdo devolvido por `estado`, incluindo a ordem LRU e as versões."""
+        cache = cls(capacidade=estado["capacidade"])
+        for origem, destino, criterio, rota, versao in estado["entradas"]:
+            cache.relogio = versao
+            cache.armazenar(origem, destino, criterio, rota)
+        cache.relogio = estado["relogio"]
+        cache.acertos, cache.falhas, cache.remocoes, cache.invalidacoes = estado["contadores"]
+        return cache
+
+    def estatisticas(self):
+        """Contadores para dimensionar o cache."""
+        consultas = self.acertos + self.falhas
+        return {
+            "tamanho": len(self._entradas),
+            "capacidade": self.capacidade,
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "remocoes": self.remocoes,
+            "invalidacoes": self.invalidacoes,
+            "taxa_acerto": self.acertos / consultas if consultas else 0.0,
+        }
@@ -0,0 +1,390 @@
+import copy
+import hashlib
+import itertools
+import json
+import os
+import random
+
+VERSAO_CENARIO = 1  # Incrementar quando o cálculo de `executar_cenario` mudar, para invalidar o cache
+
+SECOES = ("pipeline", "refinaria", "transporte", "rede", "simulacao", "varredura")
+CAMPOS_TRANSPORTE = ("capacidade_caminhao", "distancia", "eficiencia_transporte")
+
+
+def _numero(valor, caminho, minimo=0.0, maximo=None, incluir_minimo=False):
+    if isinstance(valor, bool) or not isinstance(valor, (int, float)):
+        raise ValueError(f"{caminho}: esperado um número, recebido {valor!r}")
+    if valor < minimo or (valor == minimo and not incluir_minimo):
+        raise ValueError(f"{caminho}: deve ser {'>=' if incluir_minimo else '>'} {minimo}, recebido {valor}")
+    if maximo is not None and valor > maximo:
+        raise ValueError(f"{caminho}: deve ser <= {maximo}, recebido {valor}")
+
+
+def _secao(config, nome, campos_obrigatorios, campos_opcionais=()):
+    secao = config.get(nome)
+    if not isinstance(secao, dict):
+        raise ValueError(f"{nome}: seção ausente ou não é um objeto")
+    faltando = [c for c in campos_obrigatorios if c not in secao]
+    if faltando:
+        raise ValueError(f"{nome}: campos obrigatórios ausentes: {', '.join(faltando)}")
+    desconhecidos = set(secao) - set(campos_obrigatorios) - set(campos_opcionais)
+    if desconhecidos:
+        raise ValueError(f"{nome}: campos desconhecidos: {', '.join(sorted(desconhecidos))}")
+    return secao
+
+
+def _duracao_falha(valor, caminho):
+    """Número = média de uma exponencial; [mínimo, máximo] = distribuição uniforme."""
+    if isinstance(valor, list):
+        if len(valor) != 2:
+            raise ValueError(f"{caminho}: intervalo deve ter dois valores [mínimo, máximo]")
+        _numero(valor[0], f"{caminho}[0]", incluir_minimo=True)
+        _numero(valor[1], f"{caminho}[1]")
+        if valor[0] > valor[1]:
+            raise ValueError(f"{caminho}: mínimo maior que o máximo")
+    else:
+        _numero(valor, caminho)
+
+
+def validar_config(config):
+    """
+    Valida um cenário e levanta `ValueError` com o caminho do campo inválido.
+
+    Seções obrigatórias: `pipeline`, `refinaria` e `rede`. As seções `transporte` e
+    `simulacao` são opcionais; `varredura` é tratada por `expandir_varredura`.
+    """
+    from src.models.pipeline import PARAMETROS_PIPELINE
+
+    if not isinstance(config, dict):
+        raise ValueError("cenário: esperado um objeto JSON")
+    desconhecidas = set(config) - set(SECOES)
+    if desconhecidas:
+        raise ValueError(f"cenário: seções desconhecidas: {', '.join(sorted(desconhecidas))}")
+
+    pipeline = _secao(config, "pipeline", PARAMETROS_PIPELINE)
+    for campo in PARAMETROS_PIPELINE:
+        _numero(pipeline[campo], f"pipeline.{campo}")
+    if pipeline["pressao_final"] >= pipeline["pressao_inicial"]:
+        raise ValueError("pipeline: pressao_final deve ser menor que pressao_inicial")
+    _numero(pipeline["perda_carga"], "pipeline.perda_carga", maximo=1.0)
+
+    refinaria = _secao(config, "refinaria", ("capacidade_processamento", "eficiencia"), ("rendimentos", "capacidade_tanque"))
+    _numero(refinaria["capacidade_processamento"], "refinaria.capacidade_processamento")
+    _numero(refinaria["eficiencia"], "refinaria.eficiencia", maximo=1.0)
+    _numero(refinaria.get("capacidade_tanque", 0.0), "refinaria.capacidade_tanque", incluir_minimo=True)
+    if "rendimentos" in refinaria:
+        rendimentos = refinaria["rendimentos"]
+        if not isinstance(rendimentos, dict) or not rendimentos:
+            raise ValueError("refinaria.rendimentos: esperado um objeto {produto: fração}")
+        for produto, fracao in rendimentos.items():
+            _numero(fracao, f"refinaria.rendimentos.{produto}", maximo=1.0, incluir_minimo=True)
+        if abs(sum(rendimentos.values()) - 1.0) > 1e-6:
+            raise ValueError("refinaria.rendimentos: as frações devem somar 1")
+
+    if "transporte" in config:
+        transporte = _secao(config, "transporte", CAMPOS_TRANSPORTE)
+        for campo in CAMPOS_TRANSPORTE:
+            _numero(transporte[campo], f"transporte.{campo}")
+        _numero(transporte["eficiencia_transporte"], "transporte.eficiencia_transporte", maximo=1.0)
+
+    rede = _secao(config, "rede", ("arestas",), ("fontes", "sumidouros"))
+    if not isinstance(rede["arestas"], list) or not rede["arestas"]:
+        raise ValueError("rede.arestas: esperada uma lista não vazia")
+    nos = set()
+    for i, aresta in enumerate(rede["arestas"]):
+        caminho = f"rede.arestas[{i}]"
+        if not isinstance(aresta, dict) or "origem" not in aresta or "destino" not in aresta:
+            raise ValueError(f"{caminho}: esperado um objeto com origem e destino")
+        if aresta["origem"] == aresta["destino"]:
+            raise ValueError(f"{caminho}: origem e destino iguais ({aresta['origem']})")
+        for atributo, valor in aresta.items():
+            if atributo not in ("origem", "destino"):
+                _numero(valor, f"{caminho}.{atributo}", incluir_minimo=True)
+        nos.update((aresta["origem"], aresta["destino"]))
+    for lista in ("fontes", "sumidouros"):
+        for no in rede.get(lista, []):
+            if no not in nos:
+                raise ValueError(f"rede.{lista}: nó {no!r} não existe na rede")
+
+    if "simulacao" in config:
+        simulacao = _secao(config, "simulacao", ("duracao",), ("semente", "transportes", "falhas"))
+        _numero(simulacao["duracao"], "simulacao.duracao")
+        semente = simulacao.get("semente")
+        if semente is not None and (isinstance(semente, bool) or not isinstance(semente, int)):
+            raise ValueError(f"simulacao.semente: esperado um inteiro, recebido {semente!r}")
+        for i, par in enumerate(simulacao.get("transportes", [])):
+            if not isinstance(par, list) or len(par) != 2:
+                raise ValueError(f"simulacao.transportes[{i}]: esperado [origem, destino]")
+            for no in par:
+                if no not in nos:
+                    raise ValueError(f"simulacao.transportes[{i}]: nó {no!r} não existe na rede")
+        if "falhas" in simulacao:
+            falhas = _secao(simulacao, "falhas", (), ("mtbf", "mttr"))
+            for campo in ("mtbf", "mttr"):
+                if campo in falhas:
+                    _duracao_falha(falhas[campo], f"simulacao.falhas.{campo}")
+    return config
+
+
+def carregar_config(caminho):
+    """Lê um arquivo de cenário em JSON, incluindo a seção `varredura`, e o valida."""
+    with open(caminho, encoding="utf-8") as f:
+        try:
+            config = json.load(f)
+        except json.JSONDecodeError as erro:
+            raise ValueError(f"{caminho}: JSON inválido ({erro})") from erro
+    return validar_config(config)
+
+
+def _amostrador_falha(valor):
+    if isinstance(valor, list):
+        from src.modelo_falhas import DuracaoUniforme
+        return DuracaoUniforme(*valor)
+    return valor
+
+
+class Cenario:
+    """Cenário validado, com as fábricas dos objetos do modelo."""
+
+    def __init__(self, config):
+        """
+        :param config: Dicionário no formato de `data/input_config.json` (ver `validar_config`)
+        """
+        config = copy.deepcopy(config)
+        if isinstance(config, dict):
+            config.pop("varredura", None)
+        self.config = validar_config(config)
+
+    @classmethod
+    def carregar(cls, caminho):
+        """Lê e valida um cenário em JSON; uma seção `varredura` é ignorada."""
+        return cls(carregar_config(caminho))
+
+    @property
+    def chave(self):
+        return chave_cenario(self.config)
+
+    def criar_pipeline(self):
+        from src.models.pipeline import Pipeline
+        return Pipeline(**self.config["pipeline"])
+
+    def criar_refinaria(self):
+        from src.models.refinery import Refinery
+        return Refinery(**self.config["refinaria"])
+
+    def criar_transporte(self):
+        if "transporte" not in self.config:
+            return None
+        from src.models.transport import Transport
+        return Transport(**self.config["transporte"])
+
+    def criar_grafo(self):
+        import networkx as nx
+        grafo = nx.DiGraph()
+        for aresta in self.config["rede"]["arestas"]:
+            atributos = {k: v for k, v in aresta.items() if k not in ("origem", "destino")}
+            grafo.add_edge(aresta["origem"], aresta["destino"], **atributos)
+        return grafo
+
+    def criar_planejador(self, grafo=None):
+        """`PlanejadorCapacidade` das fontes aos sumidouros, ou None se a rede não os define."""
+        rede = self.config["rede"]
+        if not rede.get("fontes") or not rede.get("sumidouros"):
+            return None
+        grafo = grafo if grafo is not None else self.criar_grafo()
+        from src.planejamento_capacidade import PlanejadorCapacidade
+        return PlanejadorCapacidade(grafo, rede["fontes"], rede["sumidouros"])
+
+    def criar_simulacao(self, env, grafo=None, historico=None, verbose=True):
+        """
+        Monta a `Simulacao` com os transportes e o modelo de falhas do cenário.
+
+        Sem `semente`, a simulação usa o gerador global `random`, como antes.
+        """
+        from src.simulacao import Simulacao
+
+        parametros = self.config.get("simulacao", {})
+        semente = parametros.get("semente")
+        grafo = grafo if grafo is not None else self.criar_grafo()
+        simulacao = Simulacao(env, grafo, rng=random.Random(semente) if semente is not None else None,
+                              verbose=verbose, historico=historico)
+        for origem, destino in parametros.get("transportes", []):
+            env.process(simulacao.transportar_petroleo(origem, destino))
+        if "falhas" in parametros:
+            falhas = {campo: _amostrador_falha(valor) for campo, valor in parametros["falhas"].items()}
+            simulacao.modelar_falhas(**falhas)
+        return simulacao
+
+
+def chave_cenario(config):
+    """Hash SHA-256 do JSON canônico do cenário (chaves ordenadas, sem espaços)."""
+    canonico = json.dumps([VERSAO_CENARIO, config], sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonico.encode("utf-8")).hexdigest()
+
+
+def _atribuir(config, caminho, valor):
+    """Atribui `valor` no caminho pontuado, ex. 'pipeline.diametro' ou 'rede.arestas.0.capacidade'."""
+    partes = caminho.split(".")
+    alvo = config
+    for parte in partes[:-1]:
+        alvo = alvo[int(parte)] if isinstance(alvo, list) else alvo[parte]
+    ultima = partes[-1]
+    if isinstance(alvo, list):
+        alvo[int(ultima)] = valor
+    else:
+        alvo[ultima] = valor
+
+
+def expandir_varredura(config, varredura=None):
+    """
+    Gera um cenário para cada combinação dos valores da varredura (produto cartesiano).
+
+    :param config: Cenário base; uma seção `varredura` nele é usada se `varredura` for omitida
+    :param varredura: Dicionário {caminho pontuado: lista de valores}
+    :return: Lista de dicionários de cenário, sem a seção `varredura`
+    """
+    base = copy.deepcopy(config)
+    varredura = varredura if varredura is not None else base.pop("varredura", {})
+    base.pop("varredura", None)
+    caminhos = list(varredura)
+    cenarios = []
+    for valores in itertools.product(*(varredura[c] for c in caminhos)):
+        cenario = copy.deepcopy(base)
+        for caminho, valor in zip(caminhos, valores):
+            try:
+                _atribuir(cenario, caminho, valor)
+            except (KeyError, IndexError, ValueError, TypeError) as erro:
+                raise ValueError(f"varredura: caminho inválido {caminho!r}") from erro
+        cenarios.append(cenario)
+    return cenarios
+
+
+def executar_cenario(config):
+    """
+    Executa um cenário sem gráficos nem impressão e retorna um resumo serializável em JSON.
+
+    :param config: Dicionário de cenário
+    """
+    cenario = Cenario(config)
+    pipeline = cenario.criar_pipeline()
+    vazao_duto = pipeline.calcular_fluxo(cenario.config["pipeline"]["capacidade_maxima"])
+    produtos = cenario.criar_refinaria().processar_petroleo(vazao_duto)
+    resumo = {
+        "vazao_duto": float(vazao_duto),
+        "produtos": {produto: float(q) for produto, q in produtos.items()},
+    }
+
+    transporte = cenario.criar_transporte()
+    if transporte is not None:
+        resumo["transportado"] = {produto: float(transporte.transportar_produto(produto, q)) for produto, q in produtos.items()}
+
+    planejador = cenario.criar_planejador()
+    if planejador is not None:
+        planejador.resolver()
+        resumo["fluxo_maximo"] = float(planejador.fluxo_total)
+        resumo["custo_minimo"] = float(planejador.custo_total)
+
+    if "simulacao" in cenario.config:
+        import simpy
+        env = simpy.Environment()
+        simulacao = cenario.criar_simulacao(env, verbose=False)
+        env.run(until=cenario.config["simulacao"]["duracao"])
+        fluxos = simulacao.historico.fluxos
+        resumo["simulacao"] = {
+            "n_eventos": int(simulacao.historico.n_eventos),
+            "fluxo_medio": float(fluxos.mean()) if len(fluxos) else 0.0,
+            "falhas": int(sum(simulacao.falhas_por_aresta.values())),
+            "tempo_inativo": float(sum(simulacao.tempo_inativo_por_aresta().values())),
+        }
+    return resumo
+
+
+class ExecutorCenarios:
+    """
+    Executa varreduras de cenários em paralelo, com cache em disco.
+
+    Cada resultado é gravado em `<diretorio_cache>/<hash do cenário>.json`; ao repetir
+    uma varredura, só os cenários novos ou alterados são recalculados. Cenários com
+    simulação sem `semente` usam o `random` global: cada execução é um sorteio novo, então
+    eles são sempre recalculados e nunca vão para o cache (contados em `sem_semente`).
+    """
+
+    def __init__(self, diretorio_cache="data/cenarios", n_processos=None):
+        """
+        :param diretorio_cache: Diretório dos resultados em cache (None = sem cache)
+        :param n_processos: Número de processos do pool (None = todos os núcleos; 1 = sem pool)
+        """
+        self.diretorio_cache = diretorio_cache
+        self.n_processos = n_processos
+        self.acertos = 0
+        self.calculados = 0
+        self.sem_semente = 0
+
+    def _arquivo(self, chave):
+        return os.path.join(self.diretorio_cache, f"{chave}.json")
+
+    def _ler_cache(self, chave):
+        if self.diretorio_cache is None:
+            return None
+        try:
+            with open(self._arquivo(chave), encoding="utf-8") as f:
+                return json.load(f)["resultado"]
+        except (OSError, ValueError, KeyError):
+            return None  # Ausente ou corrompido: recalcula
+
+    def _gravar_cache(self, chave, config, resultado):
+        if self.diretorio_cache is None:
+            return
+        os.makedirs(self.diretorio_cache, exist_ok=True)
+        temporario = self._arquivo(chave) + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump({"cenario": config, "resultado": resultado}, f, ensure_ascii=False)
+        os.replace(temporario, self._arquivo(chave))
+
+    def executar(self, cenarios):
+        """
+        :param cenarios: Lista de dicionários de cenário (ex.: de `expandir_varredura`)
+        :return: Lista de resumos de `executar_cenario`, na ordem dos cenários
+        """
+        # Valida tudo antes de iniciar o pool, para falhar cedo
+        chaves = [Cenario(config).chave for config in cenarios]
+        aleatorias = set()
+        for i, config in enumerate(cenarios):
+            if "simulacao" in config and config["simulacao"].get("semente") is None:
+                # Sorteio próprio: nem do cache, nem compartilhado com um cenário repetido
+                chaves[i] = f"{chaves[i]}-{i}"
+                aleatorias.add(chaves[i])
+        self.sem_semente += len(aleatorias)
+        resultados = {}
+        pendentes = {}
+        for chave, config in zip(chaves, cenarios):
+            if chave in resultados or chave in pendentes:
+                continue
+            resultado = None if chave in aleatorias else self._ler_cache(chave)
+            if resultado is None:
+                pendentes[chave] = config
+            else:
+                resultados[chave] = resultado
+                self.acertos += 1
+
+        if pendentes:
+            if self.n_processos == 1 or len(pendentes) == 1:
+                calculados = map(executar_cenario, pendentes.values())
+                self._coletar(pendentes, calculados, resultados, aleatorias)
+            else:
+                from concurrent.futures import ProcessPoolExecutor
+
+                n_trabalhadores = self.n_processos or os.cpu_count() or 1
+                with ProcessPoolExecutor(max_workers=n_trabalhadores) as executor:
+                    lote = max(1, len(pendentes) // (n_trabalhadores * 4))
+                    calculados = executor.map(executar_cenario, pendentes.values(), chunksize=lote)
+                    self._coletar(pendentes, calculados, resultados, aleatorias)
+        return [resultados[chave] for chave in chaves]
+
+    def _coletar(self, pendentes, calculados, resultados, aleatorias):
+        # Grava cada resultado assim que chega: uma varredura interrompida não perde o que já foi feito
+        for (chave, config), resultado in zip(pendentes.items(), calculados):
+            if chave not in aleatorias:
+                self._gravar_cache(chave, config, resultado)
+            resultados[chave] = resultado
+            self.calculados += 1
@@ -0,0 +1,428 @@
+"""
+Checkpoints de simulações SimPy longas: gravar o estado, retomar e ramificar.
+
+Um checkpoint é um único `.npz` sem pickle: os arrays (estado do RNG, eventos do histórico,
+atributos das arestas, fila do `ModeloFalhas`) ficam como arrays NumPy e o resto (relógio,
+processos pendentes, contadores, cache de rotas) em um membro JSON `metadados`. A estrutura
+do grafo não é gravada, só uma assinatura: ao restaurar, o chamador fornece o grafo (ex.:
+`Cenario.criar_grafo()`) e os atributos gravados são aplicados sobre ele.
+
+Os processos pendentes são lidos da fila de eventos do SimPy e recriados na mesma ordem,
+cada um esperando até o mesmo instante (bit a bit) em que estava agendado. Retomar do último
+checkpoint reproduz exatamente a execução sem interrupção; carregar o mesmo checkpoint várias
+vezes, com outra `semente` ou parâmetros, ramifica cenários "e se" a partir de um aquecimento.
+
+São suportados os processos de `Simulacao.transportar_petroleo`, `Simulacao.introduzir_falhas`
+e `ModeloFalhas.processo`; outros (ex.: `FrotaSimPy`) fazem `salvar_checkpoint` falhar.
+"""
+import glob
+import inspect
+import json
+import math
+import os
+import random
+import shutil
+
+import numpy as np
+
+from src.utils.logger import get_logger
+from src.utils.metricas import metricas
+
+logger = get_logger(__name__)
+
+VERSAO_CHECKPOINT = 1
+DTYPE_FILA_FALHAS = np.dtype([("tempo", "<f8"), ("sequencia", "<i8"), ("indice", "<i4"), ("tipo", "<i1")])
+
+
+def atraso_ate(agora, instante):
+    """Atraso `d` tal que `agora + d == instante` exatamente em ponto flutuante."""
+    atraso = instante - agora
+    while agora + atraso < instante:
+        atraso = math.nextafter(atraso, math.inf)
+    while agora + atraso > instante:
+        atraso = math.nextafter(atraso, -math.inf)
+    return atraso
+
+
+def _pares(dicionario):
+    """{(u, v): valor} -> [[u, v, valor], ...] para o JSON."""
+    return [[*chave, valor] for chave, valor in dicionario.items()]
+
+
+def _de_pares(pares):
+    from src.resultados import _como_tupla
+    return {(_como_tupla(u), _como_tupla(v)): valor for u, v, valor in pares}
+
+
+def _rota(rota):
+    from src.resultados import _como_tupla
+    return None if rota is None else [_como_tupla(no) for no in rota]
+
+
+def _assinatura(grafo):
+    """Identifica a estrutura do grafo (nós e arestas, na ordem de iteração), sem os atributos."""
+    from src.grafo_compacto import GrafoCompacto
+
+    if isinstance(grafo, GrafoCompacto):
+        return grafo.assinatura()
+    import hashlib
+    return hashlib.sha256(repr(list(grafo.edges)).encode("utf-8")).hexdigest()
+
+
+def _gravar_atributos(grafo, arrays):
+    """Atributos numéricos e booleanos das arestas, uma coluna por nome na ordem de `grafo.edges`."""
+    from src.grafo_compacto import GrafoCompacto
+
+    if isinstance(grafo, GrafoCompacto):
+        tipos = {}
+        for nome, coluna in grafo.atributos.items():
+            if coluna.dtype != object:  # Objetos (ex.: `duto`) vêm do grafo fornecido ao restaurar
+                arrays[f"aresta_{nome}"] = coluna
+                tipos[nome] = "coluna"
+        return tipos
+
+    valores = {}
+    for i, (_, _, dados) in enumerate(grafo.edges(data=True)):
+        for nome, valor in dados.items():
+            valores.setdefault(nome, {})[i] = valor
+    m = grafo.number_of_edges()
+    tipos = {}
+    for nome, por_aresta in valores.items():
+        amostra = list(por_aresta.values())
+        if all(isinstance(v, (bool, np.bool_)) for v in amostra):
+            tipos[nome], coluna = "booleano", np.full(m, -1, dtype=np.int8)
+        elif all(isinstance(v, (int, np.integer)) and not isinstance(v, (bool, np.bool_)) for v in amostra):
+            tipos[nome], coluna = "inteiro", np.full(m, np.nan)
+        elif all(isinstance(v, (int, float, np.number)) and not isinstance(v, (bool, np.bool_)) for v in amostra):
+            tipos[nome], coluna = "real", np.full(m, np.nan)
+        else:
+            tipos[nome] = "objeto"  # Não gravado: vem do grafo fornecido ao restaurar
+            continue
+        coluna[list(por_aresta)] = amostra
+        arrays[f"aresta_{nome}"] = coluna
+    return tipos
+
+
+def _aplicar_atributos(grafo, tipos, dados):
+    from src.grafo_compacto import GrafoCompacto
+
+    if isinstance(grafo, GrafoCompacto):
+        grafo.substituir_atributos({nome: dados[f"aresta_{nome}"] for nome in tipos})
+        return
+
+    colunas = {nome: dados[f"aresta_{nome}"].tolist() for nome, tipo in tipos.items() if tipo != "objeto"}
+    for i, (_, _, atributos) in enumerate(grafo.edges(data=True)):
+        for nome in [nome for nome, valor in atributos.items() if nome not in tipos and isinstance(valor, (int, float, np.number))]:
+            del atributos[nome]  # Numérico criado depois do checkpoint
+        for nome, coluna in colunas.items():
+            tipo, valor = tipos[nome], coluna[i]
+            if (valor == -1) if tipo == "booleano" else math.isnan(valor):
+                atributos.pop(nome, None)
+            elif tipo == "booleano":
+                atributos[nome] = bool(valor)
+            else:
+                atributos[nome] = int(valor) if tipo == "inteiro" else valor
+
+
+def _processos_pendentes(simulacao):
+    """
+    Processos da simulação à espera na fila do SimPy, na ordem em que seriam retomados.
+
+    Cada um vira {"tipo", "retomar_em", ...}: `retomar_em` é o instante do evento aguardado,
+    ou None para processos criados que ainda não começaram.
+    """
+    import simpy
+    from src.simulacao import Simulacao
+    from src.modelo_falhas import ModeloFalhas
+
+    processos = []
+    for tempo, _, _, evento in sorted(simulacao.env._queue, key=lambda item: item[:3]):
+        for retorno in evento.callbacks or ():
+            processo = getattr(retorno, "__self__", None)
+            if not isinstance(processo, simpy.Process) or retorno.__func__ is not simpy.Process._resume:
+                raise ValueError(f"checkpoint não suporta o evento pendente {evento!r}")
+            gerador = processo._generator
+            locais = gerador.gi_frame.f_locals
+            if inspect.getgeneratorstate(gerador) == inspect.GEN_CREATED:
+                retomar_em = locais.get("retomar_em")
+            else:
+                retomar_em = tempo
+            codigo = gerador.gi_code
+            if codigo is Simulacao.transportar_petroleo.__code__ and locais["self"] is simulacao:
+                processos.append({"tipo": "transporte", "origem": locais["origem"], "destino": locais["destino"],
+                                  "retomar_em": retomar_em})
+            elif codigo is Simulacao.introduzir_falhas.__code__ and locais["self"] is simulacao:
+                processos.append({"tipo": "falhas_intermitentes", "origem": locais["origem"],
+                                  "destino": locais["destino"], "retomar_em": retomar_em})
+            elif codigo is ModeloFalhas.processo.__code__ and locais["self"] is simulacao.modelo_falhas:
+                processos.append({"tipo": "modelo_falhas", "retomar_em": retomar_em})
+            else:
+                raise ValueError(f"checkpoint não suporta o processo {codigo.co_qualname}")
+    return processos
+
+
+def _distribuicao(valor):
+    """Descrição em JSON de um mtbf/mttr do `ModeloFalhas`, ou None se não for gravável."""
+    from src.modelo_falhas import DuracaoUniforme
+
+    if isinstance(valor, DuracaoUniforme):
+        return ["uniforme", valor.minimo, valor.maximo]
+    if isinstance(valor, (int, float)) and not isinstance(valor, bool):
+        return ["media", valor]
+    return None
+
+
+def _de_distribuicao(descricao):
+    from src.modelo_falhas import DuracaoUniforme
+    return DuracaoUniforme(*descricao[1:]) if descricao[0] == "uniforme" else descricao[1]
+
+
+@metricas.medir("checkpoint.salvar")
+def salvar_checkpoint(simulacao, caminho):
+    """
+    Grava o estado da simulação em `caminho` (.npz), de forma atômica.
+
+    Deve ser chamado entre execuções (`simulacao.executar(t)`), nunca de dentro de um processo.
+    Um `EscritorResultados` é descarregado antes, e o checkpoint guarda só quantos eventos o
+    arquivo tinha; um histórico em memória vai inteiro para o checkpoint.
+
+    :param simulacao: `Simulacao` a gravar
+    :param caminho: Arquivo de saída
+    :return: Caminho gravado
+    """
+    from src.resultados import EscritorResultados
+
+    if simulacao.frota is not None:
+        raise ValueError("checkpoint não suporta simulações com FrotaSimPy")
+    processos = _processos_pendentes(simulacao)
+    arrays = {}
+
+    estado_rng = simulacao.rng.getstate()
+    arrays["rng"] = np.array(estado_rng[1], dtype=np.uint32)
+
+    historico = simulacao.historico
+    if isinstance(historico, EscritorResultados):
+        historico.descarregar()
+        dados_historico = {"arquivo": historico.caminho, "n_gravados": historico.n_gravados,
+                           "tamanho_bloco": historico.tamanho_bloco}
+    else:
+        dados_historico = {"arquivo": None, "tamanho_bloco": historico.tamanho_bloco}
+        for nome, coluna in historico.colunas().items():
+            arrays[f"historico_{nome}"] = coluna
+    dados_historico["arestas"] = historico.arestas
+
+    modelo = simulacao.modelo_falhas
+    dados_modelo = None
+    if modelo is not None:
+        fila = np.array(modelo._fila, dtype=DTYPE_FILA_FALHAS)
+        arrays["falhas_fila"], arrays["falhas_ativa"] = fila, np.array(modelo.ativa, dtype=bool)
+        dados_modelo = {
+            "arestas": None if modelo.arestas == list(simulacao.grafo.edges) else modelo.arestas,
+            "mtbf": _distribuicao(modelo.mtbf),
+            "mttr": _distribuicao(modelo.mttr),
+            "n_eventos": modelo.n_eventos,
+            "sequencia": modelo._sequencia,
+            "pendente": modelo._pendente,
+        }
+
+    metadados = {
+        "versao": VERSAO_CHECKPOINT,
+        "agora": simulacao.env.now,
+        "rng": [estado_rng[0], estado_rng[2]],
+        "verbose": simulacao.verbose,
+        "grafo": _assinatura(simulacao.grafo),
+        "atributos": _gravar_atributos(simulacao.grafo, arrays),
+        "processos": processos,
+        "historico": dados_historico,
+        "modelo_falhas": dados_modelo,
+        "cache_rotas": simulacao.cache_rotas.estado(),
+        "desativada_em": _pares(simulacao._desativada_em),
+        "rotas_em_uso": _pares(simulacao.rotas_em_uso),
+        "desvios": simulacao.desvios,
+        "falhas_por_aresta": _pares(simulacao.falhas_por_aresta),
+        "tempo_inativo": _pares(simulacao.tempo_inativo),
+        "falhas_abertas": _pares(simulacao._falhas_abertas),
+        "n_falhas_abertas": _pares(simulacao._n_falhas_abertas),
+        "desativacoes": _pares(simulacao._desativacoes),
+        "em_recuperacao": _pares(simulacao._em_recuperacao),
+    }
+    arrays["metadados"] = np.frombuffer(json.dumps(metadados, ensure_ascii=False).encode("utf-8"), dtype=np.uint8)
+
+    temporario = caminho + ".tmp"
+    with open(temporario, "wb") as arquivo:
+        np.savez(arquivo, **arrays)
+    os.replace(temporario, caminho)
+    logger.info("💾 [%.1fh] Checkpoint gravado em %s", simulacao.env.now, caminho)
+    return caminho
+
+
+@metricas.medir("checkpoint.carregar")
+def carregar_checkpoint(caminho, grafo, semente=None, parametros_falhas=None, caminho_resultados=None, verbose=None):
+    """
+    Recria a `Simulacao` gravada em `caminho`, pronta para continuar com `executar`.
+
+    Sem `semente` nem `parametros_falhas`, a continuação é idêntica à execução original.
+    Cada chamada devolve uma simulação independente (ambiente, grafo e histórico próprios),
+    então o mesmo checkpoint pode ser carregado várias vezes para ramificar cenários.
+
+    :param caminho: Arquivo gravado por `salvar_checkpoint`
+    :param grafo: Grafo com a mesma estrutura do original (ex.: `Cenario.criar_grafo()`); é
+                  alterado no lugar com os atributos gravados
+    :param semente: Se informada, a continuação usa `random.Random(semente)` em vez do RNG gravado
+    :param parametros_falhas: {"mtbf": ..., "mttr": ...} do `ModeloFalhas`; obrigatório se o
+                              original usava funções que não podem ser gravadas
+    :param caminho_resultados: Para históricos em disco, arquivo onde continuar (os eventos até
+                               o checkpoint são copiados); padrão: o próprio arquivo original
+    :param verbose: Substitui o `verbose` gravado
+    :return: `Simulacao` restaurada
+    """
+    import simpy
+    from src.cache_rotas import CacheRotas
+    from src.historico_eventos import DTYPES_COLUNAS, HistoricoEventos
+    from src.modelo_falhas import ModeloFalhas
+    from src.resultados import EscritorResultados, _como_tupla
+    from src.simulacao import Simulacao
+
+    with np.load(caminho, allow_pickle=False) as dados:
+        metadados = json.loads(dados["metadados"].tobytes().decode("utf-8"))
+        if metadados["versao"] != VERSAO_CHECKPOINT:
+            raise ValueError(f"Versão de checkpoint não suportada: {metadados['versao']}")
+        if _assinatura(grafo) != metadados["grafo"]:
+            raise ValueError("o grafo fornecido não tem a mesma estrutura do checkpoint")
+        _aplicar_atributos(grafo, metadados["atributos"], dados)
+
+        if semente is not None:
+            rng = random.Random(semente)
+        else:
+            rng = random.Random()
+            versao, gauss = metadados["rng"]
+            rng.setstate((versao, tuple(dados["rng"].tolist()), gauss))
+
+        dados_historico = metadados["historico"]
+        arestas = [_como_tupla(a) for a in dados_historico["arestas"]]
+        if dados_historico["arquivo"] is None:
+            historico = HistoricoEventos(tamanho_bloco=dados_historico["tamanho_bloco"])
+            historico.restaurar(arestas, {nome: dados[f"historico_{nome}"] for nome in DTYPES_COLUNAS})
+        else:
+            destino = caminho_resultados or dados_historico["arquivo"]
+            if os.path.abspath(destino) != os.path.abspath(dados_historico["arquivo"]):
+                shutil.copyfile(dados_historico["arquivo"], destino)
+            historico = EscritorResultados(destino, tamanho_bloco=dados_historico["tamanho_bloco"],
+                                           manter=dados_historico["n_gravados"])
+            historico.restaurar(arestas)
+
+        env = simpy.Environment(initial_time=metadados["agora"])
+        simulacao = Simulacao(env, grafo, rng=rng, verbose=metadados["verbose"] if verbose is None else verbose,
+                              historico=historico)
+        estado_cache = metadados["cache_rotas"]
+        estado_cache["entradas"] = [[_como_tupla(o), _como_tupla(d), c, _rota(r), v] for o, d, c, r, v in estado_cache["entradas"]]
+        simulacao.cache_rotas = CacheRotas.de_estado(estado_cache)
+        simulacao._desativada_em = _de_pares(metadados["desativada_em"])
+        simulacao.rotas_em_uso = {chave: _rota(rota) for chave, rota in _de_pares(metadados["rotas_em_uso"]).items()}
+        simulacao.desvios = metadados["desvios"]
+        simulacao.falhas_por_aresta = _de_pares(metadados["falhas_por_aresta"])
+        simulacao.tempo_inativo = _de_pares(metadados["tempo_inativo"])
+        simulacao._falhas_abertas = _de_pares(metadados["falhas_abertas"])
+        simulacao._n_falhas_abertas = _de_pares(metadados["n_falhas_abertas"])
+        simulacao._desativacoes = _de_pares(metadados["desativacoes"])
+        simulacao._em_recuperacao = _de_pares(metadados["em_recuperacao"])
+
+        dados_modelo = metadados["modelo_falhas"]
+        if dados_modelo is not None:
+            parametros = dict(parametros_falhas or {})
+            for campo in ("mtbf", "mttr"):
+                if campo not in parametros:
+                    if dados_modelo[campo] is None:
+                        raise ValueError(f"o {campo} do modelo de falhas não foi gravado; informe-o em parametros_falhas")
+                    parametros[campo] = _de_distribuicao(dados_modelo[campo])
+            arestas_falha = dados_modelo["arestas"]
+            if arestas_falha is not None:
+                arestas_falha = [_como_tupla(a) for a in arestas_falha]
+            modelo = simulacao.modelo_falhas = ModeloFalhas(simulacao, arestas=arestas_falha, **parametros)
+            modelo.ativa = dados["falhas_ativa"].tolist()
+            modelo._fila = [tuple(evento) for evento in dados["falhas_fila"].tolist()]
+            modelo.n_eventos = dados_modelo["n_eventos"]
+            modelo._sequencia = dados_modelo["sequencia"]
+            modelo._pendente = tuple(dados_modelo["pendente"]) if dados_modelo["pendente"] is not None else None
+
+    # Processos já em andamento primeiro, para que seus eventos mantenham a precedência na fila
+    processos = metadados["processos"]
+    for processo in [p for p in processos if p["retomar_em"] is not None] + [p for p in processos if p["retomar_em"] is None]:
+        if processo["tipo"] == "transporte":
+            gerador = simulacao.transportar_petroleo(_como_tupla(processo["origem"]), _como_tupla(processo["destino"]),
+                                                     retomar_em=processo["retomar_em"])
+        elif processo["tipo"] == "falhas_intermitentes":
+            gerador = simulacao.introduzir_falhas(_como_tupla(processo["origem"]), _como_tupla(processo["destino"]),
+                                                  retomar_em=processo["retomar_em"])
+        else:
+            gerador = simulacao.modelo_falhas.processo(retomar_em=processo["retomar_em"])
+        env.process(gerador)
+    logger.info("📂 [%.1fh] Simulação retomada de %s", env.now, caminho)
+    return simulacao
+
+
+class GerenciadorCheckpoints:
+    """
+    Executa uma `Simulacao` em trechos de `intervalo` horas, gravando um checkpoint ao fim de cada um.
+
+    Os arquivos se chamam `checkpoint_<instante>.npz`; só os `manter` mais recentes ficam no
+    diretório. Depois de uma interrupção, `retomar` continua do último.
+    """
+
+    def __init__(self, diretorio, intervalo, manter=3):
+        """
+        :param diretorio: Diretório dos checkpoints (criado se não existir)
+        :param intervalo: Horas simuladas entre checkpoints
+        :param manter: Número de checkpoints mantidos, ao menos 1 (None = todos)
+        """
+        if intervalo <= 0:
+            raise ValueError("o intervalo entre checkpoints deve ser positivo")
+        if manter is not None and manter < 1:
+            raise ValueError("é preciso manter ao menos um checkpoint (ou None para todos)")
+        self.diretorio = diretorio
+        self.intervalo = intervalo
+        self.manter = manter
+        os.makedirs(diretorio, exist_ok=True)
+
+    def checkpoints(self):
+        """Checkpoints do diretório, do mais antigo ao mais recente."""
+        return sorted(glob.glob(os.path.join(self.diretorio, "checkpoint_*.npz")))
+
+    def ultimo(self):
+        """Checkpoint mais recente, ou None se não houver."""
+        checkpoints = self.checkpoints()
+        return checkpoints[-1] if checkpoints else None
+
+    def salvar(self, simulacao):
+        """Grava um checkpoint do instante atual e remove os excedentes."""
+        caminho = salvar_checkpoint(simulacao, os.path.join(self.diretorio, f"checkpoint_{simulacao.env.now:016.6f}.npz"))
+        if self.manter is not None:
+            for antigo in self.checkpoints()[:-self.manter]:
+                os.remove(antigo)
+        return caminho
+
+    def executar(self, simulacao, ate):
+        """
+        Executa a simulação até `ate`, com um checkpoint a cada múltiplo de `intervalo` e no fim.
+
+        :return: A própria simulação
+        """
+        while simulacao.env.now < ate:
+            proximo = min(ate, (math.floor(simulacao.env.now / self.intervalo) + 1) * self.intervalo)
+            simulacao.executar(proximo)
+            self.salvar(simulacao)
+        return simulacao
+
+    def retomar(self, grafo, ate=None, **opcoes):
+        """
+        Carrega o último checkpoint e, se `ate` for informado, continua a execução até lá.
+
+        :param grafo: Grafo com a estrutura do original (ver `carregar_checkpoint`)
+        :param opcoes: Repassadas a `carregar_checkpoint`
+        :return: `Simulacao` restaurada
+        """
+        caminho = self.ultimo()
+        if caminho is None:
+            raise FileNotFoundError(f"nenhum checkpoint em {self.diretorio}")
+        simulacao = carregar_checkpoint(caminho, grafo, **opcoes)
+        return self.executar(simulacao, ate) if ate is not None else simulacao
@@ -0,0 +1,275 @@
+"""
+Linha de comando do simulador: python -m src <subcomando> [opções]
+
+Subcomandos:
+    simulate  Executa a simulação SimPy do cenário e grava os eventos em disco
+    route     Melhor rota entre dois nós da rede do cenário
+    refine    Derivados obtidos de uma quantidade de petróleo
+    report    Gera o relatório em PDF a partir dos resultados gravados
+    ingest    Ingere telemetria (arquivos ou sockets) na simulação e no preditor de falhas
+    generate  Gera uma rede sintética grande e a grava em .npz
+
+Cada subcomando importa apenas o que usa, para que a partida seja rápida quando o
+simulador é chamado milhares de vezes por um escalonador.
+"""
+import argparse
+import json
+import logging
+import sys
+
+CONFIG_PADRAO = "data/input_config.json"
+RESULTADOS_PADRAO = "data/output_results.bin"
+
+
+def _cenario(args):
+    from src.cenarios import Cenario
+    return Cenario.carregar(args.config)
+
+
+def cmd_simulate(args):
+    import simpy
+    from src.resultados import EscritorResultados
+    from src.utils.metricas import metricas
+
+    cenario = _cenario(args)
+    duracao = args.duracao if args.duracao is not None else cenario.config.get("simulacao", {}).get("duracao", 50)
+    if args.semente is not None:
+        cenario.config.setdefault("simulacao", {"duracao": duracao})["semente"] = args.semente
+    gerenciador = None
+    if args.checkpoints:
+        from src.checkpoint import GerenciadorCheckpoints
+        gerenciador = GerenciadorCheckpoints(args.checkpoints, args.intervalo)
+    elif args.retomar:
+        print("Erro: --retomar exige --checkpoints", file=sys.stderr)
+        return 2
+
+    if args.retomar and gerenciador.ultimo() is not None:
+        # Continua o arquivo de eventos gravado junto com o checkpoint
+        simulacao = gerenciador.retomar(cenario.criar_grafo(), verbose=args.verbose)
+        escritor = simulacao.historico
+    else:
+        escritor = EscritorResultados(args.saida)
+        simulacao = cenario.criar_simulacao(simpy.Environment(), historico=escritor, verbose=args.verbose)
+    ativo = metricas.ativo
+    metricas.ativo = ativo or args.metricas
+    try:
+        with escritor:
+            if gerenciador is not None:
+                gerenciador.executar(simulacao, duracao)
+            else:
+                simulacao.executar(duracao)
+            n_eventos = len(escritor)
+    finally:
+        metricas.ativo = ativo
+
+    resumo = {
+        "eventos": n_eventos,
+        "falhas": sum(simulacao.falhas_por_aresta.values()),
+        "desvios": simulacao.desvios,
+        "tempo_inativo": sum(simulacao.tempo_inativo_por_aresta().values()),
+        "resultados": escritor.caminho,
+    }
+    if args.metricas:
+        resumo["metricas"] = metricas.instantaneo()
+    print(json.dumps(resumo, ensure_ascii=False, indent=2))
+    return 0
+
+
+def cmd_route(args):
+    from src.cache_rotas import CacheRotas
+
+    if args.rede:
+        from src.grafo_compacto import GrafoCompacto
+        grafo = GrafoCompacto.carregar(args.rede)
+    else:
+        grafo = _cenario(args).criar_grafo()
+    rota = CacheRotas().rota(grafo, args.origem, args.destino, args.criterio)
+    if rota is None:
+        print(f"Sem rota de {args.origem} para {args.destino}", file=sys.stderr)
+        return 1
+    valores = [grafo[u][v].get(args.criterio, 1) for u, v in zip(rota, rota[1:])]
+    # Capacidade da rota = a do trecho mais estreito; custo e distância se somam
+    total = min(valores, default=None) if args.criterio == "capacidade" else sum(valores)
+    print(json.dumps({"rota": rota, args.criterio: total}, ensure_ascii=False))
+    return 0
+
+
+def cmd_refine(args):
+    from src.models.refinery import Refinery
+
+    parametros = dict(_cenario(args).config["refinaria"]) if args.config else {}
+    if args.capacidade is not None:
+        parametros["capacidade_processamento"] = args.capacidade
+    if args.eficiencia is not None:
+        parametros["eficiencia"] = args.eficiencia
+    parametros.setdefault("capacidade_processamento", 200000)
+    parametros.setdefault("eficiencia", 0.9)
+    produtos = Refinery(**parametros).processar_petroleo(args.quantidade)
+    print(json.dumps(produtos, ensure_ascii=False))
+    return 0
+
+
+def cmd_report(args):
+    from src.relatorios import Relatorio, figura_fluxo_duto, figura_fluxo_eventos, figura_produtos, fluxo_transiente
+    from src.resultados import LeitorResultados
+
+    cenario = _cenario(args)
+    capacidade = cenario.config["pipeline"]["capacidade_maxima"]
+    pipeline = cenario.criar_pipeline()
+
+    relatorio = Relatorio(args.saida)
+    relatorio.adicionar(figura_fluxo_duto, *fluxo_transiente(pipeline, capacidade))
+    relatorio.adicionar(figura_produtos, cenario.criar_refinaria().processar_petroleo(pipeline.calcular_fluxo(capacidade)))
+    if args.resultados:
+        resultados = LeitorResultados(args.resultados)
+        relatorio.adicionar(figura_fluxo_eventos, resultados.tempos, resultados.fluxos, args.max_pontos)
+    print(relatorio.salvar())
+    return 0
+
+
+def cmd_ingest(args):
+    import asyncio
+    import os
+    import time
+    import simpy
+    from src.models.previsao_falhas import PreditorFalhasOnline
+    from src.simulacao import Simulacao
+    from src.telemetria import DestinoPreditor, DestinoSimulacao, IngestorTelemetria, ler_arquivo
+
+    if not args.arquivos and not (args.tcp or args.unix):
+        print("Erro: informe arquivos de leituras, --tcp ou --unix", file=sys.stderr)
+        return 2
+    cenario = _cenario(args)
+    sensores = [(a["origem"], a["destino"]) for a in cenario.config["rede"]["arestas"]]  # Sensor i = aresta i do cenário
+    simulacao = Simulacao(simpy.Environment(), cenario.criar_grafo(), verbose=False)
+    destinos = [DestinoSimulacao(simulacao, sensores, vazao_minima=args.vazao_minima)]
+    preditor = None
+    if args.modelo:
+        preditor = PreditorFalhasOnline.carregar(args.modelo) if os.path.exists(args.modelo) else PreditorFalhasOnline()
+        destinos.append(DestinoPreditor(preditor, sensores, historico=simulacao.historico))
+    ingestor = IngestorTelemetria(sensores, janela=args.janela, destinos=destinos)
+
+    async def executar():
+        if args.arquivos:
+            return await ingestor.executar(*(ler_arquivo(a, args.formato, taxa=args.taxa) for a in args.arquivos))
+        if args.unix:
+            servidor = await ingestor.servir(caminho_unix=args.unix, formato=args.formato or "binario")
+        else:
+            host, _, porta = args.tcp.rpartition(":")
+            servidor = await ingestor.servir(host or "127.0.0.1", int(porta), formato=args.formato or "binario")
+        print(f"Recebendo leituras em {args.unix or args.tcp} (Ctrl+C para encerrar)", file=sys.stderr)
+        try:
+            await asyncio.sleep(args.tempo_limite if args.tempo_limite else float("inf"))
+        finally:
+            servidor.close()
+        return await ingestor.concluir()
+
+    inicio = time.perf_counter()
+    try:
+        asyncio.run(executar())
+    except KeyboardInterrupt:
+        pass
+    duracao = time.perf_counter() - inicio
+    if preditor is not None:
+        preditor.salvar(args.modelo)
+
+    resumo = dict(ingestor.resumo(), leituras_por_segundo=round(ingestor.leituras / duracao) if duracao else 0,
+                  tempo_simulado=simulacao.env.now,
+                  falhas={f"{o}->{d}": n for (o, d), n in simulacao.falhas_por_aresta.items()})
+    if preditor is not None:
+        resumo["alertas"] = len(destinos[1].alertas)
+    print(json.dumps(resumo, ensure_ascii=False, indent=2))
+    return 0
+
+
+def cmd_generate(args):
+    import time
+    from src.grafo_compacto import gerar_rede_sintetica
+
+    inicio = time.perf_counter()
+    grafo = gerar_rede_sintetica(args.refinarias, args.terminais, args.portos, args.distribuidoras,
+                                 vizinhos=args.vizinhos, semente=args.semente)
+    grafo.salvar(args.saida)
+    print(json.dumps({"nos": grafo.number_of_nodes(), "arestas": grafo.number_of_edges(), "bytes": grafo.nbytes,
+                      "segundos": round(time.perf_counter() - inicio, 3), "arquivo": args.saida}, ensure_ascii=False))
+    return 0
+
+
+def criar_parser():
+    parser = argparse.ArgumentParser(prog="python -m src", description="Simulador de transporte de petróleo")
+    parser.add_argument("--log-nivel", default="warning", type=str.lower, choices=("debug", "info", "warning", "error"),
+                        help="Nível de log")
+    parser.add_argument("--log-arquivo", default=None, help="Arquivo de log (padrão: sem arquivo, só avisos no stderr)")
+    parser.add_argument("--log-json", action="store_true", help="Uma linha JSON por evento de log")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    simulate = subparsers.add_parser("simulate", help="Executa a simulação do cenário")
+    simulate.add_argument("--config", default=CONFIG_PADRAO)
+    simulate.add_argument("--duracao", type=float, help="Horizonte simulado (h); padrão: o do cenário")
+    simulate.add_argument("--semente", type=int)
+    simulate.add_argument("--saida", default=RESULTADOS_PADRAO, help="Arquivo binário de eventos")
+    simulate.add_argument("--metricas", action="store_true", help="Inclui contadores e cronômetros no resumo")
+    simulate.add_argument("--verbose", action="store_true", help="Registra cada evento no log")
+    simulate.add_argument("--checkpoints", help="Diretório onde gravar checkpoints periódicos")
+    simulate.add_argument("--intervalo", type=float, default=24.0, help="Horas simuladas entre checkpoints")
+    simulate.add_argument("--retomar", action="store_true", help="Continua do último checkpoint (se houver)")
+    simulate.set_defaults(funcao=cmd_simulate)
+
+    route = subparsers.add_parser("route", help="Melhor rota entre dois nós")
+    route.add_argument("origem")
+    route.add_argument("destino")
+    route.add_argument("--criterio", default="custo", choices=("custo", "distancia", "capacidade"))
+    route.add_argument("--config", default=CONFIG_PADRAO)
+    route.add_argument("--rede", help="Rede gravada por 'generate' (.npz) no lugar da rede do cenário")
+    route.set_defaults(funcao=cmd_route)
+
+    refine = subparsers.add_parser("refine", help="Derivados de uma quantidade de petróleo")
+    refine.add_argument("quantidade", type=float, help="Petróleo processado (m³)")
+    refine.add_argument("--config", default=None, help="Usa a refinaria do cenário")
+    refine.add_argument("--capacidade", type=float)
+    refine.add_argument("--eficiencia", type=float)
+    refine.set_defaults(funcao=cmd_refine)
+
+    report = subparsers.add_parser("report", help="Relatório em PDF")
+    report.add_argument("--config", default=CONFIG_PADRAO)
+    report.add_argument("--resultados", default=None, help="Eventos gravados por 'simulate' (opcional)")
+    report.add_argument("--saida", default="graficos_fluxo_petroleo.pdf")
+    report.add_argument("--max-pontos", type=int, default=2000)
+    report.set_defaults(funcao=cmd_report)
+
+    ingest = subparsers.add_parser("ingest", help="Ingere telemetria de arquivos ou sockets na simulação")
+    ingest.add_argument("arquivos", nargs="*", help="Arquivos de leituras a reproduzir (.bin ou .csv)")
+    ingest.add_argument("--tcp", help="Recebe leituras em HOST:PORTA")
+    ingest.add_argument("--unix", help="Recebe leituras em um socket Unix")
+    ingest.add_argument("--formato", choices=("binario", "csv"), help="Padrão: pela extensão; binário nos sockets")
+    ingest.add_argument("--janela", type=float, default=1 / 60, help="Duração da janela (h)")
+    ingest.add_argument("--taxa", type=float, help="Leituras/s na reprodução de arquivos (padrão: sem limite)")
+    ingest.add_argument("--vazao-minima", type=float, help="Vazão (m³/h) abaixo da qual a aresta entra em falha")
+    ingest.add_argument("--modelo", help="Preditor de falhas a atualizar (carregado se existir, salvo ao final)")
+    ingest.add_argument("--tempo-limite", type=float, help="Segundos recebendo nos sockets (padrão: até Ctrl+C)")
+    ingest.add_argument("--config", default=CONFIG_PADRAO)
+    ingest.set_defaults(funcao=cmd_ingest)
+
+    generate = subparsers.add_parser("generate", help="Gera uma rede sintética (.npz)")
+    generate.add_argument("--refinarias", type=int, default=20)
+    generate.add_argument("--terminais", type=int, default=500)
+    generate.add_argument("--portos", type=int, default=10)
+    generate.add_argument("--distribuidoras", type=int, default=20000)
+    generate.add_argument("--vizinhos", type=int, default=3, help="Ligações por nó em cada camada da rede")
+    generate.add_argument("--semente", type=int, default=0)
+    generate.add_argument("--saida", default="data/rede_sintetica.npz")
+    generate.set_defaults(funcao=cmd_generate)
+    return parser
+
+
+def main(argv=None):
+    args = criar_parser().parse_args(argv)
+    if args.log_arquivo or args.log_nivel != "warning" or args.log_json:
+        from src.utils.logger import configurar_logging
+        configurar_logging(nivel=getattr(logging, args.log_nivel.upper()), arquivo=args.log_arquivo,
+                           formato="json" if args.log_json else "texto", console=args.log_arquivo is None)
+    try:
+        return args.funcao(args)
+    except (ValueError, OSError) as erro:
+        print(f"Erro: {erro}", file=sys.stderr)
+        return 2
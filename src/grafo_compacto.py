@@ -0,0 +1,623 @@
+import heapq
+import math
+from collections.abc import Mapping, MutableMapping
+
+import numpy as np
+
+from src.cache_rotas import peso_criterio, validar_criterio
+
+TIPOS_NO = ("refinaria", "terminal", "porto", "distribuidora")  # Códigos do atributo de nó `tipo`
+
+# Ligações da rede sintética: (tipo de origem, tipo de destino, custo por km, capacidade mínima e máxima em m³/h)
+LIGACOES = {
+    "importacao": ("porto", "refinaria", 0.02, 150.0, 300.0),
+    "escoamento": ("refinaria", "terminal", 0.03, 80.0, 200.0),
+    "tronco": ("terminal", "terminal", 0.025, 60.0, 150.0),
+    "distribuicao": ("terminal", "distribuidora", 0.05, 10.0, 60.0),
+}
+
+
+def _ausente(valor):
+    return valor is None or (isinstance(valor, float) and math.isnan(valor))
+
+
+class _VistaAresta(MutableMapping):
+    """Atributos de uma aresta, lidos e gravados direto nas colunas do grafo (como `grafo[u][v]` no networkx)."""
+
+    __slots__ = ("_grafo", "_indice")
+
+    def __init__(self, grafo, indice):
+        self._grafo = grafo
+        self._indice = indice
+
+    def __getitem__(self, nome):
+        valor = self._grafo.atributos[nome].item(self._indice)
+        if _ausente(valor):
+            raise KeyError(nome)
+        return valor
+
+    def __setitem__(self, nome, valor):
+        self._grafo._definir_atributo(self._indice, nome, valor)
+
+    def __delitem__(self, nome):
+        if nome == "ativa" or nome not in self:
+            raise KeyError(nome)
+        self._grafo._definir_atributo(self._indice, nome, None)
+
+    def __iter__(self):
+        return (nome for nome, coluna in self._grafo.atributos.items() if not _ausente(coluna.item(self._indice)))
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class _VistaAdjacencia(Mapping):
+    """Sucessores de um nó: `grafo[u]`, com `grafo[u][v]` dando os atributos da aresta."""
+
+    __slots__ = ("_grafo", "_no")
+
+    def __init__(self, grafo, no):
+        self._grafo = grafo
+        self._no = no
+
+    def __getitem__(self, destino):
+        indice = self._grafo._indice_aresta(self._no, destino)
+        if indice is None:
+            raise KeyError(destino)
+        return _VistaAresta(self._grafo, indice)
+
+    def __iter__(self):
+        grafo = self._grafo
+        inicio, fim = grafo.ponteiros[self._no], grafo.ponteiros[self._no + 1]
+        return (grafo.nome(j) for j in grafo.destinos[inicio:fim].tolist())
+
+    def __len__(self):
+        return int(self._grafo.ponteiros[self._no + 1] - self._grafo.ponteiros[self._no])
+
+    def __contains__(self, destino):
+        return self._grafo._indice_aresta(self._no, destino) is not None
+
+
+class _VistaNos:
+    """`grafo.nodes`: iterável de nomes, chamável como no networkx e indexável por nome."""
+
+    __slots__ = ("_grafo",)
+
+    def __init__(self, grafo):
+        self._grafo = grafo
+
+    def __call__(self, data=False, default=None):
+        grafo = self._grafo
+        if data is False:
+            return iter(grafo.nomes)
+        if data is True:
+            return ((nome, self[nome]) for nome in grafo.nomes)
+        coluna = grafo.atributos_nos.get(data)
+        if coluna is None:
+            return ((nome, default) for nome in grafo.nomes)
+        return ((nome, default if _ausente(valor) else valor) for nome, valor in zip(grafo.nomes, coluna.tolist()))
+
+    def __iter__(self):
+        return iter(self._grafo.nomes)
+
+    def __len__(self):
+        return len(self._grafo)
+
+    def __contains__(self, no):
+        return no in self._grafo
+
+    def __getitem__(self, no):
+        i = self._grafo._indice_no(no)
+        if i is None:
+            raise KeyError(no)
+        atributos = {}
+        for nome, coluna in self._grafo.atributos_nos.items():
+            valor = coluna.item(i)
+            if not _ausente(valor):
+                atributos[nome] = valor
+        return atributos
+
+
+class _VistaArestas:
+    """`grafo.edges`: pares (origem, destino), chamável como no networkx e indexável por par."""
+
+    __slots__ = ("_grafo",)
+
+    def __init__(self, grafo):
+        self._grafo = grafo
+
+    def __call__(self, data=False, default=None):
+        grafo = self._grafo
+        nomes = grafo.nomes
+        pares = ((nomes[u], nomes[v]) for u, v in zip(grafo.origens.tolist(), grafo.destinos.tolist()))
+        if data is False:
+            return pares
+        if data is True:
+            return ((u, v, _VistaAresta(grafo, e)) for e, (u, v) in enumerate(pares))
+        coluna = grafo.atributos.get(data)
+        if coluna is None:
+            return ((u, v, default) for u, v in pares)
+        return ((u, v, default if _ausente(valor) else valor) for (u, v), valor in zip(pares, coluna.tolist()))
+
+    def __iter__(self):
+        return self()
+
+    def __len__(self):
+        return len(self._grafo.destinos)
+
+    def __contains__(self, aresta):
+        return self._grafo.has_edge(*aresta)
+
+    def __getitem__(self, aresta):
+        origem, destino = aresta
+        return self._grafo[origem][destino]
+
+
+class GrafoCompacto:
+    """
+    Grafo direcionado em arrays CSR, para redes com milhões de arestas.
+
+    As arestas ficam ordenadas por origem: as de um nó `i` ocupam as posições
+    `ponteiros[i]:ponteiros[i + 1]` de `destinos`, e cada atributo é uma coluna NumPy na
+    mesma ordem. Os nomes dos nós ficam em um único array de bytes UTF-8, buscados por
+    bisseção em uma permutação ordenada, sem um dicionário com um objeto por nó. Com custo,
+    distância e capacidade em float32, a rede de `gerar_rede_sintetica` ocupa ~30 bytes por
+    aresta, contra ~380 em um `networkx.DiGraph` com um dicionário por aresta.
+
+    Imita a parte da API do networkx usada pelo simulador (`grafo[u][v]`, `nodes`, `edges`,
+    `has_edge`, `copy`...), então `Simulacao`, `CacheRotas`, `PlanejadorCapacidade` e
+    `ModeloFalhas` o aceitam no lugar de um `DiGraph`. A estrutura é fixa: os atributos
+    podem mudar, mas não é possível incluir nem remover nós ou arestas. Os nós são strings;
+    atributos numéricos ausentes são guardados como NaN; `ativa` existe sempre e começa
+    verdadeiro.
+    """
+
+    def __init__(self, nomes, origens, destinos, atributos=None, atributos_nos=None):
+        """
+        :param nomes: Nomes dos nós (strings); a posição na lista é o índice do nó
+        :param origens: Índice do nó de origem de cada aresta
+        :param destinos: Índice do nó de destino de cada aresta
+        :param atributos: Dicionário {nome: valores por aresta}, na ordem de `origens`.
+                          Colunas float32 são mantidas; outros números viram float64.
+        :param atributos_nos: Dicionário {nome: valores por nó}, na ordem de `nomes`
+        """
+        try:
+            codificados = [nome.encode("utf-8") for nome in nomes]
+        except AttributeError:
+            raise ValueError("os nomes dos nós devem ser strings") from None
+        origens = np.asarray(origens, dtype=np.int64)
+        destinos = np.asarray(destinos, dtype=np.int64)
+        n = len(codificados)
+        if origens.shape != destinos.shape or origens.ndim != 1:
+            raise ValueError("origens e destinos devem ser vetores do mesmo tamanho")
+        if len(origens) and (min(origens.min(), destinos.min()) < 0 or max(origens.max(), destinos.max()) >= n):
+            raise ValueError(f"índice de nó fora do intervalo [0, {n})")
+
+        chaves = origens * n + destinos
+        ordem = np.argsort(chaves, kind="stable")
+        repetidas = np.diff(chaves[ordem]) == 0
+        origens, destinos = origens[ordem], destinos[ordem]
+        if repetidas.any():
+            e = int(np.argmax(repetidas))
+            raise ValueError(f"aresta repetida: {codificados[origens[e]].decode()!r} -> {codificados[destinos[e]].decode()!r}")
+
+        tipo_indice = np.int32 if len(destinos) < 2 ** 31 else np.int64
+        ponteiros = np.zeros(n + 1, dtype=tipo_indice)
+        np.cumsum(np.bincount(origens, minlength=n), out=ponteiros[1:])
+        atributos = {nome: self._coluna(valores, len(ordem))[ordem] for nome, valores in (atributos or {}).items()}
+        atributos_nos = {nome: self._coluna(valores, n, manter_inteiros=True) for nome, valores in (atributos_nos or {}).items()}
+        self._definir_estrutura(np.array(codificados, dtype=np.bytes_) if n else np.array([], dtype="S1"), None, ponteiros, destinos.astype(np.int32), atributos, atributos_nos)
+
+    @staticmethod
+    def _coluna(valores, tamanho, manter_inteiros=False):
+        coluna = np.asarray(valores)
+        if coluna.shape != (tamanho,):
+            raise ValueError(f"coluna com {coluna.shape} valores, esperado ({tamanho},)")
+        if coluna.dtype.kind in "iu" and manter_inteiros:
+            return coluna.copy()
+        if coluna.dtype == np.float32:
+            return coluna.copy()
+        if coluna.dtype.kind in "iuf":
+            return coluna.astype(np.float64)
+        if coluna.dtype.kind == "b":
+            return coluna.copy()
+        return coluna.astype(object)
+
+    def _definir_estrutura(self, nomes, ordem_nomes, ponteiros, destinos, atributos, atributos_nos):
+        if ordem_nomes is None:
+            ordem_nomes = np.argsort(nomes, kind="stable").astype(np.int32)
+            ordenados = nomes[ordem_nomes]
+            repetidos = ordenados[1:] == ordenados[:-1]
+            if repetidos.any():
+                raise ValueError(f"nó repetido: {ordenados[1:][repetidos][0].decode('utf-8')!r}")
+        self._nomes = nomes  # Array de bytes UTF-8 de largura fixa
+        self._ordem_nomes = ordem_nomes  # Permutação que ordena `_nomes`, para busca por bisseção
+        self._consultados = {}  # Nome -> índice dos nós já buscados (só os usados nas consultas)
+        self.ponteiros = ponteiros
+        self.destinos = destinos
+        self.atributos = atributos
+        self.atributos.setdefault("ativa", np.ones(len(destinos), dtype=bool))
+        self.atributos_nos = atributos_nos
+        self._pesos_busca = {}  # Peso -> array float64 da busca, atualizado a cada alteração de atributo
+        self._arestas_entrada = None  # Ver `_reverso`
+
+    @classmethod
+    def _de_csr(cls, nomes, ordem_nomes, ponteiros, destinos, atributos, atributos_nos):
+        """Monta o grafo a partir de arrays CSR já ordenados, sem validar nem copiar."""
+        grafo = cls.__new__(cls)
+        grafo._definir_estrutura(nomes, ordem_nomes, ponteiros, destinos, atributos, atributos_nos)
+        return grafo
+
+    def __getstate__(self):
+        estado = self.__dict__.copy()
+        estado["_pesos_busca"] = {}  # Recalculados sob demanda; não vale a pena enviar aos processos do pool
+        estado["_arestas_entrada"] = None
+        return estado
+
+    def assinatura(self):
+        """Hash SHA-256 da estrutura (nomes e arestas), sem os atributos."""
+        import hashlib
+
+        resumo = hashlib.sha256()
+        for array in (self._nomes, self.ponteiros, self.destinos):
+            resumo.update(str(array.dtype).encode())
+            resumo.update(np.ascontiguousarray(array).tobytes())
+        return resumo.hexdigest()
+
+    def substituir_atributos(self, atributos):
+        """
+        Troca todas as colunas numéricas de aresta de uma vez (ex.: ao restaurar um checkpoint).
+
+        Colunas numéricas ausentes de `atributos` são removidas; as de objetos são mantidas.
+        """
+        m = len(self.destinos)
+        for nome, coluna in atributos.items():
+            if coluna.shape != (m,):
+                raise ValueError(f"coluna {nome!r} com {coluna.shape} valores, esperado ({m},)")
+        for nome in [nome for nome, coluna in self.atributos.items() if coluna.dtype != object]:
+            del self.atributos[nome]
+        self.atributos.update({nome: coluna.copy() for nome, coluna in atributos.items()})
+        self.atributos.setdefault("ativa", np.ones(m, dtype=bool))
+        self._pesos_busca = {}
+
+    # --- Nós ---
+
+    def _indice_no(self, nome):
+        """Índice do nó, ou None se não existir."""
+        indice = self._consultados.get(nome)
+        if indice is None and isinstance(nome, str):
+            chave = nome.encode("utf-8")
+            k = int(self._nomes.searchsorted(chave, sorter=self._ordem_nomes))
+            if k < len(self._ordem_nomes) and self._nomes[self._ordem_nomes[k]] == chave:
+                indice = self._consultados[nome] = int(self._ordem_nomes[k])
+        return indice
+
+    def nome(self, indice):
+        return self._nomes[indice].decode("utf-8")
+
+    @property
+    def nomes(self):
+        """Lista com o nome de cada nó, na ordem dos índices (montada a cada acesso)."""
+        return [nome.decode("utf-8") for nome in self._nomes.tolist()]
+
+    @property
+    def origens(self):
+        """Índice do nó de origem de cada aresta (calculado a partir de `ponteiros` a cada acesso)."""
+        return np.repeat(np.arange(len(self._nomes), dtype=np.int32), np.diff(self.ponteiros))
+
+    # --- API compatível com networkx.DiGraph ---
+
+    @property
+    def nodes(self):
+        return _VistaNos(self)
+
+    @property
+    def edges(self):
+        return _VistaArestas(self)
+
+    def __len__(self):
+        return len(self._nomes)
+
+    def __iter__(self):
+        return iter(self.nomes)
+
+    def __contains__(self, no):
+        return self._indice_no(no) is not None
+
+    def __getitem__(self, no):
+        i = self._indice_no(no)
+        if i is None:
+            raise KeyError(no)
+        return _VistaAdjacencia(self, i)
+
+    def number_of_nodes(self):
+        return len(self._nomes)
+
+    def number_of_edges(self):
+        return len(self.destinos)
+
+    def has_node(self, no):
+        return no in self
+
+    def has_edge(self, origem, destino):
+        i = self._indice_no(origem)
+        return i is not None and self._indice_aresta(i, destino) is not None
+
+    def successors(self, no):
+        return iter(self[no])
+
+    def out_degree(self, no):
+        return len(self[no])
+
+    def is_directed(self):
+        return True
+
+    def copy(self):
+        """Cópia com atributos independentes; a estrutura (nomes e arrays CSR), que é fixa, é compartilhada."""
+        return self._de_csr(self._nomes, self._ordem_nomes, self.ponteiros, self.destinos,
+                            {nome: coluna.copy() for nome, coluna in self.atributos.items()},
+                            {nome: coluna.copy() for nome, coluna in self.atributos_nos.items()})
+
+    @property
+    def nbytes(self):
+        """Bytes ocupados pelos arrays de nomes, estrutura e atributos."""
+        arrays = [self._nomes, self._ordem_nomes, self.ponteiros, self.destinos,
+                  *self.atributos.values(), *self.atributos_nos.values()]
+        return sum(a.nbytes for a in arrays)
+
+    # --- Arestas e atributos ---
+
+    def _indice_aresta(self, i, destino):
+        j = self._indice_no(destino)
+        if j is None:
+            return None
+        inicio, fim = int(self.ponteiros[i]), int(self.ponteiros[i + 1])
+        k = inicio + int(self.destinos[inicio:fim].searchsorted(j))
+        return k if k < fim and self.destinos[k] == j else None
+
+    def _definir_atributo(self, indice, nome, valor):
+        coluna = self.atributos.get(nome)
+        numero = isinstance(valor, (int, float, np.number)) and not isinstance(valor, (bool, np.bool_))
+        if coluna is None:
+            # Coluna nova: numérica (NaN = ausente) se o valor for número, senão de objetos
+            coluna = np.full(len(self.destinos), np.nan) if numero else np.full(len(self.destinos), None, dtype=object)
+            self.atributos[nome] = coluna
+        elif coluna.dtype.kind == "f" and not numero:
+            if valor is None:
+                valor = np.nan
+            else:
+                coluna = self.atributos[nome] = np.where(np.isnan(coluna), None, coluna.astype(object))
+        coluna[indice] = valor
+        if nome == "ativa":
+            for peso, pesos in self._pesos_busca.items():
+                pesos[indice] = self._peso_aresta(indice, peso)
+        elif nome in self._pesos_busca:
+            self._pesos_busca[nome][indice] = self._peso_aresta(indice, nome)
+
+    def _peso_aresta(self, indice, peso):
+        """Peso da aresta na busca, como em `peso_criterio`; infinito se `ativa=False`."""
+        if not self.atributos["ativa"][indice]:
+            return math.inf
+        valor = self.atributos[peso].item(indice) if peso in self.atributos else None
+        return float(peso_criterio(peso, None if _ausente(valor) else valor))
+
+    def _pesos(self, peso):
+        pesos = self._pesos_busca.get(peso)
+        if pesos is None:
+            validar_criterio(peso)
+            coluna = self.atributos.get(peso)
+            pesos = np.ones(len(self.destinos)) if coluna is None else np.array(coluna, dtype=np.float64)
+            if peso == "capacidade":
+                with np.errstate(divide="ignore"):
+                    pesos = np.where(np.isnan(pesos) | (pesos > 0), 1.0 / pesos, np.inf)  # NaN (ausente) continua NaN
+            pesos[np.isnan(pesos)] = 1.0
+            pesos[~self.atributos["ativa"]] = np.inf
+            self._pesos_busca[peso] = pesos
+        return pesos
+
+    def _reverso(self):
+        """Arestas de entrada de cada nó (CSR transposto) e origem de cada aresta, montados na primeira busca."""
+        if self._arestas_entrada is None:
+            arestas = np.argsort(self.destinos, kind="stable").astype(np.int32)
+            ponteiros = np.zeros_like(self.ponteiros)
+            np.cumsum(np.bincount(self.destinos, minlength=len(self._nomes)), out=ponteiros[1:])
+            self._arestas_entrada = (ponteiros, arestas, self.origens)
+        return self._arestas_entrada
+
+    def caminho_minimo(self, origem, destino, peso="custo"):
+        """
+        Menor caminho com Dijkstra bidirecional, ignorando arestas com `ativa=False`.
+
+        Arestas sem o atributo `peso` valem 1 e a capacidade entra invertida, como na busca
+        do `CacheRotas` com networkx (`peso_criterio`).
+        As buscas a partir da origem (arestas de saída) e do destino (arestas de entrada)
+        se alternam e param quando um nó é finalizado pelas duas, como no
+        `networkx.bidirectional_dijkstra`. Um destino sem arestas de entrada ativas é
+        descartado logo no início, sem explorar a rede. Os arrays CSR são lidos por
+        `memoryview`, sem cópia para listas.
+
+        :return: Lista de nós da origem ao destino, ou None se não houver caminho ou um dos nós não existir
+        """
+        i, j = self._indice_no(origem), self._indice_no(destino)
+        if i is None or j is None:
+            return None
+        if i == j:
+            return [origem]  # Como no networkx: a rota trivial, mesmo sem arestas
+        pesos = memoryview(self._pesos(peso))
+        ponteiros_entrada, arestas_entrada, origens = self._reverso()
+        # Por sentido: (ponteiros, aresta da posição k, nó do outro extremo da aresta)
+        sentidos = ((memoryview(self.ponteiros), None, memoryview(self.destinos)),
+                    (memoryview(ponteiros_entrada), memoryview(arestas_entrada), memoryview(origens)))
+
+        finalizados = ({}, {})
+        alcancados = ({i: 0.0}, {j: 0.0})
+        anteriores = ({i: None}, {j: None})
+        filas = ([(0.0, i)], [(0.0, j)])
+        melhor, encontro = math.inf, None
+        sentido = 1
+        while filas[0] and filas[1]:
+            sentido = 1 - sentido
+            distancia, atual = heapq.heappop(filas[sentido])
+            if atual in finalizados[sentido]:
+                continue  # Entrada obsoleta: o nó já foi finalizado por um caminho melhor
+            finalizados[sentido][atual] = distancia
+            if atual in finalizados[1 - sentido]:
+                return self._juntar_rota(anteriores, encontro)
+
+            ponteiros, arestas, extremos = sentidos[sentido]
+            alcancados_aqui, alcancados_outro = alcancados[sentido], alcancados[1 - sentido]
+            for k in range(ponteiros[atual], ponteiros[atual + 1]):
+                e = k if arestas is None else arestas[k]
+                vizinho = extremos[e]
+                nova = distancia + pesos[e]
+                if nova < alcancados_aqui.get(vizinho, math.inf) and vizinho not in finalizados[sentido]:
+                    alcancados_aqui[vizinho] = nova
+                    anteriores[sentido][vizinho] = atual
+                    heapq.heappush(filas[sentido], (nova, vizinho))
+                    total = nova + alcancados_outro.get(vizinho, math.inf)
+                    if total < melhor:
+                        melhor, encontro = total, vizinho
+        return None
+
+    def _juntar_rota(self, anteriores, encontro):
+        ida, volta = [], []
+        no = encontro
+        while no is not None:
+            ida.append(no)
+            no = anteriores[0][no]
+        no = anteriores[1][encontro]
+        while no is not None:
+            volta.append(no)
+            no = anteriores[1][no]
+        return [self.nome(no) for no in ida[::-1] + volta]
+
+    # --- Conversão e persistência ---
+
+    @classmethod
+    def de_networkx(cls, grafo):
+        """Converte um `networkx.DiGraph`; atributos ausentes em parte das arestas viram NaN (ou None)."""
+        nomes = list(grafo.nodes)
+        indices = {nome: i for i, nome in enumerate(nomes)}
+        arestas = list(grafo.edges(data=True))
+        origens = [indices[u] for u, _, _ in arestas]
+        destinos = [indices[v] for _, v, _ in arestas]
+        chaves = {chave for _, _, dados in arestas for chave in dados}
+        atributos = {chave: cls._valores([dados.get(chave) for _, _, dados in arestas]) for chave in chaves}
+        if "ativa" in atributos:
+            atributos["ativa"] = np.array([dados.get("ativa", True) for _, _, dados in arestas], dtype=bool)
+        chaves_nos = {chave for _, dados in grafo.nodes(data=True) for chave in dados}
+        atributos_nos = {chave: cls._valores([dados.get(chave) for _, dados in grafo.nodes(data=True)]) for chave in chaves_nos}
+        return cls(nomes, origens, destinos, atributos, atributos_nos)
+
+    @staticmethod
+    def _valores(lista):
+        if all(v is None or (isinstance(v, (int, float)) and not isinstance(v, bool)) for v in lista):
+            return np.array([np.nan if v is None else v for v in lista], dtype=np.float64)
+        return np.array(lista, dtype=object)
+
+    def para_networkx(self):
+        """`networkx.DiGraph` equivalente (para desenhar ou usar algoritmos do networkx em redes pequenas)."""
+        import networkx as nx
+
+        grafo = nx.DiGraph()
+        grafo.add_nodes_from(self.nodes(data=True))
+        grafo.add_edges_from((u, v, dict(dados)) for u, v, dados in self.edges(data=True))
+        return grafo
+
+    def salvar(self, caminho):
+        """
+        Grava o grafo em `.npz` sem compressão; `carregar` só lê os arrays, sem reconstruir nada.
+
+        Colunas de objetos (ex.: `Pipeline` no atributo `duto`) não são suportadas.
+        """
+        colunas = {f"aresta_{nome}": c for nome, c in self.atributos.items()}
+        colunas.update({f"no_{nome}": c for nome, c in self.atributos_nos.items()})
+        objetos = [nome for nome, c in colunas.items() if c.dtype == object]
+        if objetos:
+            raise ValueError(f"colunas de objetos não podem ser gravadas: {', '.join(objetos)}")
+        with open(caminho, "wb") as arquivo:
+            np.savez(arquivo, nomes=self._nomes, ordem_nomes=self._ordem_nomes, ponteiros=self.ponteiros,
+                     destinos=self.destinos, **colunas)
+
+    @classmethod
+    def carregar(cls, caminho):
+        """Lê um grafo gravado por `salvar`."""
+        with np.load(caminho, allow_pickle=False) as dados:
+            atributos = {chave[len("aresta_"):]: dados[chave] for chave in dados.files if chave.startswith("aresta_")}
+            atributos_nos = {chave[len("no_"):]: dados[chave] for chave in dados.files if chave.startswith("no_")}
+            return cls._de_csr(dados["nomes"], dados["ordem_nomes"], dados["ponteiros"], dados["destinos"],
+                               atributos, atributos_nos)
+
+
+def _mais_proximos(pontos, alvos, k, excluir_proprio=False):
+    """Índices dos `k` alvos mais próximos de cada ponto (matriz len(pontos) x k)."""
+    from scipy.spatial import cKDTree
+
+    k = min(k, len(alvos) - excluir_proprio)
+    if k <= 0 or not len(pontos):
+        return np.empty((len(pontos), 0), dtype=np.int64)
+    _, vizinhos = cKDTree(alvos).query(pontos, k=k + excluir_proprio)
+    vizinhos = vizinhos.reshape(len(pontos), -1)
+    return vizinhos[:, 1:] if excluir_proprio else vizinhos
+
+
+def gerar_rede_sintetica(n_refinarias=10, n_terminais=100, n_portos=5, n_distribuidoras=1000, vizinhos=3,
+                         lado=2000.0, semente=0):
+    """
+    Rede sintética de refinarias, terminais, portos e distribuidoras, gerada de forma vetorizada.
+
+    Os nós são espalhados em um quadrado de `lado` km. Cada porto abastece as `vizinhos`
+    refinarias mais próximas, cada refinaria escoa para os terminais mais próximos, os
+    terminais formam uma malha troncal nos dois sentidos e cada distribuidora é atendida
+    pelos terminais mais próximos (ver `LIGACOES`). A distância da aresta é a euclidiana
+    vezes uma sinuosidade entre 1,1 e 1,4; o custo é a distância vezes a tarifa da ligação.
+
+    :param vizinhos: Ligações por nó em cada camada; a rede tem cerca de
+                     `vizinhos * (n_portos + n_refinarias + 2 * n_terminais + n_distribuidoras)` arestas
+    :param semente: Semente do gerador; a mesma semente gera a mesma rede
+    :return: `GrafoCompacto` com atributos de aresta `custo`, `distancia` e `capacidade` (float32)
+             e atributos de nó `tipo` (índice em `TIPOS_NO`), `x` e `y`
+    """
+    rng = np.random.default_rng(semente)
+    quantidades = dict(zip(TIPOS_NO, (n_refinarias, n_terminais, n_portos, n_distribuidoras)))
+    inicios = dict(zip(TIPOS_NO, np.cumsum([0, *quantidades.values()])[:-1].tolist()))
+    n = sum(quantidades.values())
+    tipos = np.repeat(np.arange(len(TIPOS_NO), dtype=np.int8), list(quantidades.values()))
+    pontos = rng.uniform(0.0, lado, size=(n, 2))
+
+    origens, destinos, tarifas, capacidades = [], [], [], []
+    for tipo_origem, tipo_destino, tarifa, cap_min, cap_max in LIGACOES.values():
+        a, b = inicios[tipo_origem], inicios[tipo_destino]
+        bloco_origem = pontos[a:a + quantidades[tipo_origem]]
+        bloco_destino = pontos[b:b + quantidades[tipo_destino]]
+        if tipo_destino == "distribuidora":
+            # Cada distribuidora escolhe seus terminais (e não o contrário), para que todas sejam atendidas
+            proximos = _mais_proximos(bloco_destino, bloco_origem, vizinhos)
+            u, v = a + proximos.ravel(), b + np.repeat(np.arange(len(bloco_destino)), proximos.shape[1])
+        else:
+            proximos = _mais_proximos(bloco_origem, bloco_destino, vizinhos, excluir_proprio=tipo_origem == tipo_destino)
+            u, v = a + np.repeat(np.arange(len(bloco_origem)), proximos.shape[1]), b + proximos.ravel()
+            if tipo_origem == tipo_destino:
+                u, v = np.concatenate([u, v]), np.concatenate([v, u])  # Malha troncal nos dois sentidos
+        origens.append(u)
+        destinos.append(v)
+        tarifas.append(np.full(len(u), tarifa))
+        capacidades.append(rng.uniform(cap_min, cap_max, len(u)))
+
+    origens, destinos = np.concatenate(origens), np.concatenate(destinos)
+    _, unicas = np.unique(origens * n + destinos, return_index=True)  # Pares repetidos da malha troncal
+    origens, destinos = origens[unicas], destinos[unicas]
+    distancias = np.hypot(*(pontos[origens] - pontos[destinos]).T) * rng.uniform(1.1, 1.4, len(origens))
+
+    prefixos = [tipo.capitalize() for tipo in TIPOS_NO]
+    nomes = [f"{prefixos[t]}_{i - inicios[TIPOS_NO[t]]}" for i, t in enumerate(tipos.tolist())]
+    atributos = {
+        "custo": (distancias * np.concatenate(tarifas)[unicas]).astype(np.float32),
+        "distancia": distancias.astype(np.float32),
+        "capacidade": np.concatenate(capacidades)[unicas].astype(np.float32),
+    }
+    atributos_nos = {"tipo": tipos, "x": pontos[:, 0].astype(np.float32), "y": pontos[:, 1].astype(np.float32)}
+    return GrafoCompacto(nomes, origens, destinos, atributos, atributos_nos)
@@ -0,0 +1,137 @@
+import numpy as np
+
+EVENTO_FLUXO = 0
+EVENTO_FALHA = 1
+EVENTO_RECUPERACAO = 2
+EVENTO_ENTREGA = 3
+EVENTO_MEDICAO = 4  # Média de uma janela de telemetria (ver `src/telemetria.py`)
+
+DTYPES_COLUNAS = {
+    "tempo": np.float64,
+    "aresta": np.int32,
+    "fluxo": np.float64,
+    "tipo": np.int8,
+}
+
+
+class HistoricoEventos:
+    """
+    Armazena os eventos da simulação em colunas NumPy tipadas e pré-alocadas.
+
+    Cada evento ocupa 21 bytes (tempo, índice da aresta, fluxo e tipo), contra mais de
+    100 bytes de uma tupla em lista. As colunas crescem em blocos e são expostas como
+    views, sem cópia; uma view permanece válida até o próximo crescimento.
+    """
+
+    def __init__(self, tamanho_bloco=4096):
+        """
+        :param tamanho_bloco: Número de eventos alocados de cada vez
+        """
+        self.tamanho_bloco = tamanho_bloco
+        self.n_eventos = 0
+        self.arestas = []  # Chave (origem, destino) de cada índice de aresta
+        self._indice_arestas = {}
+        self._colunas = {nome: np.empty(tamanho_bloco, dtype=dtype) for nome, dtype in DTYPES_COLUNAS.items()}
+
+    def __len__(self):
+        return self.n_eventos
+
+    def indice_aresta(self, aresta):
+        """Retorna o índice inteiro de uma aresta, registrando-a se for nova."""
+        indice = self._indice_arestas.get(aresta)
+        if indice is None:
+            indice = self._indice_arestas[aresta] = len(self.arestas)
+            self.arestas.append(aresta)
+        return indice
+
+    def restaurar(self, arestas, colunas=None):
+        """
+        Substitui o conteúdo pelas arestas e eventos informados (ex.: vindos de um checkpoint).
+
+        :param arestas: Chaves (origem, destino) na ordem dos índices de aresta
+        :param colunas: Dicionário {nome: array} com os eventos (padrão: nenhum)
+        """
+        self.arestas = list(arestas)
+        self._indice_arestas = {aresta: i for i, aresta in enumerate(self.arestas)}
+        n = len(colunas["tempo"]) if colunas is not None else 0
+        if n > len(self._colunas["tempo"]):
+            self._colunas = {nome: np.empty(n + self.tamanho_bloco, dtype=dtype) for nome, dtype in DTYPES_COLUNAS.items()}
+        for nome in self._colunas if n else ():
+            self._colunas[nome][:n] = colunas[nome]
+        self.n_eventos = n
+
+    def _crescer(self):
+        capacidade = len(self._colunas["tempo"])
+        nova_capacidade = capacidade + max(self.tamanho_bloco, capacidade)
+        for nome, coluna in self._colunas.items():
+            nova = np.empty(nova_capacidade, dtype=coluna.dtype)
+            nova[:self.n_eventos] = coluna[:self.n_eventos]
+            self._colunas[nome] = nova
+
+    def registrar(self, tempo, aresta, fluxo, tipo=EVENTO_FLUXO):
+        """
+        Acrescenta um evento ao histórico.
+
+        :param tempo: Instante do evento (h)
+        :param aresta: Par (origem, destino) associado ao evento
+        :param fluxo: Fluxo registrado (barris/hora)
+        :param tipo: EVENTO_FLUXO, EVENTO_FALHA ou EVENTO_RECUPERACAO
+        """
+        if self.n_eventos == len(self._colunas["tempo"]):
+            self._crescer()
+        i = self.n_eventos
+        self._colunas["tempo"][i] = tempo
+        self._colunas["aresta"][i] = self.indice_aresta(aresta)
+        self._colunas["fluxo"][i] = fluxo
+        self._colunas["tipo"][i] = tipo
+        self.n_eventos = i + 1
+
+    def coluna(self, nome):
+        """View (sem cópia) de uma coluna com os eventos registrados."""
+        return self._colunas[nome][:self.n_eventos]
+
+    def colunas(self):
+        """Dicionário {nome: view} com todas as colunas."""
+        return {nome: self.coluna(nome) for nome in self._colunas}
+
+    def intervalo(self, inicio, fim=None):
+        """Dicionário {nome: array} com os eventos de índice `inicio` a `fim` (exclusivo)."""
+        return {nome: coluna[inicio:fim] for nome, coluna in self.colunas().items()}
+
+    @property
+    def tempos(self):
+        return self.coluna("tempo")
+
+    @property
+    def fluxos(self):
+        return self.coluna("fluxo")
+
+    @property
+    def tipos(self):
+        return self.coluna("tipo")
+
+    def tempos_falha(self):
+        """Instantes dos eventos de falha, em ordem crescente."""
+        return np.sort(self.tempos[self.tipos == EVENTO_FALHA])
+
+    def rotular_falhas(self):
+        """
+        Rótulo 1/0 por evento indicando se o instante coincide com uma falha.
+
+        Usa junção por tempo ordenado (`searchsorted`) em vez de busca em lista, O(n log m).
+        """
+        falhas = self.tempos_falha()
+        tempos = self.tempos
+        if len(falhas) == 0:
+            return np.zeros(len(tempos), dtype=np.int8)
+        posicoes = np.minimum(np.searchsorted(falhas, tempos), len(falhas) - 1)
+        return (falhas[posicoes] == tempos).astype(np.int8)
+
+    def memoria_bytes(self):
+        """Memória ocupada pelas colunas alocadas."""
+        return sum(coluna.nbytes for coluna in self._colunas.values())
+
+    def para_dataframe(self):
+        """Converte as colunas para um `pandas.DataFrame` sem copiar os dados."""
+        import pandas as pd
+        return pd.DataFrame(self.colunas(), copy=False)
@@ -0,0 +1,109 @@
+import heapq
+
+from src.checkpoint import atraso_ate
+from src.historico_eventos import EVENTO_FALHA, EVENTO_RECUPERACAO
+from src.utils.metricas import metricas
+
+FALHA = 0
+REPARO = 1
+
+
+def _amostrador(distribuicao):
+    """Número = média de uma exponencial; função = recebe o RNG e devolve a duração."""
+    if callable(distribuicao):
+        return distribuicao
+    taxa = 1.0 / distribuicao
+    return lambda rng: rng.expovariate(taxa)
+
+
+class DuracaoUniforme:
+    """Duração uniforme em [minimo, maximo]; ao contrário de uma lambda, pode ser gravada em um checkpoint."""
+
+    def __init__(self, minimo, maximo):
+        self.minimo = minimo
+        self.maximo = maximo
+
+    def __call__(self, rng):
+        return rng.uniform(self.minimo, self.maximo)
+
+
+class ModeloFalhas:
+    """
+    Falhas e reparos em todas as arestas do grafo, orientados a eventos.
+
+    Um único processo SimPy consome uma fila de prioridade compartilhada com o próximo
+    evento (falha ou reparo) de cada aresta, em vez de um gerador por aresta. Enquanto
+    está em falha, a aresta fica com `ativa=False`: as rotas em cache que a usam são
+    invalidadas e o transporte é redirecionado (ou interrompido, se não houver rota).
+    A rota e o fluxo de cada viagem são definidos na partida, então uma viagem já em curso
+    quando a aresta falha não é afetada; o desvio vale a partir da viagem seguinte. As
+    falhas passam por `Simulacao.abrir_falha`/`fechar_falha` e podem se sobrepor às de
+    outras fontes (ex.: `introduzir_falhas`, telemetria) na mesma aresta.
+    """
+
+    def __init__(self, simulacao, mtbf=200.0, mttr=8.0, arestas=None):
+        """
+        :param simulacao: `Simulacao` cujas arestas falham
+        :param mtbf: Tempo médio entre falhas (h) ou função rng -> duração
+        :param mttr: Tempo médio de reparo (h) ou função rng -> duração
+        :param arestas: Arestas sujeitas a falhas (padrão: todas). Os atributos de aresta
+                        `mtbf` e `mttr`, se presentes, substituem os valores globais.
+        """
+        self.simulacao = simulacao
+        self.mtbf = mtbf
+        self.mttr = mttr
+        self.arestas = list(arestas) if arestas is not None else list(simulacao.grafo.edges)
+        grafo = simulacao.grafo
+        self._tempo_falha = [_amostrador(grafo.edges[a].get("mtbf", mtbf)) for a in self.arestas]
+        self._tempo_reparo = [_amostrador(grafo.edges[a].get("mttr", mttr)) for a in self.arestas]
+        self.ativa = [True] * len(self.arestas)
+        self.n_eventos = 0
+        self._fila = []
+        self._sequencia = 0
+        self._pendente = None  # Evento retirado da fila cujo instante ainda não chegou
+
+    def _agendar(self, tempo, indice, tipo):
+        heapq.heappush(self._fila, (tempo, self._sequencia, indice, tipo))
+        self._sequencia += 1
+
+    def processo(self, retomar_em=None):
+        """
+        Processo SimPy que dispara as falhas e os reparos de todas as arestas.
+
+        :param retomar_em: Ao restaurar um checkpoint, instante em que o evento `_pendente`
+                           ocorre; a fila já vem preenchida e não é reagendada
+        """
+        simulacao = self.simulacao
+        env, rng = simulacao.env, simulacao.rng
+        if retomar_em is None:
+            for indice, amostrar in enumerate(self._tempo_falha):
+                self._agendar(env.now + amostrar(rng), indice, FALHA)
+        else:
+            yield env.timeout(atraso_ate(env.now, retomar_em))
+
+        while self._pendente is not None or self._fila:
+            if self._pendente is None:
+                self._pendente = heapq.heappop(self._fila)
+                if self._pendente[0] > env.now:
+                    yield env.timeout(self._pendente[0] - env.now)
+            _, _, indice, tipo = self._pendente
+            self._pendente = None
+            origem, destino = aresta = self.arestas[indice]
+            self.n_eventos += 1
+
+            if tipo == FALHA:
+                self.ativa[indice] = False
+                simulacao.abrir_falha(aresta)
+                simulacao.historico.registrar(env.now, aresta, 0.0, EVENTO_FALHA)
+                metricas.incrementar("simulacao.eventos.falha")
+                self._agendar(env.now + self._tempo_reparo[indice](rng), indice, REPARO)
+            else:
+                self.ativa[indice] = True
+                simulacao.fechar_falha(aresta)
+                simulacao.historico.registrar(env.now, aresta, simulacao.grafo[origem][destino].get("capacidade", 0.0), EVENTO_RECUPERACAO)
+                metricas.incrementar("simulacao.eventos.recuperacao")
+                self._agendar(env.now + self._tempo_falha[indice](rng), indice, FALHA)
+
+    def arestas_inativas(self):
+        """Arestas atualmente em falha."""
+        return [aresta for aresta, ativa in zip(self.arestas, self.ativa) if not ativa]
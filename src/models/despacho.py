@@ -0,0 +1,223 @@
+import heapq
+import itertools
+
+from src.historico_eventos import EVENTO_ENTREGA
+from src.utils.logger import get_logger
+from src.utils.metricas import metricas
+
+logger = get_logger(__name__)
+
+
+class Pedido:
+    """Pedido de transporte de um derivado entre dois pontos."""
+
+    def __init__(self, produto, quantidade, origem, destino, prioridade=0, liberacao=0.0, distancia=None):
+        """
+        :param produto: Nome do derivado
+        :param quantidade: Quantidade pedida (m³)
+        :param origem: Ponto de carregamento (ex.: refinaria)
+        :param destino: Ponto de entrega (ex.: distribuidora)
+        :param prioridade: Pedidos com prioridade maior são atendidos primeiro
+        :param liberacao: Instante a partir do qual o pedido pode ser despachado (h)
+        :param distancia: Distância do trajeto (km); se omitida, usa a do caminhão
+        """
+        self.produto = produto
+        self.quantidade = quantidade
+        self.origem = origem
+        self.destino = destino
+        self.prioridade = prioridade
+        self.liberacao = liberacao
+        self.distancia = distancia
+        self.restante = quantidade
+
+    @property
+    def rota(self):
+        """Pedidos com a mesma rota podem dividir um caminhão."""
+        return (self.origem, self.destino, self.produto)
+
+    def __str__(self):
+        return f"Pedido - {self.quantidade} m³ de {self.produto} | {self.origem} -> {self.destino} | Prioridade {self.prioridade}"
+
+
+class Viagem:
+    """Uma viagem de caminhão com uma ou mais parcelas de pedidos."""
+
+    def __init__(self, caminhao, parcelas, partida, chegada, retorno, entregue):
+        self.caminhao = caminhao    # Índice do caminhão na frota
+        self.parcelas = parcelas    # Lista de (pedido, quantidade carregada)
+        self.partida = partida
+        self.chegada = chegada
+        self.retorno = retorno
+        self.entregue = entregue    # Quantidade entregue após a eficiência do transporte
+
+    @property
+    def carga(self):
+        return sum(quantidade for _, quantidade in self.parcelas)
+
+
+class DespachoFrota:
+    """
+    Escalonador de despacho de uma frota de caminhões (`Transport`).
+
+    Os pedidos liberados ficam em uma fila de prioridade; o caminhão que fica livre primeiro
+    recebe o pedido mais urgente e o espaço restante é preenchido (first-fit) com outros
+    pedidos da mesma rota e produto, dividindo pedidos maiores que a capacidade.
+    """
+
+    def __init__(self, caminhoes, velocidade=60.0):
+        """
+        :param caminhoes: Lista de objetos `Transport`
+        :param velocidade: Velocidade média dos caminhões (km/h)
+        """
+        self.caminhoes = list(caminhoes)
+        self.velocidade = velocidade
+
+    @metricas.medir("despacho.despachar")
+    def despachar(self, pedidos):
+        """
+        Atribui os pedidos aos caminhões.
+
+        :param pedidos: Lista de `Pedido`
+        :return: Lista de `Viagem` na ordem em que foram atribuídas
+        """
+        sequencia = itertools.count()
+        chegando = sorted(pedidos, key=lambda p: p.liberacao)
+        proximo = 0
+        fila = []        # (-prioridade, liberação, seq, pedido) de todos os pedidos liberados
+        por_rota = {}    # rota -> heap com a mesma chave, para o preenchimento first-fit
+        livres = [(0.0, -c.capacidade_caminhao, i) for i, c in enumerate(self.caminhoes)]
+        heapq.heapify(livres)
+        viagens = []
+
+        def liberar(ate):
+            nonlocal proximo
+            while proximo < len(chegando) and chegando[proximo].liberacao <= ate:
+                pedido = chegando[proximo]
+                pedido.restante = pedido.quantidade
+                entrada = (-pedido.prioridade, pedido.liberacao, next(sequencia), pedido)
+                heapq.heappush(fila, entrada)
+                heapq.heappush(por_rota.setdefault(pedido.rota, []), entrada)
+                proximo += 1
+
+        while livres:
+            while fila and fila[0][3].restante <= 0:
+                heapq.heappop(fila)  # Pedido já atendido por preenchimento
+            if not fila and proximo == len(chegando):
+                break
+            livre_em, _, indice = heapq.heappop(livres)
+            liberar(livre_em)
+            if not fila:
+                livre_em = max(livre_em, chegando[proximo].liberacao)
+                liberar(livre_em)
+
+            caminhao = self.caminhoes[indice]
+            principal = fila[0][3]
+            espaco = caminhao.capacidade_caminhao
+            parcelas = []
+            candidatos = por_rota[principal.rota]
+            # O pedido principal vai primeiro; depois os demais da mesma rota por prioridade
+            for pedido in itertools.chain([principal], self._por_prioridade(candidatos)):
+                if espaco <= 0:
+                    break
+                if pedido.restante <= 0 or (parcelas and pedido is principal):
+                    continue
+                quantidade = min(pedido.restante, espaco)
+                pedido.restante -= quantidade
+                espaco -= quantidade
+                parcelas.append((pedido, quantidade))
+            while candidatos and candidatos[0][3].restante <= 0:
+                heapq.heappop(candidatos)
+            if not candidatos:
+                del por_rota[principal.rota]
+
+            # Pedidos liberados por outro caminhão podem ser posteriores ao instante em que este ficou livre
+            livre_em = max(livre_em, max(pedido.liberacao for pedido, _ in parcelas))
+            distancia = principal.distancia if principal.distancia is not None else caminhao.distancia
+            ida = distancia / self.velocidade
+            carga = caminhao.capacidade_caminhao - espaco
+            viagens.append(Viagem(indice, parcelas, livre_em, livre_em + ida, livre_em + 2 * ida,
+                                  carga * caminhao.eficiencia_transporte))
+            heapq.heappush(livres, (livre_em + 2 * ida, -caminhao.capacidade_caminhao, indice))
+
+        logger.info("🚛 Despacho concluído: %d pedidos em %d viagens", len(pedidos), len(viagens))
+        return viagens
+
+    @staticmethod
+    def _por_prioridade(candidatos):
+        """Percorre o heap de uma rota em ordem de prioridade, sem removê-lo."""
+        if not candidatos:
+            return
+        pendentes = [(candidatos[0], 0)]
+        while pendentes:
+            entrada, i = heapq.heappop(pendentes)
+            yield entrada[3]
+            for filho in (2 * i + 1, 2 * i + 2):
+                if filho < len(candidatos):
+                    heapq.heappush(pendentes, (candidatos[filho], filho))
+
+    @staticmethod
+    def resumo(viagens):
+        """Indicadores do despacho: viagens, volume entregue e espera dos pedidos (h)."""
+        esperas = [v.partida - pedido.liberacao for v in viagens for pedido, _ in v.parcelas]
+        return {
+            "viagens": len(viagens),
+            "entregue": sum(v.entregue for v in viagens),
+            "espera_media": sum(esperas) / len(esperas) if esperas else 0.0,
+            "espera_maxima": max(esperas, default=0.0),
+            "conclusao": max((v.chegada for v in viagens), default=0.0),
+        }
+
+
+class FrotaSimPy:
+    """
+    Frota de caminhões como recurso SimPy, para que a disputa por caminhões e a espera na
+    fila apareçam na `Simulacao`. Pedidos de maior prioridade são atendidos primeiro.
+    """
+
+    def __init__(self, simulacao, caminhoes, velocidade=60.0):
+        import simpy
+
+        self.simulacao = simulacao
+        self.env = simulacao.env
+        self.caminhoes = list(caminhoes)
+        self.velocidade = velocidade
+        self.recurso = simpy.PriorityResource(self.env, capacity=len(self.caminhoes))
+        self._livres = sorted(range(len(self.caminhoes)), key=lambda i: self.caminhoes[i].capacidade_caminhao)
+        self.atendidos = 0
+        self.espera_total = 0.0
+        self.espera_maxima = 0.0
+
+    def atender(self, pedido):
+        """Processo SimPy que transporta um pedido, em quantas viagens forem necessárias."""
+        env = self.env
+        pedido.restante = pedido.quantidade
+        while pedido.restante > 0:
+            chegada = env.now
+            with self.recurso.request(priority=-pedido.prioridade) as pedido_caminhao:
+                yield pedido_caminhao
+                espera = env.now - chegada
+                self.espera_total += espera
+                self.espera_maxima = max(self.espera_maxima, espera)
+
+                indice = self._livres.pop()  # Maior caminhão livre
+                caminhao = self.caminhoes[indice]
+                carga = min(pedido.restante, caminhao.capacidade_caminhao)
+                pedido.restante -= carga
+                distancia = pedido.distancia if pedido.distancia is not None else caminhao.distancia
+                ida = distancia / self.velocidade
+
+                yield env.timeout(ida)
+                self.simulacao.historico.registrar(env.now, (pedido.origem, pedido.destino),
+                                                   carga * caminhao.eficiencia_transporte, EVENTO_ENTREGA)
+                metricas.incrementar("simulacao.eventos.entrega")
+                yield env.timeout(ida)
+                self._livres.append(indice)
+                self._livres.sort(key=lambda i: self.caminhoes[i].capacidade_caminhao)
+        self.atendidos += 1
+
+    def processar_pedidos(self, pedidos):
+        """Processo SimPy que libera cada pedido no seu instante de liberação."""
+        for pedido in sorted(pedidos, key=lambda p: p.liberacao):
+            if pedido.liberacao > self.env.now:
+                yield self.env.timeout(pedido.liberacao - self.env.now)
+            self.env.process(self.atender(pedido))
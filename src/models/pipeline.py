@@ -1,12 +1,16 @@
-import sys
-import os
 import math
+import logging
+import numpy as np
 
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 from src.utils.logger import get_logger
+from src.utils.metricas import metricas
 
 logger = get_logger(__name__)
 
+# Parâmetros do construtor de `Pipeline`, na ordem da assinatura
+PARAMETROS_PIPELINE = ("diametro", "comprimento", "rugosidade", "viscosidade", "pressao_inicial",
+                       "pressao_final", "perda_carga", "capacidade_maxima")
+
 class Pipeline:
     """Classe que representa um duto de transporte de petróleo."""
 
@@ -35,8 +39,9 @@ class Pipeline:
         # Calcula a perda por km (percentual)
         self.perda_por_km = self.perda_carga / self.comprimento
 
-        logger.info(f"🛠️ Duto criado: Capacidade {capacidade_maxima} m³/h | Comprimento {comprimento / 1000} km | Perda {self.perda_por_km*100:.2f}%/km")
+        logger.info("🛠️ Duto criado: Capacidade %s m³/h | Comprimento %s km | Perda %.2f%%/km", capacidade_maxima, comprimento / 1000, self.perda_por_km * 100)
 
+    @metricas.medir("pipeline.calcular_fluxo")
     def calcular_fluxo(self, entrada_petroleo):
         """
         Calcula a vazão final considerando perdas no percurso.
@@ -44,24 +49,29 @@ class Pipeline:
         :param entrada_petroleo: Quantidade inicial de petróleo (m³)
         :return: Quantidade final após transporte (m³)
         """
-        logger.info(f"⛽ Iniciando transporte: {entrada_petroleo:.2f} m³")
+        info = logger.isEnabledFor(logging.INFO)
+        if info:
+            logger.info("⛽ Iniciando transporte: %.2f m³", entrada_petroleo)
 
         # Garantir que não ultrapasse a capacidade máxima do duto
         if entrada_petroleo > self.capacidade_maxima:
-            logger.warning(f"⚠️ Capacidade do duto excedida! Fluxo ajustado para {self.capacidade_maxima} m³/h.")
+            logger.warning("⚠️ Capacidade do duto excedida! Fluxo ajustado para %s m³/h.", self.capacidade_maxima)
             entrada_petroleo = self.capacidade_maxima
 
         # Cálculo da perda total ao longo do percurso
         perda_total = entrada_petroleo * self.perda_por_km * (self.comprimento / 1000)  # Ajustado para km
-        logger.debug(f"📉 Perda por km: {self.perda_por_km * 100:.2f}% | Comprimento do duto: {self.comprimento / 1000} km")
-        logger.debug(f"📉 Perda total calculada: {perda_total:.2f} m³")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("📉 Perda por km: %.2f%% | Comprimento do duto: %s km", self.perda_por_km * 100, self.comprimento / 1000)
+            logger.debug("📉 Perda total calculada: %.2f m³", perda_total)
 
         # Garante que o fluxo final nunca seja negativo
         fluxo_final = max(entrada_petroleo - perda_total, 0)
 
-        logger.info(f"📉 Perda total: {perda_total:.2f} m³ | Fluxo final: {fluxo_final:.2f} m³")
+        if info:
+            logger.info("📉 Perda total: %.2f m³ | Fluxo final: %.2f m³", perda_total, fluxo_final)
         return fluxo_final
 
+    @metricas.medir("pipeline.calcular_vazao")
     def calcular_vazao_darcy_weisbach(self, densidade_petroleo):
         """
         Calcula a vazão volumétrica do duto utilizando a equação de Darcy-Weisbach.
@@ -82,8 +92,81 @@ class Pipeline:
         # Limita a vazão à capacidade máxima do duto
         vazao_m3_h = min(vazao_m3_h, self.capacidade_maxima)
 
-        logger.info(f"🔬 Cálculo de vazão pelo modelo de Darcy-Weisbach: {vazao_m3_h:.2f} m³/h (Máx: {self.capacidade_maxima} m³/h)")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("🔬 Cálculo de vazão pelo modelo de Darcy-Weisbach: %.2f m³/h (Máx: %s m³/h)", vazao_m3_h, self.capacidade_maxima)
         return vazao_m3_h
 
+    @metricas.medir("pipeline.calcular_fluxo_lote")
+    def calcular_fluxo_lote(self, entradas_petroleo):
+        """
+        Versão vetorizada de `calcular_fluxo` para vários cenários de entrada.
+
+        Aplica o limite de capacidade, a perda e o piso zero em uma única
+        passada, sem registrar log por elemento.
+
+        :param entradas_petroleo: Array (ou sequência) de quantidades iniciais de petróleo (m³)
+        :return: Array com as quantidades finais após transporte (m³)
+        """
+        entradas = np.minimum(np.asarray(entradas_petroleo, dtype=float), self.capacidade_maxima)
+        perda_total = entradas * self.perda_por_km * (self.comprimento / 1000)
+        return np.maximum(entradas - perda_total, 0)
+
+    @metricas.medir("pipeline.calcular_vazao_lote")
+    def calcular_vazao_darcy_weisbach_lote(self, densidades_petroleo):
+        """
+        Versão vetorizada de `calcular_vazao_darcy_weisbach` para várias densidades.
+
+        :param densidades_petroleo: Array (ou sequência) de densidades do petróleo (kg/m³)
+        :return: Array de vazões volumétricas (m³/h), com o mesmo formato da entrada
+        """
+        densidades = np.asarray(densidades_petroleo, dtype=float)
+        area = math.pi * (self.diametro / 2) ** 2
+        pressao_diferencial = self.pressao_inicial - self.pressao_final
+        vazao_m3_h = (pressao_diferencial / (self.viscosidade * self.perda_carga)) * area * 3600
+        return np.full(densidades.shape, min(vazao_m3_h, self.capacidade_maxima))
+
     def __str__(self):
         return f"Duto - Capacidade: {self.capacidade_maxima} m³/h | Comprimento: {self.comprimento / 1000} km | Perda/km: {self.perda_por_km*100:.2f}%"
+
+
+def parametros_dutos(dutos):
+    """
+    Agrupa os parâmetros de uma frota de dutos em arrays NumPy.
+
+    :param dutos: Sequência de objetos `Pipeline` ou de dicionários com os mesmos parâmetros do construtor
+    :return: Dicionário {parâmetro: array} com um elemento por duto
+    """
+    return {
+        nome: np.array([d[nome] if isinstance(d, dict) else getattr(d, nome) for d in dutos], dtype=float)
+        for nome in PARAMETROS_PIPELINE
+    }
+
+
+def calcular_fluxo_dutos(dutos, entradas_petroleo):
+    """
+    Calcula a vazão final de uma frota de dutos em uma única passada vetorizada.
+
+    :param dutos: Sequência de `Pipeline`/dicionários ou o resultado de `parametros_dutos`
+    :param entradas_petroleo: Array de entradas (m³); broadcast contra o eixo dos dutos,
+                              ex. formato (n_dutos,) ou (n_cenarios, n_dutos)
+    :return: Array com as quantidades finais após transporte (m³)
+    """
+    p = dutos if isinstance(dutos, dict) else parametros_dutos(dutos)
+    entradas = np.minimum(np.asarray(entradas_petroleo, dtype=float), p["capacidade_maxima"])
+    perda_por_km = p["perda_carga"] / p["comprimento"]
+    perda_total = entradas * perda_por_km * (p["comprimento"] / 1000)
+    return np.maximum(entradas - perda_total, 0)
+
+
+def calcular_vazao_dutos(dutos):
+    """
+    Calcula a vazão de Darcy-Weisbach de uma frota de dutos em uma única passada vetorizada.
+
+    :param dutos: Sequência de `Pipeline`/dicionários ou o resultado de `parametros_dutos`
+    :return: Array de vazões volumétricas (m³/h), uma por duto
+    """
+    p = dutos if isinstance(dutos, dict) else parametros_dutos(dutos)
+    area = math.pi * (p["diametro"] / 2) ** 2
+    pressao_diferencial = p["pressao_inicial"] - p["pressao_final"]
+    vazao = (pressao_diferencial / (p["viscosidade"] * p["perda_carga"])) * area
+    return np.minimum(vazao * 3600, p["capacidade_maxima"])
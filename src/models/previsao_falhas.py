@@ -1,19 +1,121 @@
-import pandas as pd
+import os
+import pickle
+import weakref
+import zlib
 import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import accuracy_score
+from src.historico_eventos import EVENTO_FALHA
 from src.simulacao import Simulacao
 
+
+class PreditorFalhasOnline:
+    """
+    Classificador de falhas atualizado incrementalmente, em lotes, sem re-treino completo.
+
+    Usa regressão logística por gradiente estocástico (`SGDClassifier.partial_fit`) sobre
+    tempo, fluxo e a aresta codificada por hashing estável, o que permite salvar o modelo
+    e continuar o treino em execuções futuras.
+    """
+
+    def __init__(self, n_hash_arestas=32, semente=42):
+        """
+        :param n_hash_arestas: Número de colunas usadas para codificar as arestas
+        :param semente: Semente do `SGDClassifier`
+        """
+        from sklearn.linear_model import SGDClassifier
+        from sklearn.preprocessing import StandardScaler
+
+        self.n_hash_arestas = n_hash_arestas
+        self.escalonador = StandardScaler()
+        self.modelo = SGDClassifier(loss="log_loss", random_state=semente)
+        self.n_amostras = 0
+        self._consumidos = weakref.WeakKeyDictionary()  # Histórico -> eventos já usados no treino
+
+    def __getstate__(self):
+        estado = self.__dict__.copy()
+        del estado["_consumidos"]  # Os históricos pertencem à execução atual
+        return estado
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self._consumidos = weakref.WeakKeyDictionary()
+
+    def codificar_arestas(self, arestas):
+        """Converte chaves (origem, destino) em colunas de hashing estáveis entre execuções."""
+        return np.array([zlib.crc32(repr(a).encode()) % self.n_hash_arestas for a in arestas], dtype=np.int64)
+
+    def _atributos(self, tempos, fluxos, colunas_arestas):
+        tempos = np.asarray(tempos, dtype=float)
+        X = np.zeros((len(tempos), 2 + self.n_hash_arestas))
+        X[:, 0] = tempos
+        X[:, 1] = fluxos
+        X[np.arange(len(tempos)), 2 + np.asarray(colunas_arestas)] = 1.0
+        return X
+
+    def atualizar(self, tempos, fluxos, colunas_arestas, rotulos):
+        """
+        Atualiza o modelo com um lote de amostras.
+
+        :param tempos: Array de tempos (h)
+        :param fluxos: Array de fluxos (barris/hora)
+        :param colunas_arestas: Colunas de hashing das arestas (ver `codificar_arestas`)
+        :param rotulos: Array 1/0 indicando falha
+        """
+        if len(tempos) == 0:
+            return self
+        X = self._atributos(tempos, fluxos, colunas_arestas)
+        self.escalonador.partial_fit(X)
+        self.modelo.partial_fit(self.escalonador.transform(X), np.asarray(rotulos), classes=[0, 1])
+        self.n_amostras += len(X)
+        return self
+
+    def prever_proba(self, tempos, fluxos, colunas_arestas):
+        """Probabilidade de falha para um lote de amostras, em uma única chamada vetorizada."""
+        X = self._atributos(tempos, fluxos, colunas_arestas)
+        return self.modelo.predict_proba(self.escalonador.transform(X))[:, 1]
+
+    def prever(self, tempos, fluxos, colunas_arestas):
+        """Classe prevista (1 = falha) para um lote de amostras."""
+        return (self.prever_proba(tempos, fluxos, colunas_arestas) >= 0.5).astype(np.int8)
+
+    def consumir(self, historico):
+        """
+        Treina com os eventos de um `HistoricoEventos` registrados desde a última chamada.
+
+        Com `EscritorResultados`, os eventos já descarregados são lidos de volta do arquivo.
+        """
+        inicio = self._consumidos.get(historico, 0)
+        fim = len(historico)
+        if fim > inicio:
+            eventos = historico.intervalo(inicio, fim)
+            colunas = self.codificar_arestas(historico.arestas)[eventos["aresta"]]
+            rotulos = (eventos["tipo"] == EVENTO_FALHA).astype(np.int8)
+            self.atualizar(eventos["tempo"], eventos["fluxo"], colunas, rotulos)
+        self._consumidos[historico] = fim
+        return self
+
+    def salvar(self, caminho):
+        """Persiste o modelo para continuar o treino em outra execução."""
+        with open(caminho, "wb") as f:
+            pickle.dump(self, f)
+
+    @classmethod
+    def carregar(cls, caminho):
+        with open(caminho, "rb") as f:
+            return pickle.load(f)
+
 class SimulacaoML(Simulacao):
     def treinar_modelo_falhas(self):
         """Treina um modelo de Machine Learning para prever falhas no transporte."""
-        dados = []
-        for tempo, fluxo in self.historico_fluxo:
-            falha = 1 if tempo in self.tempo_falhas else 0  # Define se houve falha naquele tempo
-            dados.append([tempo, fluxo, falha])
-        
-        df = pd.DataFrame(dados, columns=["tempo", "fluxo", "falha"])
+        import pandas as pd
+        from sklearn.ensemble import RandomForestClassifier
+        from sklearn.metrics import accuracy_score
+        from sklearn.model_selection import train_test_split
+
+        df = pd.DataFrame({
+            "tempo": self.historico.tempos,
+            "fluxo": self.historico.fluxos,
+            "falha": self.historico.rotular_falhas(),  # Define se houve falha naquele tempo
+        }, copy=False)
         
         X = df[["tempo", "fluxo"]]  # Features
         y = df["falha"]  # Target (1 = falha, 0 = normal)
@@ -24,7 +126,7 @@ class SimulacaoML(Simulacao):
         
         previsoes = modelo.predict(X_test)
         acuracia = accuracy_score(y_test, previsoes)
-        print(f"🔍 Precisão do Modelo de Previsão de Falhas: {acuracia:.2f}")
+        self._log("🔍 Precisão do Modelo de Previsão de Falhas: %.2f", acuracia)
 
         return modelo
     
@@ -32,6 +134,28 @@ class SimulacaoML(Simulacao):
         """Usa o modelo treinado para prever se haverá falha no transporte."""
         previsao = modelo.predict([[tempo, fluxo]])[0]
         if previsao == 1:
-            print(f"⚠️ ALERTA! Possível falha detectada no tempo {tempo:.1f}h!")
+            self._log("⚠️ ALERTA! Possível falha detectada no tempo %.1fh!", tempo)
         else:
-            print(f"✅ Transporte seguro no tempo {tempo:.1f}h.")
+            self._log("✅ Transporte seguro no tempo %.1fh.", tempo)
+
+    def treinar_modelo_online(self, caminho_modelo=None, preditor=None):
+        """
+        Atualiza um `PreditorFalhasOnline` com os eventos desta simulação, sem re-treino completo.
+
+        :param caminho_modelo: Arquivo do modelo; carregado se existir e salvo ao final
+        :param preditor: Preditor já em memória (tem prioridade sobre o arquivo)
+        :return: O preditor atualizado
+        """
+        if preditor is None:
+            if caminho_modelo and os.path.exists(caminho_modelo):
+                preditor = PreditorFalhasOnline.carregar(caminho_modelo)
+            else:
+                preditor = PreditorFalhasOnline()
+        preditor.consumir(self.historico)
+        if caminho_modelo:
+            preditor.salvar(caminho_modelo)
+        return preditor
+
+    def prever_falhas_lote(self, preditor, tempos, fluxos, arestas):
+        """Probabilidade de falha para um lote de amostras (tempo, fluxo, aresta), sem impressão por amostra."""
+        return preditor.prever_proba(tempos, fluxos, preditor.codificar_arestas(arestas))
@@ -0,0 +1,211 @@
+import math
+import networkx as nx
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import spsolve
+
+from src.models.pipeline import PARAMETROS_PIPELINE, Pipeline, parametros_dutos
+from src.utils.logger import get_logger
+from src.utils.metricas import metricas
+
+logger = get_logger(__name__)
+
+
+def coeficientes_perda(parametros, densidade=850.0):
+    """
+    Coeficiente K (Pa·s²/m⁶) de Δp = K·Q·|Q| para cada duto, com atrito turbulento rugoso.
+
+    :param parametros: Resultado de `parametros_dutos`
+    :param densidade: Densidade do petróleo (kg/m³)
+    :return: Array com um coeficiente por duto
+    """
+    p = parametros
+    area = math.pi * (p["diametro"] / 2) ** 2
+    fator_atrito = 0.25 / np.log10(p["rugosidade"] / (3.7 * p["diametro"])) ** 2
+    return fator_atrito * p["comprimento"] / p["diametro"] * densidade / (2 * area ** 2)
+
+
+class ResultadoRede:
+    """Pressões nas junções e vazões nos segmentos de uma solução da rede."""
+
+    def __init__(self, nos, arestas, pressoes, vazoes, capacidades, iteracoes, residuo, convergiu):
+        self.nos = nos
+        self.arestas = arestas
+        self.pressoes = pressoes        # Pa, uma por nó
+        self.vazoes = vazoes            # m³/h, uma por segmento (negativa = fluxo reverso)
+        self.capacidades = capacidades  # m³/h, uma por segmento
+        self.iteracoes = iteracoes
+        self.residuo = residuo          # Maior desbalanço de massa nas junções (m³/h)
+        self.convergiu = convergiu
+        self._indice_nos = {no: i for i, no in enumerate(nos)}
+        self._indice_arestas = {aresta: i for i, aresta in enumerate(arestas)}
+
+    def pressao(self, no):
+        """Retorna a pressão (Pa) em um nó."""
+        return float(self.pressoes[self._indice_nos[no]])
+
+    def vazao(self, origem, destino):
+        """Retorna a vazão (m³/h) no segmento origem -> destino."""
+        return float(self.vazoes[self._indice_arestas[(origem, destino)]])
+
+    def segmentos_sobrecarregados(self):
+        """Lista os segmentos cuja vazão excede a capacidade máxima do duto."""
+        excedidos = np.flatnonzero(np.abs(self.vazoes) > self.capacidades)
+        return [self.arestas[i] for i in excedidos]
+
+
+class RedeDutos:
+    """
+    Resolve pressões nas junções e vazões em uma rede de segmentos `Pipeline` acoplados.
+
+    Cada aresta do grafo (`networkx.DiGraph`) carrega um `Pipeline` no atributo `duto`.
+    A perda de carga em cada segmento segue Darcy-Weisbach (Δp = K·Q·|Q|) e o balanço de
+    massa nas junções é resolvido por Newton com Jacobiano esparso. A solução anterior é
+    usada como ponto de partida, de modo que re-resolver após alterar um segmento exige
+    poucas iterações.
+
+    Nós com atributo `pressao` (Pa) têm pressão fixa. Nós sem entrada recebem a maior
+    `pressao_inicial` de seus dutos e nós sem saída a menor `pressao_final`, exceto quando
+    possuem o atributo `demanda` (m³/h retirados; negativo = injeção), que os torna livres.
+    """
+
+    def __init__(self, grafo, densidade=850.0, atributo_duto="duto", tolerancia=1e-6, max_iteracoes=50):
+        """
+        :param grafo: `networkx.DiGraph` cujas arestas carregam um `Pipeline`
+        :param densidade: Densidade do petróleo (kg/m³)
+        :param atributo_duto: Nome do atributo de aresta que contém o `Pipeline`
+        :param tolerancia: Desbalanço de massa máximo aceito em cada junção (m³/h)
+        :param max_iteracoes: Limite de iterações de Newton por resolução
+        """
+        self.densidade = densidade
+        self.atributo_duto = atributo_duto
+        self.tolerancia = tolerancia
+        self.max_iteracoes = max_iteracoes
+
+        self.nos = list(grafo.nodes)
+        self.arestas = list(grafo.edges)
+        self._indice_nos = {no: i for i, no in enumerate(self.nos)}
+        self._indice_arestas = {aresta: i for i, aresta in enumerate(self.arestas)}
+        self._dutos = [grafo.edges[aresta][atributo_duto] for aresta in self.arestas]
+
+        n_nos, n_arestas = len(self.nos), len(self.arestas)
+        self._origens = np.array([self._indice_nos[u] for u, _ in self.arestas], dtype=np.int64)
+        self._destinos = np.array([self._indice_nos[v] for _, v in self.arestas], dtype=np.int64)
+
+        # Matriz de incidência (arestas x nós): +1 na origem, -1 no destino, logo Δp = A·p
+        linhas = np.repeat(np.arange(n_arestas), 2)
+        colunas = np.column_stack([self._origens, self._destinos]).ravel()
+        valores = np.tile([1.0, -1.0], n_arestas)
+        self._incidencia = sp.csr_matrix((valores, (linhas, colunas)), shape=(n_arestas, n_nos))
+
+        self._pressao_fixa = np.full(n_nos, np.nan)
+        self._demanda = np.zeros(n_nos)  # m³/s
+        for i, no in enumerate(self.nos):
+            atributos = grafo.nodes[no]
+            if "pressao" in atributos:
+                self._pressao_fixa[i] = atributos["pressao"]
+            elif "demanda" in atributos:
+                self._demanda[i] = atributos["demanda"] / 3600
+            elif grafo.in_degree(no) == 0 and grafo.out_degree(no) > 0:
+                self._pressao_fixa[i] = max(grafo.edges[a][atributo_duto].pressao_inicial for a in grafo.out_edges(no))
+            elif grafo.out_degree(no) == 0 and grafo.in_degree(no) > 0:
+                self._pressao_fixa[i] = min(grafo.edges[a][atributo_duto].pressao_final for a in grafo.in_edges(no))
+
+        self._fixos = ~np.isnan(self._pressao_fixa)
+        if not self._fixos.any():
+            raise ValueError("A rede precisa de ao menos um nó com pressão fixa.")
+        # Sem pressão fixa, o Jacobiano de um componente é singular e o spsolve devolve NaN
+        soltos = [sorted(componente, key=self._indice_nos.__getitem__) for componente in nx.weakly_connected_components(grafo)
+                  if not any(self._fixos[self._indice_nos[no]] for no in componente)]
+        if soltos:
+            descricao = "; ".join(", ".join(map(str, c[:5])) + (", ..." if len(c) > 5 else "") for c in soltos)
+            raise ValueError(f"Componentes da rede sem nó com pressão fixa: {descricao}")
+        self._livres = np.flatnonzero(~self._fixos)
+        self._incidencia_livres = self._incidencia[:, self._livres].tocsc()
+
+        self._resistencias = self._calcular_resistencias(parametros_dutos(self._dutos))
+        self._capacidades = np.array([d.capacidade_maxima for d in self._dutos], dtype=float)
+        self._pressoes = None  # Última solução, usada como ponto de partida
+
+        logger.info("🕸️ Rede de dutos criada: %d nós | %d segmentos | %d junções livres", n_nos, n_arestas, len(self._livres))
+
+    def _calcular_resistencias(self, p):
+        return coeficientes_perda(p, self.densidade)
+
+    def _vazoes(self, pressoes, delta_min=1.0):
+        """Vazões (m³/s) e derivadas dQ/dΔp, linearizando a lei quadrática perto de Δp = 0."""
+        delta = self._incidencia @ pressoes
+        modulo = np.maximum(np.abs(delta), delta_min)
+        raiz = np.sqrt(modulo / self._resistencias)
+        vazoes = np.where(np.abs(delta) >= delta_min, np.sign(delta) * raiz, delta / (self._resistencias * raiz))
+        derivadas = np.where(np.abs(delta) >= delta_min, raiz / (2 * modulo), 1 / (self._resistencias * raiz))
+        return vazoes, derivadas
+
+    def _residuo(self, vazoes):
+        """Desbalanço de massa (m³/s) nas junções livres: saída - entrada + demanda."""
+        return self._incidencia_livres.T @ vazoes + self._demanda[self._livres]
+
+    def atualizar_segmento(self, origem, destino, duto=None, **parametros):
+        """
+        Altera um único segmento, preservando a solução anterior como ponto de partida.
+
+        :param origem: Nó de origem do segmento
+        :param destino: Nó de destino do segmento
+        :param duto: Novo `Pipeline` para o segmento (opcional)
+        :param parametros: Parâmetros do construtor a alterar (ex.: diametro, rugosidade). O segmento
+                           passa a ser um novo `Pipeline`; o do grafo de entrada não é modificado
+        """
+        i = self._indice_arestas[(origem, destino)]
+        if duto is not None:
+            self._dutos[i] = duto
+        if parametros:
+            atuais = {nome: getattr(self._dutos[i], nome) for nome in PARAMETROS_PIPELINE}
+            self._dutos[i] = Pipeline(**{**atuais, **parametros})  # Recalcula os campos derivados
+        self._resistencias[i] = self._calcular_resistencias(parametros_dutos([self._dutos[i]]))[0]
+        self._capacidades[i] = self._dutos[i].capacidade_maxima
+
+    @metricas.medir("rede_dutos.resolver")
+    def resolver(self, partida_fria=False):
+        """
+        Resolve a rede por Newton amortecido.
+
+        :param partida_fria: Ignora a solução anterior e parte da pressão média dos nós fixos
+        :return: `ResultadoRede`
+        """
+        if self._pressoes is None or partida_fria:
+            pressoes = np.where(self._fixos, self._pressao_fixa, np.nanmean(self._pressao_fixa))
+        else:
+            pressoes = self._pressoes.copy()
+
+        tolerancia = self.tolerancia / 3600
+        vazoes, derivadas = self._vazoes(pressoes)
+        residuo = self._residuo(vazoes)
+        norma = np.abs(residuo).max(initial=0.0)
+        iteracoes = 0
+
+        while norma > tolerancia and iteracoes < self.max_iteracoes:
+            iteracoes += 1
+            jacobiano = self._incidencia_livres.T @ sp.diags(derivadas) @ self._incidencia_livres
+            passo = spsolve(jacobiano.tocsc(), -residuo)
+
+            # Busca linear: reduz o passo até o desbalanço diminuir
+            alfa = 1.0
+            while True:
+                candidata = pressoes.copy()
+                candidata[self._livres] += alfa * passo
+                vazoes_c, derivadas_c = self._vazoes(candidata)
+                residuo_c = self._residuo(vazoes_c)
+                norma_c = np.abs(residuo_c).max(initial=0.0)
+                if norma_c < norma or alfa < 1e-4:
+                    break
+                alfa /= 2
+
+            pressoes, vazoes, derivadas, residuo, norma = candidata, vazoes_c, derivadas_c, residuo_c, norma_c
+
+        convergiu = norma <= tolerancia
+        if not convergiu:
+            logger.warning("⚠️ Rede não convergiu em %d iterações (resíduo %.3g m³/h)", iteracoes, norma * 3600)
+        self._pressoes = pressoes
+
+        return ResultadoRede(self.nos, self.arestas, pressoes.copy(), vazoes * 3600, self._capacidades.copy(),
+                             iteracoes, norma * 3600, convergiu)
@@ -1,23 +1,34 @@
-import sys
-import os
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 from src.utils.logger import get_logger
+from src.utils.metricas import metricas
 logger = get_logger(__name__)
 
+# Frações do petróleo convertidas em cada derivado
+RENDIMENTOS_PADRAO = {
+    "gasolina": 0.4,    # 40% do petróleo vira gasolina
+    "diesel": 0.35,     # 35% vira diesel
+    "querosene": 0.15,  # 15% vira querosene
+    "residuos": 0.1,    # 10% vira resíduos
+}
+
 class Refinery:
     """Classe que representa uma refinaria de petróleo."""
 
-    def __init__(self, capacidade_processamento, eficiencia):
+    def __init__(self, capacidade_processamento, eficiencia, rendimentos=None, capacidade_tanque=0.0):
         """
         Inicializa a refinaria.
 
         :param capacidade_processamento: Capacidade de processamento de petróleo (m³/h)
         :param eficiencia: Eficiência da refinaria para transformar petróleo em produtos refinados
+        :param rendimentos: Tabela {produto: fração} específica do petróleo processado (padrão: RENDIMENTOS_PADRAO)
+        :param capacidade_tanque: Volume de tancagem para o petróleo que excede a capacidade (m³)
         """
         self.capacidade_processamento = capacidade_processamento
         self.eficiencia = eficiencia
-        logger.info(f"🏭 Refinaria criada: Capacidade {capacidade_processamento} m³/h | Eficiência {eficiencia * 100:.1f}%")
+        self.rendimentos = dict(rendimentos) if rendimentos is not None else dict(RENDIMENTOS_PADRAO)
+        self.capacidade_tanque = capacidade_tanque
+        logger.info("🏭 Refinaria criada: Capacidade %s m³/h | Eficiência %.1f%%", capacidade_processamento, eficiencia * 100)
 
+    @metricas.medir("refinaria.processar_petroleo")
     def processar_petroleo(self, quantidade_petroleo):
         """
         Processa o petróleo para produzir derivados.
@@ -25,17 +36,15 @@ class Refinery:
         :param quantidade_petroleo: Quantidade de petróleo a ser processada (m³)
         :return: Produtos refinados
         """
-        logger.info(f"🔄 Processando {quantidade_petroleo:.2f} m³ de petróleo")
+        logger.info("🔄 Processando %.2f m³ de petróleo", quantidade_petroleo)
         
         # Cálculo de produtos refinados com base na eficiência
         produtos = {
-            "gasolina": 0.4 * quantidade_petroleo * self.eficiencia,   # 40% do petróleo vira gasolina
-            "diesel": 0.35 * quantidade_petroleo * self.eficiencia,      # 35% vira diesel
-            "querosene": 0.15 * quantidade_petroleo * self.eficiencia,    # 15% vira querosene
-            "residuos": 0.1 * quantidade_petroleo * self.eficiencia       # 10% vira resíduos
+            produto: fracao * quantidade_petroleo * self.eficiencia
+            for produto, fracao in self.rendimentos.items()
         }
 
-        logger.info(f"🛢️ Produtos refinados: {produtos}")
+        logger.info("🛢️ Produtos refinados: %s", produtos)
         return produtos
 
     def __str__(self):
@@ -0,0 +1,113 @@
+import numpy as np
+
+from src.utils.metricas import metricas
+
+
+class ResultadoRendimento:
+    """Séries horárias produzidas por `MotorRendimento.processar`."""
+
+    def __init__(self, produtos, nomes_produtos, processado, estoque, vertido):
+        self.produtos = produtos              # (refinarias, produtos, horas), m³
+        self.nomes_produtos = nomes_produtos
+        self.processado = processado          # (refinarias, horas), petróleo processado (m³)
+        self.estoque = estoque                # (refinarias, horas), petróleo em tanque ao fim de cada hora (m³)
+        self.vertido = vertido                # (refinarias, horas), excedente sem espaço em tanque (m³)
+
+    def produto(self, nome):
+        """Série (refinarias, horas) de um derivado."""
+        return self.produtos[:, self.nomes_produtos.index(nome), :]
+
+
+class MotorRendimento:
+    """
+    Processa uma matriz (refinaria x hora) de petróleo recebido em uma única chamada vetorizada.
+
+    Cada refinaria processa no máximo `capacidade_processamento` por hora; o excedente vai
+    para o tanque e é processado nas horas seguintes, e o que não cabe no tanque é vertido.
+    O estoque final é mantido entre chamadas.
+    """
+
+    def __init__(self, capacidades, eficiencias, rendimentos, capacidades_tanque=0.0, nomes_produtos=None, estoque_inicial=0.0):
+        """
+        :param capacidades: Capacidade de processamento por refinaria (m³/h)
+        :param eficiencias: Eficiência por refinaria
+        :param rendimentos: Matriz (refinarias, produtos) de frações
+        :param capacidades_tanque: Tancagem por refinaria (m³)
+        :param nomes_produtos: Nome de cada coluna de `rendimentos`
+        :param estoque_inicial: Petróleo em tanque no início (m³)
+        """
+        self.capacidades = np.asarray(capacidades, dtype=float)
+        n = len(self.capacidades)
+        self.eficiencias = np.broadcast_to(np.asarray(eficiencias, dtype=float), (n,)).copy()
+        self.rendimentos = np.asarray(rendimentos, dtype=float).reshape(n, -1)
+        self.capacidades_tanque = np.broadcast_to(np.asarray(capacidades_tanque, dtype=float), (n,)).copy()
+        self.nomes_produtos = list(nomes_produtos) if nomes_produtos is not None else [f"produto_{i}" for i in range(self.rendimentos.shape[1])]
+        self.estoque = np.broadcast_to(np.asarray(estoque_inicial, dtype=float), (n,)).copy()
+        # Fator (refinaria, produto) já multiplicado pela eficiência
+        self._fatores = self.rendimentos * self.eficiencias[:, None]
+
+    @classmethod
+    def de_refinarias(cls, refinarias):
+        """Cria o motor a partir de objetos `Refinery`, unindo as tabelas de rendimento."""
+        nomes = []
+        for refinaria in refinarias:
+            nomes += [p for p in refinaria.rendimentos if p not in nomes]
+        rendimentos = [[r.rendimentos.get(p, 0.0) for p in nomes] for r in refinarias]
+        return cls(
+            [r.capacidade_processamento for r in refinarias],
+            [r.eficiencia for r in refinarias],
+            rendimentos,
+            [r.capacidade_tanque for r in refinarias],
+            nomes,
+        )
+
+    @staticmethod
+    def _estoque_limitado(deslocamento, limites, estoque_inicial):
+        """
+        Estoque por hora com s_t = clip(s_{t-1} + deslocamento_t, 0, limite).
+
+        Funções x -> clip(x + d, piso, teto) são fechadas sob composição, então o estoque de
+        todas as horas sai de uma varredura prefixada em log2(horas) passos vetorizados.
+        """
+        deslocamento = deslocamento.copy()
+        piso = np.zeros_like(deslocamento)
+        teto = np.broadcast_to(limites, deslocamento.shape).copy()
+        passo = 1
+        while passo < deslocamento.shape[1]:
+            d2, p2, t2 = deslocamento[:, passo:], piso[:, passo:], teto[:, passo:]
+            novo_piso = np.clip(piso[:, :-passo] + d2, p2, t2)
+            novo_teto = np.clip(teto[:, :-passo] + d2, p2, t2)
+            novo_deslocamento = deslocamento[:, :-passo] + d2
+            piso[:, passo:], teto[:, passo:], deslocamento[:, passo:] = novo_piso, novo_teto, novo_deslocamento
+            passo *= 2
+        return np.clip(estoque_inicial[:, None] + deslocamento, piso, teto)
+
+    @metricas.medir("refinaria.motor_rendimento")
+    def processar(self, entrada):
+        """
+        Processa o petróleo recebido por hora.
+
+        :param entrada: Array (refinarias, horas) de petróleo recebido (m³)
+        :return: `ResultadoRendimento`
+        """
+        entrada = np.asarray(entrada, dtype=float)
+        capacidades = self.capacidades[:, None]
+        limites = self.capacidades_tanque[:, None]
+
+        # Sem limite de tanque o estoque é uma fila com reflexão em zero (recursão de Lindley):
+        # s_t = S_t - min(0, min_k S_k), com S a soma acumulada de entrada - capacidade
+        acumulado = self.estoque[:, None] + np.cumsum(entrada - capacidades, axis=1)
+        estoque = acumulado - np.minimum(np.minimum.accumulate(acumulado, axis=1), 0)
+
+        transbordam = np.flatnonzero((estoque > limites).any(axis=1))
+        if len(transbordam):
+            estoque[transbordam] = self._estoque_limitado(
+                entrada[transbordam] - capacidades[transbordam], limites[transbordam], self.estoque[transbordam])
+
+        anterior = np.concatenate([self.estoque[:, None], estoque[:, :-1]], axis=1)
+        vertido = np.maximum(anterior + entrada - self.capacidades[:, None] - limites, 0)
+        processado = anterior + entrada - estoque - vertido
+        self.estoque = estoque[:, -1].copy() if entrada.shape[1] else self.estoque
+
+        produtos = processado[:, None, :] * self._fatores[:, :, None]
+        return ResultadoRendimento(produtos, self.nomes_produtos, processado, estoque, vertido)
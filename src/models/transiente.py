@@ -0,0 +1,286 @@
+import logging
+import math
+import numpy as np
+from scipy.linalg import lapack
+
+from src.models.pipeline import parametros_dutos
+from src.models.rede_dutos import coeficientes_perda
+from src.utils.logger import get_logger
+from src.utils.metricas import metricas
+
+logger = get_logger(__name__)
+
+
+class ResultadoTransiente:
+    """Séries por passo de tempo produzidas por `ModeloTransiente.avancar`."""
+
+    def __init__(self, tempos, vazao_entrada, vazao_saida, pressao_entrada, empacotamento, chegadas, entregue, nomes_produtos):
+        self.tempos = tempos                    # (passos,), h ao fim de cada passo
+        self.vazao_entrada = vazao_entrada      # (passos, dutos), m³/h
+        self.vazao_saida = vazao_saida          # (passos, dutos), m³/h
+        self.pressao_entrada = pressao_entrada  # (passos, dutos), Pa
+        self.empacotamento = empacotamento      # (passos, dutos), m³ de petróleo dentro do duto
+        self.chegadas = chegadas                # [(duto, tempo h, produto que termina, produto que chega)]
+        self.entregue = entregue                # (dutos, produtos), m³ entregues no período
+        self.nomes_produtos = nomes_produtos
+
+    def entregue_por_produto(self, duto=None):
+        """Volume entregue (m³) de cada produto, em um duto ou somado em todos."""
+        volumes = self.entregue.sum(axis=0) if duto is None else self.entregue[duto]
+        return {nome: float(v) for nome, v in zip(self.nomes_produtos, volumes)}
+
+
+class ModeloTransiente:
+    """
+    Escoamento transiente em uma frota de dutos discretizados em células de volume finito.
+
+    Cada célula armazena petróleo por compressibilidade (empacotamento, ou linepack):
+    C·dp/dt = Q_entra - Q_sai, com C = V/K. Entre células, a perda de carga de
+    Darcy-Weisbach usada em `RedeDutos` é linearizada pela secante na vazão de referência,
+    o que deixa constante a matriz do passo implícito (Euler regressivo): ela é fatorada uma
+    única vez, com todos os dutos em uma matriz esparsa bloco-diagonal, e cada passo é uma
+    substituição vetorizada sobre dutos e células.
+
+    Na entrada a vazão é imposta pela programação; na saída a pressão é `pressao_final`.
+    Lotes de petróleos diferentes são rastreados como interfaces lagrangianas que avançam
+    com a velocidade local do escoamento (sem zona de mistura).
+    """
+
+    def __init__(self, dutos, n_celulas=50, passo=1 / 60, modulo_compressibilidade=1.5e9, densidade=850.0,
+                 vazao_referencia=None, vazao_inicial=0.0, produtos=("petroleo",), produto_inicial=0):
+        """
+        :param dutos: Sequência de `Pipeline`/dicionários ou o resultado de `parametros_dutos`
+        :param n_celulas: Células por duto
+        :param passo: Passo de tempo (h)
+        :param modulo_compressibilidade: Módulo volumétrico efetivo do petróleo no duto (Pa)
+        :param densidade: Densidade do petróleo (kg/m³)
+        :param vazao_referencia: Vazão (m³/h) em que a perda de carga é linearizada (padrão: capacidade máxima)
+        :param vazao_inicial: Vazão (m³/h) do regime permanente inicial, por duto ou para todos
+        :param produtos: Nomes dos tipos de petróleo rastreados como lotes
+        :param produto_inicial: Índice do produto que enche os dutos no início, por duto ou para todos
+        """
+        p = dutos if isinstance(dutos, dict) else parametros_dutos(dutos)
+        self.n_dutos = len(p["comprimento"])
+        self.n_celulas = n_celulas
+        self.passo = passo
+        self.nomes_produtos = list(produtos)
+        self.tempo = 0.0
+
+        self.comprimentos = p["comprimento"]
+        self.areas = math.pi * (p["diametro"] / 2) ** 2
+        self.volumes = self.areas * self.comprimentos  # m³ geométricos
+        self.capacidades = p["capacidade_maxima"]
+        self.pressoes_saida = p["pressao_final"]
+        self.dx = self.comprimentos / n_celulas
+        self.posicoes = (np.arange(n_celulas) + 0.5) * self.dx[:, None]  # Centro das células (m)
+
+        referencia = self.capacidades if vazao_referencia is None else np.broadcast_to(vazao_referencia, (self.n_dutos,))
+        resistencia = coeficientes_perda(p, densidade) * referencia / 3600  # Pa·s/m³ do duto inteiro
+        self._condutancia = n_celulas / resistencia                         # Entre centros vizinhos (m³/s/Pa)
+        self._capacitancia = self.areas * self.dx / modulo_compressibilidade  # m³/Pa por célula
+
+        # Matriz (dutos·células)² do passo implícito: C/dt + condutâncias. Com os dutos em sequência
+        # e sem acoplamento entre eles, ela é uma única tridiagonal simétrica positiva definida,
+        # fatorada uma vez (LAPACK pttrf); cada passo é só a substituição (pttrs)
+        g = np.repeat(self._condutancia[:, None], n_celulas, axis=1)
+        self._fator = np.repeat((self._capacitancia / (passo * 3600))[:, None], n_celulas, axis=1)
+        esquerda, direita = g.copy(), g.copy()
+        esquerda[:, 0] = 0.0               # A entrada é vazão imposta
+        direita[:, -1] = 2 * g[:, -1]      # Meia célula até a pressão fixa da saída
+        fora = -g
+        fora[:, -1] = 0.0                  # Sem acoplamento entre dutos
+        self._diagonal, self._subdiagonal, info = lapack.dpttrf((self._fator + esquerda + direita).ravel(), fora.ravel()[:-1])
+        if info != 0:
+            raise ValueError(f"Matriz do passo implícito não é positiva definida (info={info})")
+
+        self.estado_estacionario(vazao_inicial)
+
+        # Interfaces de lotes: duto, posição a partir da entrada (m) e produto que vem atrás
+        self._int_duto = np.empty(0, dtype=np.int64)
+        self._int_posicao = np.empty(0)
+        self._int_produto = np.empty(0, dtype=np.int64)
+        self._produto_entrada = np.broadcast_to(np.asarray(produto_inicial, dtype=np.int64), (self.n_dutos,)).copy()
+        self._produto_saida = self._produto_entrada.copy()
+        self._indexar_interfaces()
+
+        logger.info("🌊 Modelo transiente criado: %d dutos | %d células | passo %.4f h", self.n_dutos, n_celulas, passo)
+
+    def estado_estacionario(self, vazao):
+        """Coloca os dutos no regime permanente com a vazão dada (m³/h), por duto ou para todos."""
+        self._vazao_entrada = np.broadcast_to(np.asarray(vazao, dtype=float) / 3600, (self.n_dutos,)).copy()
+        faces_ate_saida = self.n_celulas - np.arange(self.n_celulas) - 0.5
+        self.pressoes = self.pressoes_saida[:, None] + (self._vazao_entrada / self._condutancia)[:, None] * faces_ate_saida
+        return self
+
+    def empacotamento(self):
+        """Petróleo dentro de cada duto (m³), incluindo o volume empacotado pela pressão."""
+        return self.volumes + (self._capacitancia[:, None] * self.pressoes).sum(axis=1)
+
+    def vazao_saida(self):
+        """Vazão atual (m³/h) na saída de cada duto."""
+        return 2 * self._condutancia * (self.pressoes[:, -1] - self.pressoes_saida) * 3600
+
+    def pressao_entrada(self):
+        """Pressão atual (Pa) na entrada de cada duto."""
+        return self.pressoes[:, 0] + self._vazao_entrada / (2 * self._condutancia)
+
+    def lotes(self):
+        """
+        Lotes presentes em cada duto, da saída para a entrada.
+
+        :return: Lista de (duto, produto, início (m), fim (m), volume (m³)), posições a partir da entrada
+        """
+        lotes = []
+        ordem = np.lexsort((-self._int_posicao, self._int_duto))
+        for d in range(self.n_dutos):
+            selecionadas = ordem[self._int_duto[ordem] == d]
+            fim, produto = self.comprimentos[d], self._produto_saida[d]
+            for i in selecionadas:
+                inicio = self._int_posicao[i]
+                lotes.append((d, self.nomes_produtos[produto], float(inicio), float(fim), float(self.areas[d] * (fim - inicio))))
+                fim, produto = inicio, self._int_produto[i]
+            lotes.append((d, self.nomes_produtos[produto], 0.0, float(fim), float(self.areas[d] * fim)))
+        return lotes
+
+    def _programacao(self, valores, dtype):
+        """Série (passos,) comum a todos os dutos ou (passos, dutos) -> array (passos, dutos)."""
+        valores = np.asarray(valores)
+        if valores.dtype.kind in "UO":
+            unicos, inversos = np.unique(valores, return_inverse=True)
+            desconhecidos = [u for u in unicos if u not in self.nomes_produtos]
+            if desconhecidos:
+                raise ValueError(f"Produtos desconhecidos: {', '.join(map(str, desconhecidos))}")
+            valores = np.array([self.nomes_produtos.index(u) for u in unicos])[inversos].reshape(valores.shape)
+        valores = valores.astype(dtype, copy=False)
+        if valores.ndim == 1:
+            valores = valores[:, None]
+        return np.broadcast_to(valores, (len(valores), self.n_dutos))
+
+    def _inserir_interfaces(self, dutos, produtos):
+        self._int_duto = np.concatenate([self._int_duto, dutos])
+        self._int_posicao = np.concatenate([self._int_posicao, np.zeros(len(dutos))])
+        self._int_produto = np.concatenate([self._int_produto, produtos])
+        self._produto_entrada[dutos] = produtos
+        self._indexar_interfaces()
+
+    def _indexar_interfaces(self):
+        """Atributos do duto de cada interface, recalculados só quando interfaces entram ou saem."""
+        d = self._int_duto
+        self._int_inverso_dx = 1 / self.dx[d]
+        self._int_face = d * (self.n_celulas + 1)           # Índice da face de entrada em `faces.ravel()`
+        self._int_avanco = self.passo * 3600 / self.areas[d]  # m percorridos por m³/s de vazão
+        self._int_comprimento = self.comprimentos[d]
+
+    def _mover_interfaces(self, vazoes_faces, inicio_passo, chegadas):
+        """Avança as interfaces com a vazão interpolada entre as faces das células e retira as que chegaram."""
+        celulas = self._int_posicao * self._int_inverso_dx
+        k = np.minimum(celulas.astype(np.int64), self.n_celulas - 1)
+        fracao = celulas - k
+        k += self._int_face
+        vazao = vazoes_faces.take(k) * (1 - fracao) + vazoes_faces.take(k + 1) * fracao
+        nova = np.maximum(self._int_posicao + vazao * self._int_avanco, 0.0)
+
+        ficam = nova < self._int_comprimento
+        if ficam.all():
+            self._int_posicao = nova
+            return
+        d = self._int_duto
+        chegaram = np.flatnonzero(~ficam)
+        # Na ordem em que chegam: a interface mais à frente deixa o duto primeiro
+        for i in chegaram[np.lexsort((-self._int_posicao[chegaram], d[chegaram]))]:
+            percorrido = (self.comprimentos[d[i]] - self._int_posicao[i]) / (nova[i] - self._int_posicao[i])
+            tempo = inicio_passo + self.passo * min(max(percorrido, 0.0), 1.0)
+            chegadas.append((int(d[i]), float(tempo), self.nomes_produtos[self._produto_saida[d[i]]],
+                             self.nomes_produtos[self._int_produto[i]]))
+            self._produto_saida[d[i]] = self._int_produto[i]
+        self._int_duto, self._int_posicao, self._int_produto = d[ficam], nova[ficam], self._int_produto[ficam]
+        self._indexar_interfaces()
+
+    @metricas.medir("transiente.avancar")
+    def avancar(self, vazoes_entrada, produtos_entrada=None):
+        """
+        Avança a simulação um passo por linha da programação de entrada.
+
+        :param vazoes_entrada: Vazão na entrada (m³/h), (passos,) para todos os dutos ou (passos, dutos);
+                               limitada a [0, capacidade_maxima] como em `Pipeline.calcular_fluxo`
+        :param produtos_entrada: Produto injetado em cada passo (índice ou nome), mesmo formato; None mantém o atual
+        :return: `ResultadoTransiente`
+        """
+        vazoes = self._programacao(vazoes_entrada, float)
+        if (vazoes > self.capacidades).any():
+            logger.warning("⚠️ Capacidade do duto excedida! Vazão de entrada limitada à capacidade máxima.")
+        vazoes = np.clip(vazoes, 0.0, self.capacidades)
+        produtos = None if produtos_entrada is None else self._programacao(produtos_entrada, np.int64)
+        n_passos, n_celulas = len(vazoes), self.n_celulas
+
+        entrada = vazoes / 3600                                   # m³/s
+        g = self._condutancia
+        termo_saida = 2 * g * self.pressoes_saida                 # Contribuição fixa da pressão de saída
+        meia_resistencia = 1 / (2 * g)
+        empacotamento_inicial = self.empacotamento()
+
+        saida = np.empty((n_passos, self.n_dutos))
+        pressao_entrada = np.empty((n_passos, self.n_dutos))
+        produto_saida = np.empty((n_passos, self.n_dutos), dtype=np.int64)
+        faces = np.empty((self.n_dutos, n_celulas + 1))
+        chegadas = []
+        # Passos em que algum duto troca de produto na entrada, calculados de uma vez
+        trocas = np.zeros(n_passos, dtype=bool)
+        if produtos is not None and n_passos:
+            trocas[0] = (produtos[0] != self._produto_entrada).any()
+            trocas[1:] = (produtos[1:] != produtos[:-1]).any(axis=1)
+        trocas = trocas.tolist()
+        g_coluna = g[:, None]
+        pressoes, fator = self.pressoes, self._fator
+        diagonal, subdiagonal = self._diagonal, self._subdiagonal
+        for n in range(n_passos):
+            q = entrada[n]
+            lado_direito = fator * pressoes
+            lado_direito[:, 0] += q
+            lado_direito[:, -1] += termo_saida
+            pressoes = lapack.dpttrs(diagonal, subdiagonal, lado_direito.ravel(), overwrite_b=True)[0].reshape(self.n_dutos, n_celulas)
+
+            saida[n] = 2 * g * (pressoes[:, -1] - self.pressoes_saida)
+            pressao_entrada[n] = pressoes[:, 0] + q * meia_resistencia
+
+            if trocas[n]:
+                mudaram = np.flatnonzero(produtos[n] != self._produto_entrada)
+                self._inserir_interfaces(mudaram, produtos[n, mudaram])
+            if len(self._int_duto):
+                faces[:, 0] = q
+                np.subtract(pressoes[:, :-1], pressoes[:, 1:], out=faces[:, 1:-1])
+                faces[:, 1:-1] *= g_coluna
+                faces[:, -1] = saida[n]
+                self._mover_interfaces(faces, self.tempo + n * self.passo, chegadas)
+            produto_saida[n] = self._produto_saida
+
+        self.pressoes = pressoes
+        self._vazao_entrada = entrada[-1].copy() if n_passos else self._vazao_entrada
+        tempos = self.tempo + self.passo * np.arange(1, n_passos + 1)
+        self.tempo += self.passo * n_passos
+
+        # No Euler regressivo o balanço de massa fecha exatamente a cada passo
+        dt = self.passo * 3600
+        empacotamento = empacotamento_inicial + np.cumsum((entrada - saida) * dt, axis=0)
+        entregue = np.zeros((self.n_dutos, len(self.nomes_produtos)))
+        np.add.at(entregue, (np.broadcast_to(np.arange(self.n_dutos), produto_saida.shape), produto_saida), saida * dt)
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("🌊 Transiente: %d passos até %.2f h | %d chegadas de lote", n_passos, self.tempo, len(chegadas))
+        return ResultadoTransiente(tempos, entrada * 3600, saida * 3600, pressao_entrada, empacotamento,
+                                   chegadas, entregue, self.nomes_produtos)
+
+
+def simular_duto(duto, vazoes_entrada, passo=1 / 60, **parametros):
+    """
+    Atalho para um único duto partindo do regime permanente na primeira vazão da programação.
+
+    :param duto: `Pipeline`
+    :param vazoes_entrada: Vazão na entrada (m³/h) em cada passo
+    :param passo: Passo de tempo (h)
+    :param parametros: Demais argumentos de `ModeloTransiente`
+    :return: `ResultadoTransiente`
+    """
+    vazoes = np.asarray(vazoes_entrada, dtype=float)
+    parametros.setdefault("vazao_inicial", min(vazoes[0], duto.capacidade_maxima) if len(vazoes) else 0.0)
+    return ModeloTransiente([duto], passo=passo, **parametros).avancar(vazoes)
@@ -1,7 +1,5 @@
-import sys
-import os
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 from src.utils.logger import get_logger
+from src.utils.metricas import metricas
 logger = get_logger(__name__)
 
 class Transport:
@@ -18,8 +16,9 @@ class Transport:
         self.capacidade_caminhao = capacidade_caminhao
         self.distancia = distancia
         self.eficiencia_transporte = eficiencia_transporte
-        logger.info(f"🚚 Caminhão criado: Capacidade {capacidade_caminhao} m³ | Distância {distancia} km | Eficiência {eficiencia_transporte * 100:.1f}%")
+        logger.info("🚚 Caminhão criado: Capacidade %s m³ | Distância %s km | Eficiência %.1f%%", capacidade_caminhao, distancia, eficiencia_transporte * 100)
 
+    @metricas.medir("transporte.transportar_produto")
     def transportar_produto(self, produto, quantidade):
         """
         Transporta o produto refinado.
@@ -28,7 +27,7 @@ class Transport:
         :param quantidade: Quantidade do produto (m³)
         :return: Quantidade transportada
         """
-        logger.info(f"🚚 Transportando {quantidade:.2f} m³ de {produto}")
+        logger.info("🚚 Transportando %.2f m³ de %s", quantidade, produto)
         
         # A quantidade transportada não pode ser maior que a capacidade do caminhão
         quantidade_transportada = min(quantidade, self.capacidade_caminhao)
@@ -36,7 +35,7 @@ class Transport:
         # Ajuste pela eficiência do transporte
         quantidade_transportada *= self.eficiencia_transporte
         
-        logger.info(f"🔄 Quantidade transportada de {produto}: {quantidade_transportada:.2f} m³")
+        logger.info("🔄 Quantidade transportada de %s: %.2f m³", produto, quantidade_transportada)
         return quantidade_transportada
 
     def __str__(self):
@@ -0,0 +1,137 @@
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+import simpy
+
+from src.simulacao import Simulacao
+
+
+class ResultadoMonteCarlo:
+    """
+    Agregador incremental das réplicas de Monte Carlo.
+
+    Os fluxos são acumulados em um histograma de faixas fixas, de modo que os percentis
+    são obtidos sem manter as trajetórias em memória.
+    """
+
+    def __init__(self, fluxo_min=0.0, fluxo_max=150.0, n_faixas=1500):
+        self.limites = np.linspace(fluxo_min, fluxo_max, n_faixas + 1)
+        self.histograma = np.zeros(n_faixas, dtype=np.int64)
+        self.n_replicas = 0
+        self.n_amostras = 0
+        self.soma_fluxo = 0.0
+        self.falhas = {}
+        self.tempo_inativo = {}
+
+    def adicionar(self, resumo):
+        """Incorpora o resumo de uma réplica (ver `executar_replica`)."""
+        self.histograma += resumo["histograma"]
+        self.n_replicas += 1
+        self.n_amostras += resumo["n_amostras"]
+        self.soma_fluxo += resumo["soma_fluxo"]
+        for aresta, n in resumo["falhas"].items():
+            self.falhas[aresta] = self.falhas.get(aresta, 0) + n
+        for aresta, tempo in resumo["tempo_inativo"].items():
+            self.tempo_inativo[aresta] = self.tempo_inativo.get(aresta, 0.0) + tempo
+
+    def fluxo_medio(self):
+        return self.soma_fluxo / self.n_amostras if self.n_amostras else float("nan")
+
+    def percentis(self, q=(5, 50, 95)):
+        """Percentis do fluxo (barris/hora), interpolados dentro das faixas do histograma."""
+        acumulado = np.concatenate([[0], np.cumsum(self.histograma)])
+        if acumulado[-1] == 0:
+            return np.full(len(q), np.nan)
+        alvos = np.asarray(q, dtype=float) / 100 * acumulado[-1]
+        return np.interp(alvos, acumulado, self.limites)
+
+    def falhas_medias(self):
+        """Número médio de falhas por réplica em cada aresta."""
+        return {aresta: n / self.n_replicas for aresta, n in self.falhas.items()}
+
+    def tempo_inativo_medio(self):
+        """Tempo médio de indisponibilidade por réplica em cada aresta (h)."""
+        return {aresta: t / self.n_replicas for aresta, t in self.tempo_inativo.items()}
+
+
+def executar_replica(grafo, rotas, arestas_falha, duracao, limites, semente, parametros_falhas=None):
+    """
+    Executa uma réplica SimPy isolada, com RNG próprio e sem impressão de eventos.
+
+    :return: Resumo da réplica (histograma de fluxo, falhas e tempo inativo por aresta)
+    """
+    env = simpy.Environment()
+    simulacao = Simulacao(env, grafo.copy(), rng=random.Random(semente), verbose=False)
+    for origem, destino in rotas:
+        env.process(simulacao.transportar_petroleo(origem, destino))
+    for origem, destino in arestas_falha:
+        env.process(simulacao.introduzir_falhas(origem, destino))
+    if parametros_falhas is not None:
+        simulacao.modelar_falhas(**parametros_falhas)
+    env.run(until=duracao)
+
+    fluxos = simulacao.historico.fluxos
+    histograma, _ = np.histogram(np.clip(fluxos, limites[0], limites[-1]), bins=limites)
+    return {
+        "histograma": histograma,
+        "n_amostras": len(fluxos),
+        "soma_fluxo": float(fluxos.sum()),
+        "falhas": dict(simulacao.falhas_por_aresta),
+        "tempo_inativo": simulacao.tempo_inativo_por_aresta(),
+    }
+
+
+class MonteCarloSimulacao:
+    """Executa N réplicas independentes de `Simulacao` em um pool de processos."""
+
+    def __init__(self, grafo, rotas, arestas_falha, duracao=50, semente=0, n_processos=None, parametros_falhas=None):
+        """
+        :param grafo: Grafo da rede de transporte
+        :param rotas: Lista de pares (origem, destino) com processos de transporte
+        :param arestas_falha: Lista de arestas (origem, destino) sujeitas a falhas
+        :param duracao: Horizonte de cada réplica (h)
+        :param semente: Semente mestre; cada réplica recebe um fluxo de números independente
+        :param n_processos: Número de processos do pool (None = todos os núcleos; 1 = sem pool)
+        :param parametros_falhas: Argumentos de `Simulacao.modelar_falhas` (mtbf, mttr, arestas) para
+                                  falhas em toda a rede; funções devem ser serializáveis (pickle)
+        """
+        self.grafo = grafo
+        self.rotas = list(rotas)
+        self.arestas_falha = list(arestas_falha)
+        self.duracao = duracao
+        self.semente = semente
+        self.n_processos = n_processos
+        self.parametros_falhas = parametros_falhas
+
+    def sementes(self, n_replicas):
+        """Sementes independentes derivadas da semente mestre via `SeedSequence`."""
+        filhas = np.random.SeedSequence(self.semente).spawn(n_replicas)
+        return [int(f.generate_state(1, dtype=np.uint64)[0]) for f in filhas]
+
+    def executar(self, n_replicas, resultado=None):
+        """
+        Executa as réplicas e reduz os resumos à medida que chegam.
+
+        :param n_replicas: Número de réplicas
+        :param resultado: `ResultadoMonteCarlo` a acumular (um novo é criado se omitido)
+        :return: `ResultadoMonteCarlo`
+        """
+        resultado = resultado if resultado is not None else ResultadoMonteCarlo()
+        tarefa = partial(executar_replica, self.grafo, self.rotas, self.arestas_falha, self.duracao, resultado.limites,
+                         parametros_falhas=self.parametros_falhas)
+        sementes = self.sementes(n_replicas)
+
+        if self.n_processos == 1:
+            for semente in sementes:
+                resultado.adicionar(tarefa(semente))
+            return resultado
+
+        n_trabalhadores = self.n_processos or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=n_trabalhadores) as executor:
+            lote = max(1, n_replicas // (n_trabalhadores * 4))
+            for resumo in executor.map(tarefa, sementes, chunksize=lote):
+                resultado.adicionar(resumo)
+        return resultado
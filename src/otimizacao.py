@@ -1,55 +1,208 @@
 import heapq
 import math
+import random
+from array import array
+
+import numpy as np
+
+from src.cache_rotas import peso_criterio
+from src.utils.metricas import metricas
+
+CRITERIOS = {'custo': 1, 'distancia': 2, 'capacidade': 3}
+INALCANCAVEL = 1e300  # Distância finita usada no lugar de inf para manter a aritmética da heurística sem NaN
+
 
 class OtimizadorRotas:
     def __init__(self):
         self.nos = {}
         self.coordenadas = {}
-    
+        self._indices = None  # Preenchido por `preparar`
+        self._marcos = {}
+
+    @classmethod
+    def de_grafo(cls, grafo):
+        """
+        Otimizador com os nós e arestas de um `networkx.DiGraph` ou `GrafoCompacto`.
+
+        Usa os atributos de nó `x`/`y` como coordenadas e os de aresta `custo`, `distancia`
+        e `capacidade` (1, 1 e None quando ausentes; na busca, como em `peso_criterio`). Como em `adicionar_aresta`, cada aresta
+        vale nos dois sentidos. Os atributos são lidos por coluna (`edges(data=nome)`), o
+        que no `GrafoCompacto` evita criar uma vista por aresta.
+
+        O otimizador é uma cópia em listas Python por nó, não uma vista do grafo: com um
+        `GrafoCompacto` de milhões de arestas, a memória volta à ordem da de um `DiGraph`
+        (mais ainda com `preparar`), e alterações posteriores no grafo não são vistas. Para
+        rotas dirigidas na rede grande, use `GrafoCompacto.caminho_minimo`.
+        """
+        otimizador = cls()
+        for (no, x), (_, y) in zip(grafo.nodes(data="x"), grafo.nodes(data="y")):
+            otimizador.adicionar_no(no, x, y)
+        colunas = zip(grafo.edges(data="custo", default=1), grafo.edges(data="distancia", default=1),
+                      grafo.edges(data="capacidade", default=None))
+        for (origem, destino, custo), (_, _, distancia), (_, _, capacidade) in colunas:
+            otimizador.adicionar_aresta(origem, destino, custo, distancia, capacidade)
+        return otimizador
+
     def adicionar_no(self, nome, x=None, y=None):
         self.nos[nome] = []
+        self._indices = None
         if x is not None and y is not None:
             self.coordenadas[nome] = (x, y)
-    
+
     def adicionar_aresta(self, origem, destino, custo, distancia, capacidade):
         self.nos[origem].append((destino, custo, distancia, capacidade))
         self.nos[destino].append((origem, custo, distancia, capacidade))
-    
+        self._indices = None
+
     def heuristica(self, atual, fim, peso_distancia=1, peso_capacidade=0.5):
         if atual in self.coordenadas and fim in self.coordenadas:
             x1, y1 = self.coordenadas[atual]
             x2, y2 = self.coordenadas[fim]
             distancia = math.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
-            return peso_distancia * distancia 
+            return peso_distancia * distancia
         return 0
-    
+
+    def preparar(self, n_marcos=8, criterios=tuple(CRITERIOS), semente=0):
+        """
+        Pré-processa o grafo para consultas rápidas com A* + ALT (marcos e desigualdade triangular).
+
+        Monta uma adjacência compacta em arrays CSR indexados por inteiros e, para cada
+        critério, calcula as distâncias de/para `n_marcos` marcos escolhidos pelo método do
+        mais distante. Essas distâncias dão limites inferiores admissíveis para a heurística.
+
+        :param n_marcos: Número de marcos por critério
+        :param criterios: Critérios a pré-processar
+        :param semente: Semente da escolha do primeiro marco
+        """
+        from scipy.sparse import csr_matrix
+        from scipy.sparse.csgraph import dijkstra
+
+        nomes = list(self.nos)
+        indices = {nome: i for i, nome in enumerate(nomes)}
+        n = len(nomes)
+
+        graus = np.fromiter((len(self.nos[nome]) for nome in nomes), dtype=np.int64, count=n)
+        ponteiros = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(graus, out=ponteiros[1:])
+        vizinhos = np.fromiter((indices[a[0]] for nome in nomes for a in self.nos[nome]), dtype=np.int32, count=ponteiros[-1])
+        pesos = {
+            criterio: np.fromiter((peso_criterio(criterio, a[CRITERIOS[criterio]]) for nome in nomes for a in self.nos[nome]),
+                                  dtype=float, count=ponteiros[-1])
+            for criterio in criterios
+        }
+
+        self._nomes = nomes
+        self._ponteiros = array('q', ponteiros.tobytes())
+        self._vizinhos = array('i', vizinhos.tobytes())
+        self._pesos = {criterio: array('d', p.tobytes()) for criterio, p in pesos.items()}
+        self._marcos = {}
+
+        rng = random.Random(semente)
+        n_marcos = min(n_marcos, n)
+        for criterio, p in pesos.items():
+            grafo = csr_matrix((p, vizinhos, ponteiros), shape=(n, n))
+            transposto = grafo.T.tocsr()
+
+            # Marcos pelo método do mais distante: cada novo marco maximiza a distância mínima aos anteriores
+            marcos = []
+            mais_perto = np.full(n, np.inf)
+            candidato = rng.randrange(n) if n else 0
+            distancias_de, distancias_para = [], []
+            for _ in range(n_marcos):
+                de = dijkstra(grafo, indices=candidato)
+                para = dijkstra(transposto, indices=candidato)
+                marcos.append(candidato)
+                distancias_de.append(de)
+                distancias_para.append(para)
+                ida_volta = de + para
+                mais_perto = np.minimum(mais_perto, np.where(np.isfinite(ida_volta), ida_volta, -1.0))
+                mais_perto[marcos] = -1.0
+                candidato = int(np.argmax(mais_perto))
+
+            # Layout nó-major: os n_marcos valores de um nó ficam contíguos
+            de = np.where(np.isinf(distancias_de), INALCANCAVEL, distancias_de).T.ravel()
+            para = np.where(np.isinf(distancias_para), INALCANCAVEL, distancias_para).T.ravel()
+            self._marcos[criterio] = (len(marcos), array('d', de.tobytes()), array('d', para.tobytes()))
+
+        self._indices = indices
+
+    @metricas.medir("rotas.a_star")
     def a_star(self, inicio, fim, criterio='custo'):
+        if self._indices is not None and criterio in self._marcos:
+            return self._a_star_marcos(inicio, fim, criterio)
+
+        indice_peso = CRITERIOS[criterio]
+        inverter = criterio == 'capacidade'  # Capacidade maior é melhor: peso 1 / capacidade
         fila_prioridade = []
-        heapq.heappush(fila_prioridade, (0, inicio))
+        heapq.heappush(fila_prioridade, (0, 0, inicio))
         custo_total = {inicio: 0}
         caminho = {inicio: None}
-        
+
         while fila_prioridade:
-            _, atual = heapq.heappop(fila_prioridade)
+            _, custo_atual, atual = heapq.heappop(fila_prioridade)
+            if custo_atual > custo_total[atual]:
+                continue  # Entrada obsoleta: o nó já foi alcançado por um caminho melhor
             if atual == fim:
                 return self.reconstruir_caminho(caminho, fim)
-            
-            for vizinho, custo, distancia, capacidade in self.nos[atual]:
-                if criterio == 'custo':
-                    novo_custo = custo_total[atual] + custo
-                elif criterio == 'distancia':
-                    novo_custo = custo_total[atual] + distancia
-                elif criterio == 'capacidade':
-                    novo_custo = custo_total[atual] - capacidade 
-                
-                if vizinho not in custo_total or novo_custo < custo_total[vizinho]:
+
+            for aresta in self.nos[atual]:
+                vizinho = aresta[0]
+                peso = peso_criterio(criterio, aresta[indice_peso]) if inverter else aresta[indice_peso]
+                novo_custo = custo_atual + peso
+
+                if novo_custo < custo_total.get(vizinho, math.inf):
                     custo_total[vizinho] = novo_custo
                     prioridade = novo_custo + self.heuristica(vizinho, fim)
-                    heapq.heappush(fila_prioridade, (prioridade, vizinho))
+                    heapq.heappush(fila_prioridade, (prioridade, novo_custo, vizinho))
                     caminho[vizinho] = atual
-        
+
         return None
-    
+
+    def _a_star_marcos(self, inicio, fim, criterio):
+        """A* sobre a adjacência CSR com heurística ALT; nós tratados como índices inteiros."""
+        origem, alvo = self._indices[inicio], self._indices[fim]
+        ponteiros, vizinhos, pesos = self._ponteiros, self._vizinhos, self._pesos[criterio]
+        k, de, para = self._marcos[criterio]
+        de_alvo = de[alvo * k:(alvo + 1) * k]
+        para_alvo = para[alvo * k:(alvo + 1) * k]
+
+        heuristicas = {}
+
+        def heuristica(v):
+            # d(L,alvo) - d(L,v) e d(v,L) - d(alvo,L) são limites inferiores de d(v,alvo)
+            base = v * k
+            h = max(max(map(float.__sub__, de_alvo, de[base:base + k])),
+                    max(map(float.__sub__, para[base:base + k], para_alvo)))
+            heuristicas[v] = h
+            return h
+
+        custo_total = {origem: 0.0}
+        caminho = {origem: None}
+        fila_prioridade = [(heuristica(origem), 0.0, origem)]
+
+        while fila_prioridade:
+            _, custo_atual, atual = heapq.heappop(fila_prioridade)
+            if custo_atual > custo_total[atual]:
+                continue
+            if atual == alvo:
+                rota = self.reconstruir_caminho(caminho, alvo)
+                return [self._nomes[i] for i in rota]
+
+            for j in range(ponteiros[atual], ponteiros[atual + 1]):
+                vizinho = vizinhos[j]
+                novo_custo = custo_atual + pesos[j]
+                if novo_custo < custo_total.get(vizinho, math.inf):
+                    h = heuristicas.get(vizinho)
+                    if h is None:
+                        h = heuristica(vizinho)
+                    if h >= INALCANCAVEL / 2:
+                        continue  # O alvo não é alcançável a partir deste nó
+                    custo_total[vizinho] = novo_custo
+                    caminho[vizinho] = atual
+                    heapq.heappush(fila_prioridade, (novo_custo + h, novo_custo, vizinho))
+
+        return None
+
     def reconstruir_caminho(self, caminho, fim):
         rota = []
         atual = fim
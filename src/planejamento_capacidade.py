@@ -0,0 +1,169 @@
+from collections import deque
+
+from src.utils.metricas import metricas
+
+
+class PlanejadorCapacidade:
+    """
+    Fluxo máximo de custo mínimo sobre o grafo de transporte, com várias fontes e sumidouros.
+
+    Usa caminhos mínimos sucessivos no grafo residual. Fontes e sumidouros são ligados a
+    uma superfonte e a um supersumidouro. O grafo residual é mantido entre resoluções, de
+    modo que a queda de capacidade de uma aresta (ex.: falha) é tratada redirecionando só o
+    fluxo excedente, em vez de resolver tudo de novo.
+    """
+
+    def __init__(self, grafo, fontes, sumidouros, atributo_capacidade="capacidade", atributo_custo="custo"):
+        """
+        :param grafo: `networkx.DiGraph` com capacidade e custo nas arestas
+        :param fontes: Nós de origem (ex.: refinarias); lista ou dicionário {nó: oferta máxima}
+        :param sumidouros: Nós de destino (ex.: distribuidoras); lista ou dicionário {nó: demanda máxima}
+        :param atributo_capacidade: Atributo de aresta com a capacidade
+        :param atributo_custo: Atributo de aresta com o custo por unidade de fluxo
+        """
+        self.nos = list(grafo.nodes)
+        self._indices = {no: i for i, no in enumerate(self.nos)}
+        self._fonte = len(self.nos)
+        self._sumidouro = len(self.nos) + 1
+
+        self._destino = []      # Arco i e seu reverso i ^ 1 ficam lado a lado
+        self._residual = []
+        self._custo = []
+        self._capacidade = []   # Capacidade nominal dos arcos diretos
+        self._saidas = [[] for _ in range(len(self.nos) + 2)]
+        self._arco_aresta = {}
+
+        total = sum(dados.get(atributo_capacidade, 0) for _, _, dados in grafo.edges(data=True))
+        self._infinito = total + 1
+
+        for u, v, dados in grafo.edges(data=True):
+            self._arco_aresta[(u, v)] = self._adicionar_arco(
+                self._indices[u], self._indices[v], dados.get(atributo_capacidade, 0), dados.get(atributo_custo, 0))
+        ofertas = fontes if isinstance(fontes, dict) else dict.fromkeys(fontes, self._infinito)
+        demandas = sumidouros if isinstance(sumidouros, dict) else dict.fromkeys(sumidouros, self._infinito)
+        for no, oferta in ofertas.items():
+            self._adicionar_arco(self._fonte, self._indices[no], oferta, 0)
+        for no, demanda in demandas.items():
+            self._adicionar_arco(self._indices[no], self._sumidouro, demanda, 0)
+
+        self.fluxo_total = 0
+        self.custo_total = 0
+        self.aumentos = 0  # Caminhos aumentantes aplicados, útil para comparar resoluções
+
+    def _adicionar_arco(self, u, v, capacidade, custo):
+        arco = len(self._destino)
+        self._destino += [v, u]
+        self._residual += [capacidade, 0]
+        self._custo += [custo, -custo]
+        self._capacidade += [capacidade, 0]
+        self._saidas[u].append(arco)
+        self._saidas[v].append(arco + 1)
+        return arco
+
+    def _caminho_minimo(self, origem, destino, arco_ignorado=-1):
+        """Bellman-Ford com fila (SPFA) no grafo residual, que tem custos negativos nos arcos reversos."""
+        n = len(self._saidas)
+        distancia = [float("inf")] * n
+        anterior = [-1] * n
+        na_fila = [False] * n
+        distancia[origem] = 0
+        fila = deque([origem])
+        destinos, residual, custo, saidas = self._destino, self._residual, self._custo, self._saidas
+        while fila:
+            u = fila.popleft()
+            na_fila[u] = False
+            du = distancia[u]
+            for arco in saidas[u]:
+                if residual[arco] > 0 and arco != arco_ignorado:
+                    v = destinos[arco]
+                    nova = du + custo[arco]
+                    if nova < distancia[v]:
+                        distancia[v] = nova
+                        anterior[v] = arco
+                        if not na_fila[v]:
+                            na_fila[v] = True
+                            fila.append(v)
+        if distancia[destino] == float("inf"):
+            return None, None
+        caminho = []
+        v = destino
+        while v != origem:
+            arco = anterior[v]
+            caminho.append(arco)
+            v = self._destino[arco ^ 1]
+        return caminho, distancia[destino]
+
+    def _aumentar(self, origem, destino, limite):
+        """Envia até `limite` unidades de origem para destino por caminhos mínimos; retorna o total enviado."""
+        enviado = 0
+        while enviado < limite:
+            caminho, custo = self._caminho_minimo(origem, destino)
+            if caminho is None:
+                break
+            quantidade = min(limite - enviado, min(self._residual[a] for a in caminho))
+            for arco in caminho:
+                self._residual[arco] -= quantidade
+                self._residual[arco ^ 1] += quantidade
+            enviado += quantidade
+            self.custo_total += quantidade * custo
+            self.aumentos += 1
+        return enviado
+
+    @metricas.medir("planejamento.resolver")
+    def resolver(self):
+        """Completa o fluxo máximo de custo mínimo a partir do estado residual atual."""
+        self.fluxo_total += self._aumentar(self._fonte, self._sumidouro, self._infinito)
+        return self
+
+    def atualizar_capacidade(self, origem, destino, capacidade):
+        """
+        Altera a capacidade de uma aresta e re-otimiza reaproveitando o grafo residual.
+
+        Se a capacidade cai abaixo do fluxo atual, o excedente é primeiro redirecionado de
+        `origem` para `destino` por outros caminhos; o que não couber é devolvido à fonte.
+        Se a capacidade aumenta, ciclos de custo negativo que passam pela aresta são cancelados.
+        """
+        arco = self._arco_aresta[(origem, destino)]
+        u, v = self._indices[origem], self._indices[destino]
+        fluxo = self._capacidade[arco] - self._residual[arco]
+        aumento = capacidade > self._capacidade[arco]
+        self._capacidade[arco] = capacidade
+
+        if capacidade >= fluxo:
+            self._residual[arco] = capacidade - fluxo
+        else:
+            excedente = fluxo - capacidade
+            self._residual[arco] = 0
+            self._residual[arco ^ 1] = capacidade
+            self.custo_total -= excedente * self._custo[arco]
+            excedente -= self._aumentar(u, v, excedente)
+            if excedente > 0:
+                # Sem desvio possível: desfaz o fluxo excedente até a fonte e a partir do sumidouro
+                self._aumentar(u, self._fonte, excedente)
+                self._aumentar(self._sumidouro, v, excedente)
+                self.fluxo_total -= excedente
+
+        if aumento:
+            # A aresta com mais folga pode fechar ciclos mais baratos que o fluxo atual;
+            # todo ciclo negativo passa por ela, então a busca v -> u a exclui
+            while self._residual[arco] > 0:
+                caminho, custo = self._caminho_minimo(v, u, arco_ignorado=arco)
+                if caminho is None or custo + self._custo[arco] >= 0:
+                    break
+                quantidade = min(self._residual[arco], min(self._residual[a] for a in caminho))
+                for a in caminho + [arco]:
+                    self._residual[a] -= quantidade
+                    self._residual[a ^ 1] += quantidade
+                self.custo_total += quantidade * (custo + self._custo[arco])
+                self.aumentos += 1
+
+        return self.resolver()
+
+    def fluxo(self, origem, destino):
+        """Fluxo planejado na aresta origem -> destino."""
+        arco = self._arco_aresta[(origem, destino)]
+        return self._capacidade[arco] - self._residual[arco]
+
+    def fluxos(self):
+        """Dicionário {(origem, destino): fluxo} com as arestas que transportam fluxo."""
+        return {aresta: self.fluxo(*aresta) for aresta in self._arco_aresta if self.fluxo(*aresta) > 0}
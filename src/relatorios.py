@@ -0,0 +1,174 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+MAX_PONTOS = 2000  # Pontos por série após a decimação; acima disso o traço não muda na tela
+
+
+def nova_figura(figsize=(8, 5)):
+    """
+    Figura ligada diretamente ao canvas Agg, sem pyplot.
+
+    Não usa backend interativo nem o estado global do pyplot, então funciona sem display
+    e em processos paralelos; a memória é liberada quando a figura sai de escopo.
+    """
+    figura = Figure(figsize=figsize)
+    FigureCanvasAgg(figura)
+    return figura
+
+
+def decimar_min_max(x, y, max_pontos=MAX_PONTOS):
+    """
+    Reduz uma série longa mantendo o mínimo e o máximo de cada faixa.
+
+    Os picos e vales continuam visíveis no gráfico (ao contrário de tomar um ponto a cada N),
+    com no máximo `max_pontos` pontos.
+
+    :param x: Abscissas em ordem crescente
+    :param y: Valores
+    :param max_pontos: Número máximo de pontos retornados
+    :return: (x, y) decimados
+    """
+    x, y = np.asarray(x), np.asarray(y)
+    n = len(y)
+    n_faixas = max(1, max_pontos // 2)
+    if n <= max_pontos:
+        return x, y
+
+    tamanho = -(-n // n_faixas)  # Teto: todas as faixas completas, exceto a última
+    completas = n // tamanho
+    blocos = y[:completas * tamanho].reshape(completas, tamanho)
+    base = np.arange(completas) * tamanho
+    minimos = base + blocos.argmin(axis=1)
+    maximos = base + blocos.argmax(axis=1)
+    indices = [np.minimum(minimos, maximos), np.maximum(minimos, maximos)]
+    if completas * tamanho < n:
+        resto = y[completas * tamanho:]
+        inicio = completas * tamanho
+        par = sorted((inicio + int(resto.argmin()), inicio + int(resto.argmax())))
+        indices = [np.append(indices[0], par[0]), np.append(indices[1], par[1])]
+    # Intercala (menor índice, maior índice) de cada faixa para manter a ordem no tempo
+    indices = np.column_stack(indices).ravel()
+    return x[indices], y[indices]
+
+
+def figura_fluxo_duto(tempo, fluxo, fluxo_saida=None, max_pontos=MAX_PONTOS):
+    """Fluxo de petróleo na entrada (e na saída) do duto ao longo do tempo."""
+    figura = nova_figura()
+    ax = figura.add_subplot()
+    ax.plot(*decimar_min_max(tempo, fluxo, max_pontos), 'bo-', label="Fluxo de Petróleo")
+    if fluxo_saida is not None:
+        ax.plot(*decimar_min_max(tempo, fluxo_saida, max_pontos), 'g.--', label="Fluxo na Saída do Duto")
+    ax.set_xlabel("Tempo (horas)")
+    ax.set_ylabel("Fluxo (barris/hora)")
+    ax.set_title("Variação do Fluxo de Petróleo no Duto")
+    ax.legend()
+    ax.grid(True)
+    return figura
+
+
+def fluxo_transiente(pipeline, capacidade, passo=0.1, n_passos=240):
+    """
+    Série de demonstração do regime transiente usada em `figura_fluxo_duto`.
+
+    A entrada oscila em torno da capacidade do duto e a saída é calculada por
+    `simular_duto`, com o empacotamento do duto.
+
+    :param pipeline: `Pipeline` simulado
+    :param capacidade: Vazão média de entrada (m³/h)
+    :param passo: Passo de tempo (h)
+    :param n_passos: Número de passos
+    :return: (tempo, fluxo de entrada, fluxo de saída)
+    """
+    from src.models.transiente import simular_duto
+
+    tempo = np.arange(1, n_passos + 1) * passo
+    transiente = simular_duto(pipeline, np.sin(tempo / 4) * 10 + capacidade, passo=passo)
+    return tempo, transiente.vazao_entrada[:, 0], transiente.vazao_saida[:, 0]
+
+
+def figura_produtos(produtos_refinados):
+    """Barras com a quantidade de cada derivado."""
+    figura = nova_figura()
+    ax = figura.add_subplot()
+    ax.bar(list(produtos_refinados), list(produtos_refinados.values()), color=['red', 'blue', 'green'])
+    ax.set_xlabel("Produtos Refinados")
+    ax.set_ylabel("Quantidade (m³)")
+    ax.set_title("Distribuição de Produtos Refinados")
+    ax.grid(axis="y")
+    return figura
+
+
+def figura_fluxo_eventos(tempos, fluxos, max_pontos=MAX_PONTOS):
+    """Fluxo registrado nos eventos da simulação (com falhas)."""
+    figura = nova_figura()
+    ax = figura.add_subplot()
+    ax.plot(*decimar_min_max(tempos, fluxos, max_pontos), 'r-o', label="Fluxo de Petróleo com Falhas")
+    ax.set_xlabel("Tempo (unidades de simulação)")
+    ax.set_ylabel("Fluxo (barris/hora)")
+    ax.set_title("Variação do Fluxo de Petróleo")
+    ax.legend()
+    ax.grid(True)
+    return figura
+
+
+class Relatorio:
+    """
+    Relatório em PDF montado sob demanda.
+
+    `adicionar` só guarda a função e os dados de cada figura; as figuras são construídas
+    uma a uma em `salvar` e descartadas logo após serem gravadas. Como guarda apenas
+    funções de módulo e dados, o relatório pode ser enviado a outro processo.
+    """
+
+    def __init__(self, caminho):
+        """
+        :param caminho: Arquivo PDF de saída
+        """
+        self.caminho = caminho
+        self._figuras = []
+
+    def __len__(self):
+        return len(self._figuras)
+
+    def adicionar(self, funcao, *args, **kwargs):
+        """Agenda uma figura: `funcao(*args, **kwargs)` deve retornar uma `Figure`."""
+        self._figuras.append((funcao, args, kwargs))
+        return self
+
+    def figuras(self):
+        """Constrói as figuras, uma de cada vez."""
+        for funcao, args, kwargs in self._figuras:
+            yield funcao(*args, **kwargs)
+
+    def salvar(self, caminho=None):
+        """Renderiza todas as figuras em um único PDF e retorna o caminho gravado."""
+        from matplotlib.backends.backend_pdf import PdfPages
+
+        caminho = caminho or self.caminho
+        with PdfPages(caminho) as pdf:
+            for figura in self.figuras():
+                pdf.savefig(figura)
+        return caminho
+
+
+def _salvar(relatorio):
+    return relatorio.salvar()
+
+
+def renderizar_relatorios(relatorios, n_processos=None):
+    """
+    Renderiza vários relatórios (ex.: um por cenário) em processos paralelos.
+
+    :param relatorios: Lista de `Relatorio`
+    :param n_processos: Número de processos do pool (None = todos os núcleos; 1 = sem pool)
+    :return: Caminhos dos PDFs gravados, na ordem dos relatórios
+    """
+    if n_processos == 1 or len(relatorios) <= 1:
+        return [relatorio.salvar() for relatorio in relatorios]
+    n_trabalhadores = min(n_processos or os.cpu_count() or 1, len(relatorios))
+    with ProcessPoolExecutor(max_workers=n_trabalhadores) as executor:
+        return list(executor.map(_salvar, relatorios))
@@ -0,0 +1,177 @@
+import csv
+import json
+import os
+
+import numpy as np
+
+from src.historico_eventos import HistoricoEventos, DTYPES_COLUNAS, EVENTO_FALHA
+
+DTYPE_EVENTO = np.dtype([(nome, np.dtype(dtype).newbyteorder("<")) for nome, dtype in DTYPES_COLUNAS.items()])
+VERSAO_FORMATO = 1
+NOMES_TIPOS = {0: "fluxo", 1: "falha", 2: "recuperacao", 3: "entrega", 4: "medicao"}
+
+
+def _caminho_metadados(caminho):
+    return caminho + ".json"
+
+
+def _como_tupla(valor):
+    """Converte listas vindas do JSON de volta para tuplas (chaves de aresta e nós compostos)."""
+    return tuple(_como_tupla(v) for v in valor) if isinstance(valor, list) else valor
+
+
+class EscritorResultados(HistoricoEventos):
+    """
+    Histórico de eventos que grava blocos de tamanho fixo em disco durante a simulação.
+
+    O arquivo é uma sequência de registros binários `DTYPE_EVENTO` (21 bytes cada), lida
+    depois por `LeitorResultados` via memory-map. Os metadados (versão, dtype e nomes das
+    arestas) ficam em `<caminho>.json`. A memória usada fica limitada a um bloco, qualquer
+    que seja a duração da simulação. As colunas (`tempos`, `coluna`, `intervalo`...) cobrem
+    todos os eventos: os já gravados são lidos do arquivo, e o resultado é uma cópia, não
+    uma view; para percorrer históricos longos, prefira `intervalo` ou `LeitorResultados`.
+    """
+
+    def __init__(self, caminho, tamanho_bloco=65536, manter=None):
+        """
+        :param caminho: Arquivo binário de saída (sobrescrito se existir)
+        :param tamanho_bloco: Número de eventos mantidos em memória entre gravações
+        :param manter: Se informado, o arquivo é reaberto e os `manter` primeiros eventos são
+                       mantidos, com os novos gravados em seguida (ao restaurar um checkpoint)
+        """
+        super().__init__(tamanho_bloco=tamanho_bloco)
+        self.caminho = caminho
+        self.n_gravados = manter or 0
+        if manter is None:
+            self._arquivo = open(caminho, "wb")
+        else:
+            self._arquivo = open(caminho, "r+b")
+            self._arquivo.truncate(manter * DTYPE_EVENTO.itemsize)
+            self._arquivo.seek(0, os.SEEK_END)
+        self._registro = np.empty(tamanho_bloco, dtype=DTYPE_EVENTO)
+
+    def __len__(self):
+        return self.n_gravados + self.n_eventos
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.fechar()
+
+    def intervalo(self, inicio, fim=None):
+        """Eventos de índice `inicio` a `fim` (exclusivo); dos gravados, só os do intervalo são lidos do arquivo."""
+        inicio, fim, _ = slice(inicio, fim).indices(len(self))
+        fim = max(inicio, fim)
+        pendentes = {nome: coluna[max(inicio - self.n_gravados, 0):max(fim - self.n_gravados, 0)]
+                     for nome, coluna in self._colunas.items()}
+        if inicio >= self.n_gravados:
+            return pendentes
+        if not self._arquivo.closed:
+            self._arquivo.flush()
+        gravados = np.memmap(self.caminho, dtype=DTYPE_EVENTO, mode="r", shape=(self.n_gravados,))[inicio:min(fim, self.n_gravados)]
+        return {nome: np.concatenate([gravados[nome].astype(coluna.dtype), coluna]) for nome, coluna in pendentes.items()}
+
+    def coluna(self, nome):
+        """Coluna com todos os eventos, gravados e pendentes (cópia, se já houver eventos gravados)."""
+        return self.intervalo(0)[nome]
+
+    def colunas(self):
+        return self.intervalo(0)
+
+    def _crescer(self):
+        # Em vez de crescer, o bloco cheio é descarregado no arquivo
+        self.descarregar()
+
+    def descarregar(self):
+        """Grava os eventos pendentes e atualiza os metadados."""
+        n = self.n_eventos
+        if n:
+            registro = self._registro[:n]
+            for nome in DTYPE_EVENTO.names:
+                registro[nome] = self._colunas[nome][:n]
+            self._arquivo.write(registro.tobytes())
+            self._arquivo.flush()
+            self.n_gravados += n
+            self.n_eventos = 0
+        self._gravar_metadados()
+
+    def _gravar_metadados(self):
+        metadados = {
+            "versao": VERSAO_FORMATO,
+            "dtype": [[nome, DTYPE_EVENTO[nome].str] for nome in DTYPE_EVENTO.names],
+            "n_eventos": self.n_gravados,
+            "arestas": self.arestas,
+        }
+        temporario = _caminho_metadados(self.caminho) + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump(metadados, f)
+        os.replace(temporario, _caminho_metadados(self.caminho))
+
+    def fechar(self):
+        """Descarrega o bloco final e fecha o arquivo."""
+        if not self._arquivo.closed:
+            self.descarregar()
+            self._arquivo.close()
+
+
+class LeitorResultados:
+    """Acesso por memory-map a um arquivo gravado por `EscritorResultados`, sem carregá-lo inteiro."""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        with open(_caminho_metadados(caminho), encoding="utf-8") as f:
+            metadados = json.load(f)
+        if metadados["versao"] != VERSAO_FORMATO:
+            raise ValueError(f"Versão de formato não suportada: {metadados['versao']}")
+        self.arestas = [_como_tupla(a) for a in metadados["arestas"]]
+
+        # O tamanho do arquivo prevalece sobre os metadados, que podem estar um bloco atrasados
+        n_eventos = os.path.getsize(caminho) // DTYPE_EVENTO.itemsize
+        if n_eventos:
+            self.eventos = np.memmap(caminho, dtype=DTYPE_EVENTO, mode="r", shape=(n_eventos,))
+        else:
+            self.eventos = np.empty(0, dtype=DTYPE_EVENTO)
+
+    def __len__(self):
+        return len(self.eventos)
+
+    @property
+    def tempos(self):
+        return self.eventos["tempo"]
+
+    @property
+    def fluxos(self):
+        return self.eventos["fluxo"]
+
+    @property
+    def tipos(self):
+        return self.eventos["tipo"]
+
+    def tempos_falha(self):
+        """Instantes dos eventos de falha, em ordem crescente."""
+        return np.sort(self.tempos[self.tipos == EVENTO_FALHA])
+
+    def blocos(self, tamanho_bloco=1_000_000):
+        """Itera sobre fatias consecutivas do arquivo (views do memory-map)."""
+        for inicio in range(0, len(self.eventos), tamanho_bloco):
+            yield self.eventos[inicio:inicio + tamanho_bloco]
+
+    def para_dataframe(self, inicio=0, fim=None):
+        """Converte um intervalo de eventos em `pandas.DataFrame`."""
+        import pandas as pd
+        return pd.DataFrame(self.eventos[inicio:fim])
+
+    def exportar_csv(self, caminho_csv, tamanho_bloco=1_000_000):
+        """Exporta os eventos para CSV, um bloco por vez."""
+        origens = [str(a[0]) for a in self.arestas]
+        destinos = [str(a[1]) for a in self.arestas]
+        with open(caminho_csv, "w", newline="", encoding="utf-8") as f:
+            escritor = csv.writer(f)
+            escritor.writerow(["tempo", "origem", "destino", "fluxo", "tipo"])
+            for bloco in self.blocos(tamanho_bloco):
+                escritor.writerows(
+                    (t, origens[a], destinos[a], v, NOMES_TIPOS.get(k, k))
+                    for t, a, v, k in zip(bloco["tempo"].tolist(), bloco["aresta"].tolist(),
+                                          bloco["fluxo"].tolist(), bloco["tipo"].tolist())
+                )
@@ -1,14 +1,60 @@
-import networkx as nx
-import matplotlib.pyplot as plt
-import simpy
 import random
+from src.cache_rotas import CacheRotas
+from src.checkpoint import atraso_ate
+from src.historico_eventos import HistoricoEventos, EVENTO_FLUXO, EVENTO_FALHA, EVENTO_RECUPERACAO
+from src.modelo_falhas import ModeloFalhas
+from src.models.despacho import FrotaSimPy
+from src.utils.logger import get_logger
+from src.utils.metricas import metricas
+
+logger = get_logger(__name__)
 
 class Simulacao:
-    def __init__(self, env, grafo):
+    def __init__(self, env, grafo, rng=None, verbose=True, historico=None):
+        """
+        :param env: Ambiente SimPy
+        :param grafo: Grafo direcionado da rede de transporte (`networkx.DiGraph` ou `GrafoCompacto`)
+        :param rng: Gerador `random.Random` próprio da simulação (padrão: módulo global `random`)
+        :param verbose: Se False, não registra os eventos da simulação no log
+        :param historico: Destino dos eventos, ex. `EscritorResultados` para gravar em disco (padrão: em memória)
+        """
         self.env = env
         self.grafo = grafo
-        self.historico_fluxo = []  # 🔹 Adicionando o atributo
-        self.tempo_falhas = []
+        self.rng = rng if rng is not None else random
+        self.verbose = verbose
+        self.historico = historico if historico is not None else HistoricoEventos()  # 🔹 Eventos em colunas (tempo, aresta, fluxo, tipo)
+        self.cache_rotas = CacheRotas()
+        self._desativada_em = {}  # Aresta -> relógio do cache quando foi desativada
+        self.modelo_falhas = None
+        self.frota = None
+        self.rotas_em_uso = {}
+        self.desvios = 0
+        self.falhas_por_aresta = {}
+        self.tempo_inativo = {}
+        self._falhas_abertas = {}  # Aresta -> início da indisponibilidade em curso
+        self._n_falhas_abertas = {}  # Aresta -> falhas sobrepostas ainda abertas (ver `abrir_falha`)
+        self._desativacoes = {}  # Aresta -> falhas abertas que a mantêm com `ativa=False`
+        self._em_recuperacao = {}  # Aresta em recuperação de `introduzir_falhas` -> capacidade original
+
+    def _log(self, mensagem, *args):
+        # Formatação adiada: sem custo quando o nível INFO está desligado
+        if self.verbose:
+            logger.info(mensagem, *args)
+
+    def executar(self, ate):
+        """Executa o ambiente SimPy até `ate`, cronometrando a simulação em 'simulacao.executar'."""
+        with metricas.cronometrar("simulacao.executar"):
+            self.env.run(until=ate)
+
+    @property
+    def historico_fluxo(self):
+        """Lista de tuplas (tempo, fluxo), mantida por compatibilidade; prefira `historico`."""
+        return list(zip(self.historico.tempos.tolist(), self.historico.fluxos.tolist()))
+
+    @property
+    def tempo_falhas(self):
+        """Instantes das falhas registradas (array ordenado)."""
+        return self.historico.tempos_falha()
 
     def _criar_grafo(self):
         """Cria um grafo direcionado representando a rede de transporte de petróleo."""
@@ -21,63 +67,212 @@ class Simulacao:
         self.grafo.add_edge("Refinaria_B", "Porto", custo=4, capacidade=70)
         self.grafo.add_edge("Refinaria_B", "Distribuidora", custo=10, capacidade=90)
 
-    def encontrar_melhor_rota(self, origem, destino):
-        """Encontra a melhor rota entre dois pontos usando Dijkstra."""
-        melhor_rota = nx.shortest_path(self.grafo, source=origem, target=destino, weight="custo")
-        return melhor_rota
+    @metricas.medir("rotas.consulta")
+    def encontrar_melhor_rota(self, origem, destino, criterio="custo"):
+        """Encontra a melhor rota entre dois pontos usando Dijkstra, com cache por (origem, destino, critério)."""
+        return self.cache_rotas.rota(self.grafo, origem, destino, criterio)
+
+    def atualizar_aresta(self, origem, destino, **atributos):
+        """
+        Altera atributos de uma aresta e invalida as rotas afetadas no cache.
+
+        Pioras (custo maior, capacidade menor, aresta desativada) invalidam só as rotas que
+        usam a aresta. Se um atributo melhora (peso menor ou capacidade maior), outras rotas
+        podem passar a ser melhores, então o critério afetado é invalidado. Quando a aresta volta a ficar ativa, só as rotas
+        calculadas enquanto ela estava inativa são descartadas.
+        """
+        dados = self.grafo[origem][destino]
+        for nome, valor in atributos.items():
+            anterior = dados.get(nome)
+            dados[nome] = valor
+            if nome == "ativa":
+                if not valor and anterior is not False:
+                    self._desativada_em[(origem, destino)] = self.cache_rotas.relogio
+                elif valor and anterior is False:
+                    self.cache_rotas.invalidar_desde(self._desativada_em.pop((origem, destino), 0))
+            elif anterior is not None and (valor > anterior if nome == "capacidade" else valor < anterior):
+                self.cache_rotas.invalidar_criterio(nome)
+        self.cache_rotas.invalidar_aresta(origem, destino)
+
+    def abrir_falha(self, aresta, desativar=True, instante=None):
+        """
+        Registra o início de uma falha; único ponto de entrada das fontes de falha
+        (`introduzir_falhas`, `ModeloFalhas`, telemetria), que podem se sobrepor na mesma aresta.
+
+        A indisponibilidade conta do início da primeira falha aberta ao fim da última. Com
+        `desativar`, a aresta fica com `ativa=False` até que todas as falhas que a desativaram
+        sejam fechadas.
+
+        :param aresta: Par (origem, destino)
+        :param desativar: Se a falha tira a aresta de operação (False = só degrada, ex. capacidade)
+        :param instante: Início da falha (padrão: `env.now`)
+        """
+        instante = self.env.now if instante is None else instante
+        self.falhas_por_aresta[aresta] = self.falhas_por_aresta.get(aresta, 0) + 1
+        abertas = self._n_falhas_abertas.get(aresta, 0)
+        if not abertas:
+            self._falhas_abertas[aresta] = instante
+        self._n_falhas_abertas[aresta] = abertas + 1
+        if desativar:
+            desativacoes = self._desativacoes.get(aresta, 0)
+            self._desativacoes[aresta] = desativacoes + 1
+            if not desativacoes and self.grafo.has_edge(*aresta):
+                self.atualizar_aresta(*aresta, ativa=False)
+
+    def fechar_falha(self, aresta, desativar=True, instante=None):
+        """
+        Registra o fim de uma falha aberta por `abrir_falha` (com o mesmo `desativar`).
+
+        A aresta volta a `ativa=True` só quando nenhuma outra falha a mantém desativada.
+        """
+        instante = self.env.now if instante is None else instante
+        abertas = self._n_falhas_abertas.get(aresta, 0)
+        if not abertas:
+            raise ValueError(f"nenhuma falha aberta em {aresta}")
+        if abertas > 1:
+            self._n_falhas_abertas[aresta] = abertas - 1
+        else:
+            del self._n_falhas_abertas[aresta]
+            inicio = self._falhas_abertas.pop(aresta)
+            self.tempo_inativo[aresta] = self.tempo_inativo.get(aresta, 0.0) + instante - inicio
+        if desativar:
+            desativacoes = self._desativacoes.pop(aresta) - 1
+            if desativacoes:
+                self._desativacoes[aresta] = desativacoes
+            elif self.grafo.has_edge(*aresta):
+                self.atualizar_aresta(*aresta, ativa=True)
 
-    def transportar_petroleo(self, origem, destino):
-        """Simula o transporte de petróleo entre dois pontos usando SimPy."""
+    def modelar_falhas(self, mtbf=200.0, mttr=8.0, arestas=None):
+        """Inicia falhas e reparos em todas as arestas (ou nas indicadas) com um único processo orientado a eventos."""
+        self.modelo_falhas = ModeloFalhas(self, mtbf=mtbf, mttr=mttr, arestas=arestas)
+        self.env.process(self.modelo_falhas.processo())
+        return self.modelo_falhas
+
+    def despachar_pedidos(self, pedidos, caminhoes, velocidade=60.0):
+        """Atende os pedidos com uma frota de caminhões disputada como recurso SimPy; as entregas vão para o histórico."""
+        self.frota = FrotaSimPy(self, caminhoes, velocidade=velocidade)
+        self.env.process(self.frota.processar_pedidos(pedidos))
+        return self.frota
+
+    def _rota_transporte(self, origem, destino):
+        """Rota atual entre origem e destino, registrando desvios causados por falhas."""
+        if origem not in self.grafo or destino not in self.grafo:
+            return [origem, destino]
+        rota = self.encontrar_melhor_rota(origem, destino)
+        anterior = self.rotas_em_uso.get((origem, destino))
+        if anterior is not None and rota != anterior:
+            self.desvios += 1
+            self._log("🔀 [%.1fh] Rota de %s para %s alterada: %s", self.env.now, origem, destino, rota)
+        self.rotas_em_uso[(origem, destino)] = rota
+        return rota
+
+    def transportar_petroleo(self, origem, destino, retomar_em=None):
+        """
+        Simula o transporte de petróleo entre dois pontos usando SimPy.
+
+        Rota e fluxo são definidos na partida de cada viagem: uma falha durante a viagem não
+        a interrompe, só altera a rota (ou zera o fluxo, sem rota ativa) da viagem seguinte.
+
+        :param retomar_em: Ao restaurar um checkpoint, instante em que termina o transporte em curso
+        """
+        if retomar_em is not None:
+            yield self.env.timeout(atraso_ate(self.env.now, retomar_em))
+            self._log("[%.1fh] Transporte concluído!", self.env.now)
         while True:
-            tempo_transporte = random.uniform(5, 15)  
-            fluxo = random.uniform(70, 100)  # Fluxo normal
-            self.historico_fluxo.append((self.env.now, fluxo))
+            tempo_transporte = self.rng.uniform(5, 15)  
+            fluxo = self.rng.uniform(70, 100)  # Fluxo normal
+            if self._rota_transporte(origem, destino) is None:
+                fluxo = 0.0  # Sem rota ativa: transporte interrompido
+            self.historico.registrar(self.env.now, (origem, destino), fluxo, EVENTO_FLUXO)
+            metricas.incrementar("simulacao.eventos.fluxo")
             
-            print(f"[{self.env.now:.1f}h] Iniciando transporte de petróleo de {origem} para {destino}...")
+            self._log("[%.1fh] Iniciando transporte de petróleo de %s para %s...", self.env.now, origem, destino)
             yield self.env.timeout(tempo_transporte)  
-            print(f"[{self.env.now:.1f}h] Transporte concluído!")
+            self._log("[%.1fh] Transporte concluído!", self.env.now)
+
+    def introduzir_falhas(self, origem, destino, retomar_em=None):
+        """
+        Simula falhas intermitentes no transporte e reduz fluxo.
 
-    def introduzir_falhas(self, origem, destino):
-        """Simula falhas intermitentes no transporte e reduz fluxo."""
+        :param retomar_em: Ao restaurar um checkpoint, instante em que termina a espera em curso
+                           (pela falha ou, se a aresta está em `_em_recuperacao`, pela recuperação)
+        """
+        aresta = (origem, destino)
         while True:
-            tempo_falha = random.uniform(10, 30)  
-            yield self.env.timeout(tempo_falha)
+            if aresta not in self._em_recuperacao:
+                if retomar_em is None:
+                    tempo_falha = self.rng.uniform(10, 30)  
+                    yield self.env.timeout(tempo_falha)
+                else:
+                    yield self.env.timeout(atraso_ate(self.env.now, retomar_em))
+                    retomar_em = None
 
-            print(f"⚠️ [{self.env.now:.1f}h] Falha detectada entre {origem} e {destino}! Tentando recuperação...")
-            fluxo = random.uniform(20, 50)  # Fluxo reduzido
-            self.historico_fluxo.append((self.env.now, fluxo))
-            self.tempo_falhas.append(self.env.now)  # Marca falha no tempo
-            
-            tempo_recuperacao = random.uniform(5, 10)  
-            yield self.env.timeout(tempo_recuperacao)
+                self._log("⚠️ [%.1fh] Falha detectada entre %s e %s! Tentando recuperação...", self.env.now, origem, destino)
+                fluxo = self.rng.uniform(20, 50)  # Fluxo reduzido
+                self.historico.registrar(self.env.now, aresta, fluxo, EVENTO_FALHA)  # Marca falha no tempo
+                metricas.incrementar("simulacao.eventos.falha")
+                self.abrir_falha(aresta, desativar=False)
+                capacidade_original = self.grafo[origem][destino].get("capacidade") if self.grafo.has_edge(origem, destino) else None
+                self._em_recuperacao[aresta] = capacidade_original
+                if capacidade_original is not None:
+                    self.atualizar_aresta(origem, destino, capacidade=min(capacidade_original, fluxo))  # Aresta degradada
+
+            if retomar_em is None:
+                tempo_recuperacao = self.rng.uniform(5, 10)  
+                yield self.env.timeout(tempo_recuperacao)
+            else:
+                yield self.env.timeout(atraso_ate(self.env.now, retomar_em))
+                retomar_em = None
+
+            self._log("✅ [%.1fh] Transporte normalizado entre %s e %s.", self.env.now, origem, destino)
+            fluxo = self.rng.uniform(70, 100)  # Fluxo normalizado
+            self.historico.registrar(self.env.now, aresta, fluxo, EVENTO_RECUPERACAO)
+            metricas.incrementar("simulacao.eventos.recuperacao")
+            capacidade_original = self._em_recuperacao.pop(aresta)
+            if capacidade_original is not None:
+                self.atualizar_aresta(origem, destino, capacidade=capacidade_original)
+            self.fechar_falha(aresta, desativar=False)
 
-            print(f"✅ [{self.env.now:.1f}h] Transporte normalizado entre {origem} e {destino}.")
-            fluxo = random.uniform(70, 100)  # Fluxo normalizado
-            self.historico_fluxo.append((self.env.now, fluxo))
+    def tempo_inativo_por_aresta(self):
+        """Tempo total de indisponibilidade por aresta, incluindo falhas ainda em recuperação."""
+        inativo = dict(self.tempo_inativo)
+        for aresta, inicio in self._falhas_abertas.items():
+            inativo[aresta] = inativo.get(aresta, 0.0) + self.env.now - inicio
+        return inativo
 
-    def gerar_grafico_fluxo(self):
-        if not self.historico_fluxo:
-            print("⚠️ Nenhum dado de fluxo registrado durante a simulação.")
+    def gerar_grafico_fluxo(self, max_pontos=None):
+        """Figura (sem janela) do fluxo registrado; séries longas são decimadas por mínimo/máximo."""
+        from src.relatorios import MAX_PONTOS, figura_fluxo_eventos
+
+        if not len(self.historico):
+            self._log("⚠️ Nenhum dado de fluxo registrado durante a simulação.")
             return None
 
-        tempos, fluxos = zip(*self.historico_fluxo)
-        fig, ax = plt.subplots(figsize=(8, 5))
-        ax.plot(tempos, fluxos, 'r-o', label="Fluxo de Petróleo com Falhas")
-        ax.set_xlabel("Tempo (unidades de simulação)")
-        ax.set_ylabel("Fluxo (barris/hora)")
-        ax.set_title("Variação do Fluxo de Petróleo")
-        ax.legend()
-        ax.grid(True)
+        return figura_fluxo_eventos(self.historico.tempos, self.historico.fluxos, max_pontos or MAX_PONTOS)  # Retorna a figura
+
+    def desenhar_grafo(self, mostrar=True):
+        """Gera uma visualização do grafo; com `mostrar=False`, só retorna a figura."""
+        from src.grafo_compacto import GrafoCompacto
+
+        if isinstance(self.grafo, GrafoCompacto):
+            from src.visualizacao import plot_rede
+            return plot_rede(self.grafo, mostrar=mostrar)  # Redes grandes: desenho vetorizado, sem layout do networkx
 
-        return fig  # Retorna a figura
+        import networkx as nx
+        from src.relatorios import nova_figura
 
-    def desenhar_grafo(self):
-        """Gera uma visualização do grafo."""
         pos = nx.spring_layout(self.grafo)
         labels = {(u, v): f"Custo: {d['custo']}" for u, v, d in self.grafo.edges(data=True)}
 
-        plt.figure(figsize=(8, 5))
-        nx.draw(self.grafo, pos, with_labels=True, node_color='skyblue', edge_color='gray', node_size=2000, font_size=10)
-        nx.draw_networkx_edge_labels(self.grafo, pos, edge_labels=labels)
-        plt.title("Mapa das Rotas de Transporte de Petróleo")
-        plt.show()
+        if mostrar:
+            import matplotlib.pyplot as plt
+            figura = plt.figure(figsize=(8, 5))
+        else:
+            figura = nova_figura((8, 5))
+        ax = figura.add_subplot()
+        nx.draw(self.grafo, pos, ax=ax, with_labels=True, node_color='skyblue', edge_color='gray', node_size=2000, font_size=10)
+        nx.draw_networkx_edge_labels(self.grafo, pos, edge_labels=labels, ax=ax)
+        ax.set_title("Mapa das Rotas de Transporte de Petróleo")
+        if mostrar:
+            plt.show()
+        return figura
@@ -0,0 +1,408 @@
+"""
+Ingestão assíncrona de telemetria (vazão e pressão medidas) para comparar o modelo com a operação.
+
+As leituras chegam de arquivos gravados (reprodução) ou de sockets TCP/Unix, como registros
+binários de tamanho fixo (`DTYPE_LEITURA`) ou linhas CSV `tempo,sensor,vazao,pressao`, e
+são decodificadas em blocos inteiros com NumPy, nunca leitura a leitura. Os blocos passam
+por uma fila limitada: quando o consumo atrasa, as fontes esperam em vez de descartar
+leituras (no socket, a leitura para e o controle de fluxo do TCP segura o medidor).
+
+O consumidor agrupa as leituras em janelas fixas do relógio das medições (em horas, como a
+simulação) e entrega cada janela aos destinos, ex. `DestinoSimulacao` e `DestinoPreditor`.
+"""
+import asyncio
+import inspect
+import io
+import numpy as np
+
+from src.historico_eventos import EVENTO_FALHA, EVENTO_MEDICAO, EVENTO_RECUPERACAO
+from src.utils.logger import get_logger
+from src.utils.metricas import metricas
+
+logger = get_logger(__name__)
+
+DTYPE_LEITURA = np.dtype([("tempo", "<f8"), ("sensor", "<i4"), ("vazao", "<f8"), ("pressao", "<f8")])
+FORMATOS = ("binario", "csv")
+TAMANHO_BLOCO = 1 << 20  # Bytes lidos da fonte por vez
+
+
+def criar_leituras(tempos, sensores, vazoes, pressoes):
+    """Monta um array de leituras (`DTYPE_LEITURA`) a partir das colunas."""
+    leituras = np.empty(len(tempos), dtype=DTYPE_LEITURA)
+    leituras["tempo"], leituras["sensor"], leituras["vazao"], leituras["pressao"] = tempos, sensores, vazoes, pressoes
+    return leituras
+
+
+def gravar_leituras(caminho, leituras, formato="binario"):
+    """Grava leituras em um arquivo que pode ser reproduzido com `ler_arquivo`."""
+    if formato == "binario":
+        np.ascontiguousarray(leituras, dtype=DTYPE_LEITURA).tofile(caminho)
+    elif formato == "csv":
+        colunas = np.column_stack([leituras[nome] for nome in DTYPE_LEITURA.names])
+        np.savetxt(caminho, colunas, fmt=("%.9g", "%d", "%.9g", "%.9g"), delimiter=",",
+                   header=",".join(DTYPE_LEITURA.names), comments="")
+    else:
+        raise ValueError(f"Formato de telemetria inválido: {formato!r} (use {' ou '.join(FORMATOS)})")
+
+
+def _csv_para_leituras(texto):
+    if texto[:1].isalpha():  # Cabeçalho
+        texto = texto[texto.find(b"\n") + 1:]
+    if not texto.strip():
+        return np.empty(0, dtype=DTYPE_LEITURA)
+    valores = np.loadtxt(io.BytesIO(texto), delimiter=",", ndmin=2)
+    if valores.shape[1] != len(DTYPE_LEITURA.names):
+        raise ValueError(f"CSV de telemetria com {valores.shape[1]} colunas; esperado {','.join(DTYPE_LEITURA.names)}")
+    return criar_leituras(*valores.T)
+
+
+class Decodificador:
+    """Converte bytes de uma fonte em arrays de leituras, guardando o registro incompleto entre blocos."""
+
+    def __init__(self, formato="binario"):
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato de telemetria inválido: {formato!r} (use {' ou '.join(FORMATOS)})")
+        self.formato = formato
+        self._resto = b""
+
+    def alimentar(self, dados):
+        """Decodifica os registros completos de `dados`; o final incompleto fica para a próxima chamada."""
+        if self._resto:
+            dados = self._resto + dados
+        if self.formato == "binario":
+            n = len(dados) // DTYPE_LEITURA.itemsize
+            self._resto = dados[n * DTYPE_LEITURA.itemsize:]
+            return np.frombuffer(dados, dtype=DTYPE_LEITURA, count=n)
+        corte = dados.rfind(b"\n") + 1
+        self._resto = dados[corte:]
+        return _csv_para_leituras(dados[:corte])
+
+    def finalizar(self):
+        """Leituras pendentes no fim da fonte (última linha CSV sem quebra de linha)."""
+        resto, self._resto = self._resto, b""
+        if self.formato == "csv":
+            return _csv_para_leituras(resto + b"\n")
+        if resto:
+            raise ValueError(f"Fonte de telemetria terminou no meio de um registro ({len(resto)} bytes)")
+        return np.empty(0, dtype=DTYPE_LEITURA)
+
+
+async def ler_arquivo(caminho, formato=None, tamanho_bloco=TAMANHO_BLOCO, taxa=None):
+    """
+    Reproduz um arquivo de leituras em blocos (gerador assíncrono).
+
+    :param caminho: Arquivo gravado por `gravar_leituras` ou pelo sistema de medição
+    :param formato: "binario" ou "csv" (padrão: pela extensão, .csv = csv)
+    :param tamanho_bloco: Bytes lidos por vez
+    :param taxa: Leituras por segundo para reproduzir em ritmo de operação (None = o mais rápido possível)
+    """
+    decodificador = Decodificador(formato or ("csv" if str(caminho).endswith(".csv") else "binario"))
+    loop = asyncio.get_running_loop()
+    inicio, enviadas = loop.time(), 0
+    with open(caminho, "rb") as arquivo:
+        while True:
+            dados = await asyncio.to_thread(arquivo.read, tamanho_bloco)
+            if not dados:
+                break
+            leituras = decodificador.alimentar(dados)
+            if len(leituras):
+                yield leituras
+                enviadas += len(leituras)
+                if taxa:
+                    await asyncio.sleep(max(inicio + enviadas / taxa - loop.time(), 0.0))
+    leituras = decodificador.finalizar()
+    if len(leituras):
+        yield leituras
+
+
+async def ler_stream(leitor, formato="binario", tamanho_bloco=TAMANHO_BLOCO):
+    """Leituras de um `asyncio.StreamReader` (conexão TCP ou Unix) até o fim da conexão."""
+    decodificador = Decodificador(formato)
+    while True:
+        dados = await leitor.read(tamanho_bloco)
+        if not dados:
+            break
+        leituras = decodificador.alimentar(dados)
+        if len(leituras):
+            yield leituras
+    leituras = decodificador.finalizar()
+    if len(leituras):
+        yield leituras
+
+
+class JanelaTelemetria:
+    """Leituras de uma janela [inicio, fim) e seus agregados por sensor."""
+
+    def __init__(self, inicio, fim, leituras, n_sensores):
+        """
+        :param inicio: Início da janela (h)
+        :param fim: Fim da janela (h)
+        :param leituras: Array `DTYPE_LEITURA`
+        :param n_sensores: Número de sensores conhecidos (ids 0..n_sensores-1)
+        """
+        self.inicio = inicio
+        self.fim = fim
+        self.leituras = leituras
+        sensores = leituras["sensor"]
+        conhecidos = (sensores >= 0) & (sensores < n_sensores)
+        self.desconhecidas = int(len(sensores) - np.count_nonzero(conhecidos))
+        if self.desconhecidas:
+            leituras = leituras[conhecidos]
+            sensores = leituras["sensor"]
+        self.contagem = np.bincount(sensores, minlength=n_sensores)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.vazao_media = np.bincount(sensores, leituras["vazao"], n_sensores) / self.contagem      # NaN sem leitura
+            self.pressao_media = np.bincount(sensores, leituras["pressao"], n_sensores) / self.contagem
+
+    def __len__(self):
+        return len(self.leituras)
+
+    def sensores_medidos(self):
+        """Ids dos sensores com ao menos uma leitura na janela."""
+        return np.flatnonzero(self.contagem)
+
+
+class IngestorTelemetria:
+    """
+    Recebe blocos de leituras de várias fontes por uma fila limitada e entrega janelas fixas aos destinos.
+
+    As janelas seguem o relógio das leituras. Uma leitura anterior à janela aberta (fonte
+    atrasada) entra na janela aberta e é contada em `atrasadas`; nenhuma leitura é descartada.
+    """
+
+    def __init__(self, sensores, janela=1 / 60, destinos=(), tamanho_fila=16):
+        """
+        :param sensores: Aresta (origem, destino) de cada sensor, na ordem dos ids
+        :param janela: Duração de cada janela (h)
+        :param destinos: Objetos com `receber(janela)`, que pode ser uma corrotina
+        :param tamanho_fila: Blocos em espera antes de as fontes pararem de ler
+        """
+        if janela <= 0:
+            raise ValueError("A janela de telemetria deve ser positiva")
+        self.sensores = list(sensores)
+        self.janela = janela
+        self.destinos = list(destinos)
+        self.tamanho_fila = tamanho_fila
+        self.leituras = 0
+        self.janelas = 0
+        self.atrasadas = 0
+        self.desconhecidas = 0
+        self.esperas = 0  # Vezes em que uma fonte esperou a fila esvaziar
+        self._fila = None
+        self._consumidor = None
+        self._conexoes = set()
+        self._pendentes = []
+        self._indice_aberto = None
+
+    def iniciar(self):
+        """Cria a fila e o consumidor no loop atual; necessário antes de `alimentar` e `servir`."""
+        self._fila = asyncio.Queue(maxsize=self.tamanho_fila)
+        self._consumidor = asyncio.ensure_future(self._consumir())
+        return self
+
+    async def alimentar(self, fonte):
+        """Copia os blocos de uma fonte (gerador assíncrono) para a fila, esperando quando ela está cheia."""
+        async for bloco in fonte:
+            if not self._fila.full():
+                self._fila.put_nowait(bloco)
+                continue
+            self.esperas += 1
+            colocar = asyncio.ensure_future(self._fila.put(bloco))
+            await asyncio.wait({colocar, self._consumidor}, return_when=asyncio.FIRST_COMPLETED)
+            if not colocar.done():  # O consumidor parou: propaga o erro do destino
+                colocar.cancel()
+                self._consumidor.result()
+
+    async def concluir(self):
+        """Espera as conexões abertas terminarem, entrega a última janela, ainda parcial, e encerra o consumidor."""
+        if self._conexoes:
+            await asyncio.gather(*self._conexoes)
+        await self._fila.put(None)
+        await self._consumidor
+        return self
+
+    async def executar(self, *fontes):
+        """Ingere as fontes até o fim de todas e retorna o próprio ingestor, com os contadores."""
+        self.iniciar()
+        try:
+            await asyncio.gather(*(self.alimentar(fonte) for fonte in fontes))
+        except BaseException:
+            self._consumidor.cancel()
+            raise
+        return await self.concluir()
+
+    async def servir(self, host="127.0.0.1", porta=0, caminho_unix=None, formato="binario"):
+        """
+        Abre um servidor TCP (ou Unix, com `caminho_unix`) em que cada conexão é uma fonte.
+
+        :return: `asyncio.Server`; feche-o e chame `concluir`, que espera as conexões abertas terminarem
+        """
+        if self._fila is None:
+            self.iniciar()
+
+        async def conexao(leitor, escritor):
+            tarefa = asyncio.current_task()
+            self._conexoes.add(tarefa)
+            try:
+                await self.alimentar(ler_stream(leitor, formato))
+            finally:
+                self._conexoes.discard(tarefa)
+                escritor.close()
+
+        if caminho_unix is not None:
+            return await asyncio.start_unix_server(conexao, path=caminho_unix)
+        return await asyncio.start_server(conexao, host, porta)
+
+    async def _consumir(self):
+        while True:
+            bloco = await self._fila.get()
+            if bloco is None:
+                break
+            await self._processar_bloco(bloco)
+        await self._fechar_janela()
+
+    async def _processar_bloco(self, bloco):
+        self.leituras += len(bloco)
+        if not len(bloco):
+            return
+        indices = np.floor(bloco["tempo"] / self.janela).astype(np.int64)
+        if self._indice_aberto is None:
+            self._indice_aberto = int(indices.min())
+        atrasadas = np.count_nonzero(indices < self._indice_aberto)
+        if atrasadas:
+            self.atrasadas += atrasadas
+            indices = np.maximum(indices, self._indice_aberto)
+        if indices[-1] == self._indice_aberto and indices.max() == self._indice_aberto:
+            self._pendentes.append(bloco)  # Caso comum: o bloco inteiro cabe na janela aberta
+            return
+        if (indices[1:] < indices[:-1]).any():
+            ordem = np.argsort(indices, kind="stable")
+            bloco, indices = bloco[ordem], indices[ordem]
+        cortes = np.flatnonzero(indices[1:] != indices[:-1]) + 1
+        for inicio, fim in zip(np.r_[0, cortes].tolist(), np.r_[cortes, len(bloco)].tolist()):
+            if indices[inicio] != self._indice_aberto:
+                await self._fechar_janela()
+                self._indice_aberto = int(indices[inicio])
+            self._pendentes.append(bloco[inicio:fim])
+
+    async def _fechar_janela(self):
+        if not self._pendentes:
+            return
+        leituras = self._pendentes[0] if len(self._pendentes) == 1 else np.concatenate(self._pendentes)
+        self._pendentes = []
+        inicio = self._indice_aberto * self.janela
+        janela = JanelaTelemetria(inicio, inicio + self.janela, leituras, len(self.sensores))
+        self.janelas += 1
+        self.desconhecidas += janela.desconhecidas
+        metricas.incrementar("telemetria.leituras", len(janela))
+        metricas.incrementar("telemetria.janelas")
+        with metricas.cronometrar("telemetria.destinos"):
+            for destino in self.destinos:
+                retorno = destino.receber(janela)
+                if inspect.isawaitable(retorno):
+                    await retorno
+
+    def resumo(self):
+        """Contadores da ingestão."""
+        return {"leituras": self.leituras, "janelas": self.janelas, "atrasadas": self.atrasadas,
+                "desconhecidas": self.desconhecidas, "esperas": self.esperas}
+
+
+class DestinoSimulacao:
+    """
+    Leva cada janela ao estado de uma `Simulacao` em andamento.
+
+    O relógio SimPy avança até o fim da janela e a vazão e a pressão médias de cada sensor
+    vão para os atributos `vazao_medida` e `pressao_medida` da aresta e para o histórico
+    (`EVENTO_MEDICAO`). Com `vazao_minima`, uma aresta cujo medidor fica abaixo dela é
+    desativada como nas falhas simuladas e volta quando a vazão se recupera, desde que
+    nenhuma falha simulada ainda a mantenha desativada.
+    """
+
+    def __init__(self, simulacao, sensores, vazao_minima=None, acompanhar_relogio=True):
+        """
+        :param simulacao: `Simulacao` a atualizar
+        :param sensores: Aresta (origem, destino) de cada sensor, na ordem dos ids
+        :param vazao_minima: Vazão média (m³/h) abaixo da qual a aresta é considerada em falha (None = não detecta)
+        :param acompanhar_relogio: Se True, executa a simulação até o fim de cada janela
+        """
+        self.simulacao = simulacao
+        self.sensores = list(sensores)
+        self.vazao_minima = vazao_minima
+        self.acompanhar_relogio = acompanhar_relogio
+        self.paradas = set()  # Arestas desativadas pela telemetria
+
+    def receber(self, janela):
+        simulacao = self.simulacao
+        if self.acompanhar_relogio and janela.fim > simulacao.env.now:
+            simulacao.executar(janela.fim)
+        agora = simulacao.env.now
+        for sensor in janela.sensores_medidos().tolist():
+            aresta = self.sensores[sensor]
+            if not simulacao.grafo.has_edge(*aresta):
+                continue
+            vazao, pressao = float(janela.vazao_media[sensor]), float(janela.pressao_media[sensor])
+            dados = simulacao.grafo.edges[aresta]
+            dados["vazao_medida"], dados["pressao_medida"] = vazao, pressao
+            simulacao.historico.registrar(agora, aresta, vazao, EVENTO_MEDICAO)
+            if self.vazao_minima is not None:
+                self._detectar_parada(aresta, vazao, agora)
+
+    def _detectar_parada(self, aresta, vazao, agora):
+        # A falha da telemetria se soma às simuladas na mesma aresta (ver `Simulacao.abrir_falha`)
+        simulacao = self.simulacao
+        if vazao < self.vazao_minima and aresta not in self.paradas:
+            self.paradas.add(aresta)
+            simulacao.abrir_falha(aresta, instante=agora)
+            simulacao.historico.registrar(agora, aresta, vazao, EVENTO_FALHA)
+            metricas.incrementar("simulacao.eventos.falha")
+            logger.warning("⚠️ [%.2fh] Telemetria: vazão de %.1f m³/h em %s -> %s, aresta desativada", agora, vazao, *aresta)
+        elif vazao >= self.vazao_minima and aresta in self.paradas:
+            self.paradas.discard(aresta)
+            simulacao.fechar_falha(aresta, instante=agora)
+            simulacao.historico.registrar(agora, aresta, vazao, EVENTO_RECUPERACAO)
+            metricas.incrementar("simulacao.eventos.recuperacao")
+            logger.info("✅ [%.2fh] Telemetria: %s -> %s normalizada", agora, *aresta)
+
+
+class DestinoPreditor:
+    """
+    Pontua cada janela com um `PreditorFalhasOnline`, uma amostra por sensor medido com a
+    vazão média da janela, e registra alertas acima do limiar. Com `historico`, o preditor
+    também é atualizado com os eventos novos desse histórico (`consumir`) a cada
+    `treinar_a_cada` janelas: cada `partial_fit` tem custo fixo alto, então lotes maiores
+    mantêm a vazão da ingestão sem perder amostras.
+    """
+
+    def __init__(self, preditor, sensores, limiar=0.5, historico=None, treinar_a_cada=10):
+        """
+        :param preditor: `PreditorFalhasOnline`
+        :param sensores: Aresta (origem, destino) de cada sensor, na ordem dos ids
+        :param limiar: Probabilidade de falha a partir da qual se registra um alerta
+        :param historico: Histórico usado no treino incremental, ex. o da `Simulacao` alimentada por `DestinoSimulacao`
+        :param treinar_a_cada: Janelas entre duas atualizações do preditor
+        """
+        self.preditor = preditor
+        self.sensores = list(sensores)
+        self.colunas = preditor.codificar_arestas(self.sensores)
+        self.limiar = limiar
+        self.historico = historico
+        self.treinar_a_cada = treinar_a_cada
+        self.alertas = []  # (tempo, aresta, probabilidade)
+        self.pontuadas = 0
+        self._janelas = 0
+
+    def receber(self, janela):
+        self._janelas += 1
+        if self.historico is not None and self._janelas % self.treinar_a_cada == 0:
+            self.preditor.consumir(self.historico)
+        medidos = janela.sensores_medidos()
+        if not len(medidos) or not self.preditor.n_amostras:
+            return  # Preditor ainda sem treino
+        probabilidades = self.preditor.prever_proba(np.full(len(medidos), janela.fim), janela.vazao_media[medidos],
+                                                    self.colunas[medidos])
+        self.pontuadas += len(medidos)
+        for i in np.flatnonzero(probabilidades >= self.limiar).tolist():
+            aresta = self.sensores[medidos[i]]
+            self.alertas.append((janela.fim, aresta, float(probabilidades[i])))
+            logger.warning("⚠️ [%.2fh] Possível falha em %s -> %s (p=%.2f)", janela.fim, *aresta, probabilidades[i])
@@ -0,0 +1,70 @@
+import unittest
+import sys
+import os
+import networkx as nx
+import simpy
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from src.cache_rotas import CacheRotas
+from src.simulacao import Simulacao
+
+
+def criar_grafo():
+    grafo = nx.DiGraph()
+    grafo.add_edge("Refinaria_A", "Porto", custo=5, capacidade=80)
+    grafo.add_edge("Porto", "Distribuidora", custo=7, capacidade=60)
+    grafo.add_edge("Refinaria_B", "Porto", custo=4, capacidade=70)
+    grafo.add_edge("Refinaria_B", "Distribuidora", custo=10, capacidade=90)
+    return grafo
+
+
+class TestCacheRotas(unittest.TestCase):
+
+    def test_lru_e_contadores(self):
+        cache = CacheRotas(capacidade=2)
+        grafo = criar_grafo()
+        cache.rota(grafo, "Refinaria_A", "Distribuidora")
+        cache.rota(grafo, "Refinaria_B", "Distribuidora")
+        cache.rota(grafo, "Refinaria_A", "Distribuidora")
+        cache.rota(grafo, "Refinaria_B", "Porto")  # Remove Refinaria_B -> Distribuidora
+        self.assertIsNone(cache.obter("Refinaria_B", "Distribuidora"))
+        self.assertEqual(cache.obter("Refinaria_A", "Distribuidora"), ["Refinaria_A", "Porto", "Distribuidora"])
+        estatisticas = cache.estatisticas()
+        self.assertEqual((estatisticas["acertos"], estatisticas["falhas"], estatisticas["remocoes"]), (2, 4, 1))
+
+    def test_invalida_apenas_rotas_da_aresta(self):
+        simulacao = Simulacao(simpy.Environment(), criar_grafo(), verbose=False)
+        simulacao.encontrar_melhor_rota("Refinaria_A", "Distribuidora")
+        simulacao.encontrar_melhor_rota("Refinaria_B", "Distribuidora")
+        simulacao.atualizar_aresta("Refinaria_A", "Porto", custo=50)
+        self.assertEqual(len(simulacao.cache_rotas), 1)
+        self.assertEqual(simulacao.cache_rotas.obter("Refinaria_B", "Distribuidora"), ["Refinaria_B", "Distribuidora"])
+
+    def test_melhoria_e_reativacao_invalidam_o_criterio(self):
+        simulacao = Simulacao(simpy.Environment(), criar_grafo(), verbose=False)
+        simulacao.atualizar_aresta("Refinaria_B", "Distribuidora", ativa=False)
+        self.assertEqual(simulacao.encontrar_melhor_rota("Refinaria_B", "Distribuidora"), ["Refinaria_B", "Porto", "Distribuidora"])
+        simulacao.atualizar_aresta("Refinaria_B", "Distribuidora", ativa=True)
+        self.assertEqual(simulacao.encontrar_melhor_rota("Refinaria_B", "Distribuidora"), ["Refinaria_B", "Distribuidora"])
+        simulacao.atualizar_aresta("Porto", "Distribuidora", custo=1)  # Não faz parte da rota, mas a melhora
+        self.assertEqual(simulacao.encontrar_melhor_rota("Refinaria_B", "Distribuidora"), ["Refinaria_B", "Porto", "Distribuidora"])
+
+    def test_criterio_capacidade_e_desconhecido(self):
+        grafo = criar_grafo()
+        grafo.add_edge("Refinaria_A", "Distribuidora", custo=1, capacidade=10)  # Atalho barato e estreito
+        cache = CacheRotas()
+        self.assertEqual(cache.rota(grafo, "Refinaria_A", "Distribuidora"), ["Refinaria_A", "Distribuidora"])
+        self.assertEqual(cache.rota(grafo, "Refinaria_A", "Distribuidora", "capacidade"),
+                         ["Refinaria_A", "Porto", "Distribuidora"])
+        with self.assertRaises(ValueError):
+            cache.rota(grafo, "Refinaria_A", "Distribuidora", "custos")
+
+        # Aumentar a capacidade de uma aresta fora da rota pode torná-la a melhor
+        simulacao = Simulacao(simpy.Environment(), grafo, verbose=False)
+        simulacao.encontrar_melhor_rota("Refinaria_A", "Distribuidora", "capacidade")
+        simulacao.atualizar_aresta("Refinaria_A", "Distribuidora", capacidade=1000)
+        self.assertEqual(simulacao.encontrar_melhor_rota("Refinaria_A", "Distribuidora", "capacidade"),
+                         ["Refinaria_A", "Distribuidora"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+import sys
+import os
+import copy
+import json
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from src.cenarios import Cenario, ExecutorCenarios, carregar_config, chave_cenario, expandir_varredura, validar_config
+
+CAMINHO_CONFIG = os.path.join(os.path.dirname(__file__), '../../data/input_config.json')
+
+
+class TestCenarios(unittest.TestCase):
+
+    def setUp(self):
+        self.config = carregar_config(CAMINHO_CONFIG)
+        self.config.pop("varredura")
+        self.config["simulacao"]["semente"] = 7
+        self.config["simulacao"]["duracao"] = 20
+
+    def test_fabricas(self):
+        cenario = Cenario(self.config)
+        self.assertEqual(cenario.criar_pipeline().diametro, 0.2032)
+        self.assertEqual(cenario.criar_refinaria().eficiencia, 0.9)
+        grafo = cenario.criar_grafo()
+        self.assertEqual(grafo["Refinaria_B"]["Distribuidora"]["capacidade"], 90)
+        self.assertEqual(cenario.criar_planejador(grafo).resolver().fluxo_total, 150)
+
+    def test_validacao_indica_o_campo(self):
+        casos = [
+            ("pipeline", "diametro", -1, "pipeline.diametro"),
+            ("refinaria", "eficiencia", 1.5, "refinaria.eficiencia"),
+            ("pipeline", "comprimentoo", 1, "campos desconhecidos"),
+            ("simulacao", "transportes", [["Refinaria_A", "Nada"]], "simulacao.transportes[0]"),
+        ]
+        for secao, campo, valor, mensagem in casos:
+            config = copy.deepcopy(self.config)
+            config[secao][campo] = valor
+            with self.assertRaisesRegex(ValueError, mensagem.replace("[", r"\[").replace(".", r"\.")):
+                validar_config(config)
+        del self.config["rede"]
+        with self.assertRaisesRegex(ValueError, "rede"):
+            Cenario(self.config)
+
+    def test_chave_independe_da_ordem(self):
+        reordenado = json.loads(json.dumps(self.config, sort_keys=True))
+        reordenado = dict(reversed(list(reordenado.items())))
+        self.assertEqual(chave_cenario(reordenado), chave_cenario(self.config))
+        self.config["pipeline"]["diametro"] = 0.3
+        self.assertNotEqual(chave_cenario(reordenado), chave_cenario(self.config))
+
+    def test_expandir_varredura(self):
+        cenarios = expandir_varredura(self.config, {"pipeline.perda_carga": [0.01, 0.05], "rede.arestas.1.capacidade": [40, 60, 80]})
+        self.assertEqual(len(cenarios), 6)
+        self.assertEqual([c["rede"]["arestas"][1]["capacidade"] for c in cenarios[:3]], [40, 60, 80])
+        self.assertEqual(self.config["rede"]["arestas"][1]["capacidade"], 60)  # Base intacta
+        with self.assertRaises(ValueError):
+            expandir_varredura(self.config, {"rede.inexistente.0": [1]})
+
+    def test_cache_recalcula_so_cenarios_alterados(self):
+        cenarios = expandir_varredura(self.config, {"rede.arestas.1.capacidade": [40, 60, 80]})
+        with tempfile.TemporaryDirectory() as diretorio:
+            executor = ExecutorCenarios(diretorio, n_processos=1)
+            primeiro = executor.executar(cenarios)
+            self.assertEqual(executor.calculados, 3)
+            self.assertEqual([r["fluxo_maximo"] for r in primeiro], [130, 150, 170])
+
+            cenarios[2]["rede"]["arestas"][1]["capacidade"] = 100
+            executor = ExecutorCenarios(diretorio, n_processos=1)
+            segundo = executor.executar(cenarios + [cenarios[0]])
+            self.assertEqual((executor.acertos, executor.calculados), (2, 1))
+            self.assertEqual(segundo[:2], primeiro[:2])
+            self.assertEqual(segundo[3], primeiro[0])
+            self.assertEqual(segundo[2]["fluxo_maximo"], 190)
+
+    def test_resultado_reprodutivel_com_semente(self):
+        executor = ExecutorCenarios(None, n_processos=1)
+        a, b = executor.executar([self.config]), executor.executar([copy.deepcopy(self.config)])
+        self.assertEqual(a, b)
+        self.assertGreater(a[0]["simulacao"]["n_eventos"], 0)
+
+    def test_sem_semente_nao_usa_cache(self):
+        self.config["simulacao"]["semente"] = None
+        with tempfile.TemporaryDirectory() as diretorio:
+            executor = ExecutorCenarios(diretorio, n_processos=1)
+            executor.executar([self.config, copy.deepcopy(self.config)])
+            executor.executar([self.config])
+            self.assertEqual((executor.acertos, executor.calculados, executor.sem_semente), (0, 3, 3))
+            self.assertEqual(os.listdir(diretorio), [])
+
+            self.config["simulacao"]["semente"] = 7
+            executor.executar([self.config, self.config])
+            self.assertEqual((executor.calculados, len(os.listdir(diretorio))), (4, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
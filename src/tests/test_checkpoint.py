@@ -0,0 +1,173 @@
+import unittest
+import sys
+import os
+import random
+import tempfile
+import numpy as np
+import simpy
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from src.cenarios import Cenario
+from src.checkpoint import GerenciadorCheckpoints, atraso_ate, carregar_checkpoint, salvar_checkpoint
+from src.grafo_compacto import gerar_rede_sintetica
+from src.resultados import EscritorResultados, LeitorResultados
+from src.simulacao import Simulacao
+
+CONFIG = os.path.join(os.path.dirname(__file__), "..", "..", "data", "input_config.json")
+
+
+def criar_simulacao(cenario, historico=None):
+    """Cenário padrão (transportes + ModeloFalhas) mais as falhas intermitentes usadas no Monte Carlo."""
+    simulacao = cenario.criar_simulacao(simpy.Environment(), historico=historico, verbose=False)
+    # Na mesma aresta que o ModeloFalhas, para gravar falhas sobrepostas
+    simulacao.env.process(simulacao.introduzir_falhas("Refinaria_B", "Distribuidora"))
+    return simulacao
+
+
+def estado(simulacao):
+    return {
+        "colunas": {nome: coluna.copy() for nome, coluna in simulacao.historico.colunas().items()},
+        "arestas": list(simulacao.historico.arestas),
+        "falhas": dict(simulacao.falhas_por_aresta),
+        "inativo": simulacao.tempo_inativo_por_aresta(),
+        "desvios": simulacao.desvios,
+        "rng": simulacao.rng.getstate(),
+        "grafo": [(u, v, dict(d)) for u, v, d in simulacao.grafo.edges(data=True)],
+        "cache": simulacao.cache_rotas.estado(),
+    }
+
+
+class TestCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.cenario = Cenario.carregar(CONFIG)
+        self.cenario.config["simulacao"]["semente"] = 7
+
+    def assertEstadosIguais(self, a, b):
+        self.assertEqual(a["arestas"], b["arestas"])
+        for nome, coluna in a["colunas"].items():
+            np.testing.assert_array_equal(coluna, b["colunas"][nome])
+        for chave in ("falhas", "inativo", "desvios", "rng", "grafo", "cache"):
+            self.assertEqual(a[chave], b[chave], chave)
+
+    def test_atraso_exato(self):
+        rng = random.Random(0)
+        for _ in range(1000):
+            agora = rng.uniform(0, 1e4)
+            instante = agora + rng.uniform(0, 30)
+            self.assertEqual(agora + atraso_ate(agora, instante), instante)
+
+    def test_retomar_identico_a_execucao_continua(self):
+        continua = criar_simulacao(self.cenario)
+        continua.executar(300)
+
+        with tempfile.TemporaryDirectory() as diretorio:
+            gerenciador = GerenciadorCheckpoints(diretorio, intervalo=40, manter=2)
+            interrompida = criar_simulacao(self.cenario)
+            gerenciador.executar(interrompida, 130)  # "Queda" depois do checkpoint de 130h
+            self.assertEqual(len(gerenciador.checkpoints()), 2)
+            self.assertTrue(gerenciador.ultimo().endswith("checkpoint_000000130.000000.npz"))
+            retomada = gerenciador.retomar(self.cenario.criar_grafo(), ate=300)
+            with self.assertRaises(ValueError):
+                GerenciadorCheckpoints(diretorio, intervalo=40, manter=0)  # `[:-0]` não apagaria nada
+
+        self.assertGreater(sum(continua.falhas_por_aresta.values()), 10)
+        self.assertEqual(retomada.env.now, 300)
+        self.assertEqual(retomada.modelo_falhas.n_eventos, continua.modelo_falhas.n_eventos)
+        self.assertEstadosIguais(estado(continua), estado(retomada))
+
+    def test_ramificar_de_um_checkpoint(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, "aquecida.npz")
+            aquecida = criar_simulacao(self.cenario)
+            aquecida.executar(100)
+            salvar_checkpoint(aquecida, caminho)
+            n_aquecimento = len(aquecida.historico)
+
+            ramos = [carregar_checkpoint(caminho, self.cenario.criar_grafo()) for _ in range(2)]
+            ramos.append(carregar_checkpoint(caminho, self.cenario.criar_grafo(), semente=123))
+            ramos.append(carregar_checkpoint(caminho, self.cenario.criar_grafo(),
+                                             parametros_falhas={"mtbf": 1e9, "mttr": 1.0}))
+            for ramo in ramos:
+                ramo.executar(200)
+
+            with self.assertRaises(ValueError):
+                outro = self.cenario.criar_grafo()
+                outro.add_edge("Porto", "Refinaria_A")
+                carregar_checkpoint(caminho, outro)
+
+        self.assertEstadosIguais(estado(ramos[0]), estado(ramos[1]))
+        for ramo in ramos:
+            np.testing.assert_array_equal(ramo.historico.tempos[:n_aquecimento], aquecida.historico.tempos)
+        self.assertFalse(np.array_equal(ramos[0].historico.tempos, ramos[2].historico.tempos))
+        self.assertLessEqual(ramos[3].modelo_falhas.n_eventos, ramos[0].modelo_falhas.n_eventos)
+        self.assertEqual(aquecida.env.now, 100)  # O original não é afetado
+
+    def test_historico_em_disco(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            continua_bin = os.path.join(diretorio, "continua.bin")
+            with EscritorResultados(continua_bin, tamanho_bloco=64) as escritor:
+                criar_simulacao(self.cenario, historico=escritor).executar(250)
+
+            interrompida_bin = os.path.join(diretorio, "interrompida.bin")
+            caminho = os.path.join(diretorio, "checkpoint.npz")
+            escritor = EscritorResultados(interrompida_bin, tamanho_bloco=64)
+            interrompida = criar_simulacao(self.cenario, historico=escritor)
+            interrompida.executar(90)
+            salvar_checkpoint(interrompida, caminho)
+            interrompida.executar(120)  # Eventos gravados depois do checkpoint são descartados ao retomar
+            escritor.fechar()
+
+            ramo_bin = os.path.join(diretorio, "ramo.bin")
+            ramo = carregar_checkpoint(caminho, self.cenario.criar_grafo(), caminho_resultados=ramo_bin)
+            with ramo.historico:
+                ramo.executar(250)
+            retomada = carregar_checkpoint(caminho, self.cenario.criar_grafo())
+            with retomada.historico:
+                retomada.executar(250)
+
+            esperado = LeitorResultados(continua_bin)
+            for arquivo in (interrompida_bin, ramo_bin):
+                obtido = LeitorResultados(arquivo)
+                np.testing.assert_array_equal(obtido.eventos, esperado.eventos)
+                self.assertEqual(obtido.arestas, esperado.arestas)
+
+    def test_grafo_compacto(self):
+        def criar():
+            grafo = gerar_rede_sintetica(n_refinarias=3, n_terminais=20, n_portos=2, n_distribuidoras=100, semente=1)
+            simulacao = Simulacao(simpy.Environment(), grafo, rng=random.Random(0), verbose=False)
+            simulacao.env.process(simulacao.transportar_petroleo("Porto_0", "Distribuidora_10"))
+            simulacao.modelar_falhas(mtbf=20.0, mttr=5.0)
+            return simulacao
+
+        continua = criar()
+        continua.executar(150)
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, "compacto.npz")
+            interrompida = criar()
+            interrompida.executar(60)
+            salvar_checkpoint(interrompida, caminho)
+            retomada = carregar_checkpoint(caminho, criar().grafo)
+        retomada.executar(150)
+        np.testing.assert_array_equal(retomada.grafo.atributos["ativa"], continua.grafo.atributos["ativa"])
+        for nome, coluna in continua.historico.colunas().items():
+            np.testing.assert_array_equal(retomada.historico.coluna(nome), coluna)
+
+    def test_processos_nao_suportados(self):
+        simulacao = criar_simulacao(self.cenario)
+        simulacao.modelo_falhas.mtbf = lambda rng: rng.uniform(1, 2)
+        simulacao.executar(20)
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, "c.npz")
+            salvar_checkpoint(simulacao, caminho)
+            with self.assertRaises(ValueError):
+                carregar_checkpoint(caminho, self.cenario.criar_grafo())  # mtbf não gravável
+
+            def espera():
+                yield simulacao.env.timeout(1)
+            simulacao.env.process(espera())
+            with self.assertRaises(ValueError):
+                salvar_checkpoint(simulacao, caminho)
+
+
+if __name__ == '__main__':
+    unittest.main()
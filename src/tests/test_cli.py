@@ -0,0 +1,124 @@
+import unittest
+import sys
+import os
+import io
+import json
+import subprocess
+import tempfile
+import numpy as np
+from contextlib import redirect_stdout, redirect_stderr
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from src.cli import main
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+CONFIG = os.path.join(RAIZ, "data", "input_config.json")
+
+
+def executar(*argv):
+    saida, erros = io.StringIO(), io.StringIO()
+    with redirect_stdout(saida), redirect_stderr(erros):
+        codigo = main(list(argv))
+    return codigo, saida.getvalue(), erros.getvalue()
+
+
+class TestCLI(unittest.TestCase):
+
+    def test_importacao_leve(self):
+        codigo = ("import sys, src.cli\n"
+                  "pesados = {'numpy', 'matplotlib', 'pandas', 'sklearn', 'networkx', 'simpy', 'scipy'}\n"
+                  "print(sorted(pesados & set(sys.modules)))")
+        saida = subprocess.run([sys.executable, "-c", codigo], cwd=RAIZ, capture_output=True, text=True, check=True)
+        self.assertEqual(saida.stdout.strip(), "[]")
+
+    def test_refine(self):
+        codigo, saida, _ = executar("refine", "100", "--eficiencia", "0.5")
+        self.assertEqual(codigo, 0)
+        produtos = json.loads(saida)
+        self.assertAlmostEqual(produtos["gasolina"], 20.0)
+        self.assertAlmostEqual(sum(produtos.values()), 50.0)
+
+    def test_route(self):
+        codigo, saida, _ = executar("route", "Refinaria_A", "Distribuidora", "--config", CONFIG)
+        self.assertEqual(codigo, 0)
+        self.assertEqual(json.loads(saida), {"rota": ["Refinaria_A", "Porto", "Distribuidora"], "custo": 12})
+        codigo, _, erros = executar("route", "Distribuidora", "Refinaria_A", "--config", CONFIG)
+        self.assertEqual(codigo, 1)
+        self.assertIn("Sem rota", erros)
+
+    def test_nivel_de_log_invalido(self):
+        with self.assertRaises(SystemExit) as contexto:
+            executar("--log-nivel", "foo", "refine", "100")
+        self.assertEqual(contexto.exception.code, 2)  # Erro de uso do argparse, sem traceback
+
+    def test_simulate_e_report(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            resultados = os.path.join(diretorio, "eventos.bin")
+            codigo, saida, _ = executar("simulate", "--config", CONFIG, "--duracao", "50", "--semente", "1",
+                                        "--saida", resultados, "--metricas")
+            self.assertEqual(codigo, 0)
+            resumo = json.loads(saida)
+            self.assertGreater(resumo["eventos"], 0)
+            self.assertIn("simulacao.executar", resumo["metricas"]["tempos"])
+
+            # Mesma semente, mesmo resumo
+            _, saida_repetida, _ = executar("simulate", "--config", CONFIG, "--duracao", "50", "--semente", "1",
+                                            "--saida", resultados)
+            self.assertEqual(json.loads(saida_repetida)["eventos"], resumo["eventos"])
+
+            pdf = os.path.join(diretorio, "relatorio.pdf")
+            codigo, _, _ = executar("report", "--config", CONFIG, "--resultados", resultados, "--saida", pdf)
+            self.assertEqual(codigo, 0)
+            self.assertGreater(os.path.getsize(pdf), 0)
+
+    def test_ingest(self):
+        from src.telemetria import criar_leituras, gravar_leituras
+        tempos = np.repeat(np.arange(0.0, 2.0, 0.25), 4)
+        sensores = np.tile(np.arange(4), 8)
+        vazoes = np.where((sensores == 1) & (tempos >= 1.0), 0.0, 70.0)
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, "leituras.csv")
+            gravar_leituras(caminho, criar_leituras(tempos, sensores, vazoes, np.full(32, 3e6)), "csv")
+            codigo, saida, _ = executar("ingest", caminho, "--config", CONFIG, "--janela", "0.25", "--vazao-minima", "5")
+        self.assertEqual(codigo, 0)
+        resumo = json.loads(saida)
+        self.assertEqual((resumo["leituras"], resumo["janelas"]), (32, 8))
+        self.assertEqual(resumo["falhas"], {"Porto->Distribuidora": 1})
+
+    def test_simulate_checkpoints_e_retomar(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            continua = os.path.join(diretorio, "continua.bin")
+            interrompida = os.path.join(diretorio, "interrompida.bin")
+            checkpoints = os.path.join(diretorio, "checkpoints")
+            comum = ("simulate", "--config", CONFIG, "--semente", "3")
+            executar(*comum, "--duracao", "120", "--saida", continua)
+            codigo, _, _ = executar(*comum, "--duracao", "70", "--saida", interrompida,
+                                    "--checkpoints", checkpoints, "--intervalo", "25")
+            self.assertEqual(codigo, 0)
+            self.assertEqual(len(os.listdir(checkpoints)), 3)  # 25h, 50h e 70h
+            codigo, saida, _ = executar(*comum, "--duracao", "120", "--checkpoints", checkpoints, "--retomar")
+            self.assertEqual(codigo, 0)
+            self.assertEqual(json.loads(saida)["resultados"], interrompida)
+            with open(continua, "rb") as a, open(interrompida, "rb") as b:
+                self.assertEqual(a.read(), b.read())
+        self.assertEqual(executar(*comum, "--retomar")[0], 2)
+
+    def test_generate_e_route(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            rede = os.path.join(diretorio, "rede.npz")
+            codigo, saida, _ = executar("generate", "--refinarias", "3", "--terminais", "10", "--portos", "2",
+                                        "--distribuidoras", "50", "--saida", rede)
+            self.assertEqual(codigo, 0)
+            self.assertEqual(json.loads(saida)["nos"], 65)
+            codigo, saida, _ = executar("route", "Porto_0", "Distribuidora_7", "--rede", rede)
+        self.assertEqual(codigo, 0)
+        rota = json.loads(saida)["rota"]
+        self.assertEqual((rota[0], rota[-1]), ("Porto_0", "Distribuidora_7"))
+
+    def test_config_inexistente(self):
+        codigo, _, erros = executar("simulate", "--config", "/nao/existe.json")
+        self.assertEqual(codigo, 2)
+        self.assertIn("Erro", erros)
+
+
+if __name__ == '__main__':
+    unittest.main()
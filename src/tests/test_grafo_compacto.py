@@ -0,0 +1,142 @@
+import unittest
+import sys
+import os
+import random
+import tempfile
+import networkx as nx
+import numpy as np
+import simpy
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from src.cache_rotas import CacheRotas
+from src.cenarios import Cenario
+from src.grafo_compacto import GrafoCompacto, TIPOS_NO, gerar_rede_sintetica
+from src.otimizacao import OtimizadorRotas
+from src.simulacao import Simulacao
+
+CONFIG = os.path.join(os.path.dirname(__file__), "..", "..", "data", "input_config.json")
+
+
+def custo(grafo, rota, peso="custo"):
+    return sum(grafo[u][v].get(peso, 1) for u, v in zip(rota, rota[1:]))
+
+
+class TestGrafoCompacto(unittest.TestCase):
+
+    def test_api_equivalente_ao_networkx(self):
+        original = Cenario.carregar(CONFIG).criar_grafo()
+        grafo = GrafoCompacto.de_networkx(original)
+        self.assertEqual(set(grafo.nodes), set(original.nodes))
+        self.assertEqual(set(grafo.edges), set(original.edges))
+        self.assertEqual((len(grafo), grafo.number_of_edges()), (len(original), original.number_of_edges()))
+        for u, v, dados in original.edges(data=True):
+            self.assertTrue(grafo.has_edge(u, v))
+            self.assertEqual({k: grafo[u][v][k] for k in dados}, dados)
+            self.assertIs(grafo.edges[u, v]["ativa"], True)
+        self.assertFalse(grafo.has_edge("Distribuidora", "Porto"))
+        self.assertEqual(set(grafo["Refinaria_B"]), set(original["Refinaria_B"]))
+        with self.assertRaises(KeyError):
+            grafo["Porto"]["Refinaria_A"]
+
+        # Alterações gravadas pela vista chegam às colunas e à busca
+        grafo["Refinaria_A"]["Porto"]["custo"] = 100
+        self.assertEqual(grafo.atributos["custo"][grafo._indice_aresta(grafo._indice_no("Refinaria_A"), "Porto")], 100)
+        grafo.edges["Porto", "Distribuidora"]["vazao_medida"] = 42.0
+        self.assertEqual(grafo["Porto"]["Distribuidora"].get("vazao_medida"), 42.0)
+        self.assertIsNone(grafo["Refinaria_A"]["Porto"].get("vazao_medida"))
+        self.assertEqual(set(grafo.para_networkx().edges), set(original.edges))
+
+    def test_caminho_minimo_igual_ao_networkx(self):
+        grafo = gerar_rede_sintetica(n_refinarias=4, n_terminais=30, n_portos=3, n_distribuidoras=300, semente=2)
+        original = grafo.para_networkx()
+        rng = random.Random(0)
+        for _ in range(20):
+            origem, destino = rng.choice(grafo.nomes), rng.choice(grafo.nomes)
+            for peso in ("custo", "distancia"):
+                rota = grafo.caminho_minimo(origem, destino, peso)
+                if rota is None:
+                    self.assertFalse(nx.has_path(original, origem, destino))
+                    continue
+                esperado = nx.shortest_path_length(original, origem, destino, weight=peso)
+                self.assertEqual((rota[0], rota[-1]), (origem, destino))
+                self.assertAlmostEqual(custo(grafo, rota, peso), esperado)
+        self.assertIsNone(grafo.caminho_minimo("Porto_0", "Inexistente"))
+        # Capacidade: a mesma rota que o CacheRotas escolhe no networkx (peso 1 / capacidade)
+        for _ in range(10):
+            origem, destino = rng.choice(grafo.nomes), rng.choice(grafo.nomes)
+            self.assertEqual(grafo.caminho_minimo(origem, destino, "capacidade"),
+                             CacheRotas().rota(original, origem, destino, "capacidade"))
+        with self.assertRaises(ValueError):
+            grafo.caminho_minimo("Porto_0", "Distribuidora_5", "capacidades")
+        # Origem = destino: rota trivial, com ou sem arestas de saída (como no networkx)
+        folha = next(no for no in grafo.nomes if grafo.out_degree(no) == 0)
+        for no in ("Porto_0", folha):
+            self.assertEqual(grafo.caminho_minimo(no, no), nx.shortest_path(original, no, no))
+        self.assertNotIn("Distribuidora_3000000", grafo)
+
+        # Desativar uma aresta da rota força um desvio (pesos da busca atualizados no lugar)
+        rota = grafo.caminho_minimo("Porto_0", "Distribuidora_5")
+        grafo[rota[1]][rota[2]]["ativa"] = False
+        desvio = grafo.caminho_minimo("Porto_0", "Distribuidora_5")
+        self.assertNotIn((rota[1], rota[2]), set(zip(desvio, desvio[1:])) if desvio else set())
+        grafo[rota[1]][rota[2]]["ativa"] = True
+        self.assertEqual(grafo.caminho_minimo("Porto_0", "Distribuidora_5"), rota)
+
+    def test_gerador_deterministico_e_sem_repeticoes(self):
+        grafo = gerar_rede_sintetica(n_refinarias=5, n_terminais=40, n_portos=2, n_distribuidoras=500, vizinhos=3)
+        self.assertEqual(len(grafo), 547)
+        pares = grafo.origens.astype(np.int64) * len(grafo) + grafo.destinos
+        self.assertEqual(len(np.unique(pares)), grafo.number_of_edges())
+        self.assertFalse((grafo.origens == grafo.destinos).any())
+        tipos = grafo.atributos_nos["tipo"]
+        self.assertEqual(np.bincount(tipos).tolist(), [5, 40, 2, 500])
+        # Toda distribuidora recebe de `vizinhos` terminais
+        distribuidoras = tipos[grafo.destinos] == TIPOS_NO.index("distribuidora")
+        self.assertEqual(distribuidoras.sum(), 1500)
+        self.assertTrue((tipos[grafo.origens[distribuidoras]] == TIPOS_NO.index("terminal")).all())
+
+        outro = gerar_rede_sintetica(n_refinarias=5, n_terminais=40, n_portos=2, n_distribuidoras=500, vizinhos=3)
+        np.testing.assert_array_equal(grafo.destinos, outro.destinos)
+        np.testing.assert_array_equal(grafo.atributos["custo"], outro.atributos["custo"])
+
+    def test_salvar_e_carregar(self):
+        grafo = gerar_rede_sintetica(n_distribuidoras=200, semente=3)
+        grafo["Porto_0"][next(iter(grafo["Porto_0"]))]["ativa"] = False
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, "rede.npz")
+            grafo.salvar(caminho)
+            carregado = GrafoCompacto.carregar(caminho)
+        self.assertEqual(carregado.nomes, grafo.nomes)
+        np.testing.assert_array_equal(carregado.ponteiros, grafo.ponteiros)
+        for nome, coluna in grafo.atributos.items():
+            np.testing.assert_array_equal(carregado.atributos[nome], coluna)
+        self.assertEqual(carregado.nodes["Terminal_3"], grafo.nodes["Terminal_3"])
+
+        grafo.atributos["duto"] = np.full(grafo.number_of_edges(), None, dtype=object)
+        with self.assertRaises(ValueError):
+            grafo.salvar(os.path.join(tempfile.gettempdir(), "nao_gravado.npz"))
+        with self.assertRaises(ValueError):
+            GrafoCompacto(["A", "B"], [0, 0], [1, 1])
+
+    def test_simulacao_otimizador_e_desenho(self):
+        grafo = gerar_rede_sintetica(n_refinarias=3, n_terminais=20, n_portos=2, n_distribuidoras=100, semente=1)
+        simulacao = Simulacao(simpy.Environment(), grafo.copy(), rng=random.Random(0), verbose=False)
+        simulacao.env.process(simulacao.transportar_petroleo("Porto_0", "Distribuidora_10"))
+        falhas = simulacao.modelar_falhas(mtbf=20.0, mttr=5.0)
+        simulacao.executar(200)
+        self.assertGreater(falhas.n_eventos, 0)
+        self.assertGreater(len(simulacao.historico), 0)
+        self.assertTrue(grafo.atributos["ativa"].all())  # A cópia não altera o original
+        inativas = set(falhas.arestas_inativas())
+        self.assertEqual({a for a in simulacao.grafo.edges if not simulacao.grafo.edges[a]["ativa"]}, inativas)
+
+        otimizador = OtimizadorRotas.de_grafo(grafo)
+        self.assertEqual(len(otimizador.nos), len(grafo))
+        self.assertEqual(otimizador.coordenadas["Porto_1"], (grafo.nodes["Porto_1"]["x"], grafo.nodes["Porto_1"]["y"]))
+        self.assertEqual(otimizador.a_star("Porto_0", "Porto_0"), ["Porto_0"])
+
+        figura = simulacao.desenhar_grafo(mostrar=False)
+        self.assertIn("125 nós", figura.axes[0].get_title())
+
+
+if __name__ == '__main__':
+    unittest.main()
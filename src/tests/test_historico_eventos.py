@@ -0,0 +1,47 @@
+import unittest
+import sys
+import os
+import random
+import numpy as np
+import simpy
+import networkx as nx
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from src.historico_eventos import HistoricoEventos, EVENTO_FALHA, EVENTO_FLUXO
+from src.simulacao import Simulacao
+
+
+class TestHistoricoEventos(unittest.TestCase):
+
+    def test_crescimento_em_blocos(self):
+        historico = HistoricoEventos(tamanho_bloco=8)
+        for i in range(100):
+            historico.registrar(float(i), ("A", "B") if i % 2 else ("B", "C"), i * 1.5)
+        self.assertEqual(len(historico), 100)
+        np.testing.assert_array_equal(historico.tempos, np.arange(100.0))
+        self.assertEqual(historico.arestas, [("B", "C"), ("A", "B")])
+        self.assertTrue(np.shares_memory(historico.para_dataframe()["fluxo"].to_numpy(), historico.fluxos))
+
+    def test_rotulos_iguais_a_busca_em_lista(self):
+        rng = random.Random(3)
+        historico = HistoricoEventos(tamanho_bloco=16)
+        for _ in range(500):
+            tipo = EVENTO_FALHA if rng.random() < 0.1 else EVENTO_FLUXO
+            historico.registrar(round(rng.uniform(0, 50), 1), ("A", "B"), rng.uniform(20, 100), tipo)
+        falhas = list(historico.tempos[historico.tipos == EVENTO_FALHA])
+        esperado = [1 if t in falhas else 0 for t in historico.tempos]
+        np.testing.assert_array_equal(historico.rotular_falhas(), esperado)
+
+    def test_simulacao_registra_falhas(self):
+        grafo = nx.DiGraph()
+        grafo.add_edge("Refinaria_A", "Porto", custo=5, capacidade=80)
+        env = simpy.Environment()
+        simulacao = Simulacao(env, grafo, rng=random.Random(1), verbose=False)
+        env.process(simulacao.transportar_petroleo("Refinaria_A", "Porto"))
+        env.process(simulacao.introduzir_falhas("Refinaria_A", "Porto"))
+        env.run(until=100)
+        self.assertEqual(len(simulacao.tempo_falhas), simulacao.falhas_por_aresta[("Refinaria_A", "Porto")])
+        self.assertEqual(len(simulacao.historico_fluxo), len(simulacao.historico))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+import sys
+import os
+import json
+import logging
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from src.utils.logger import configurar_logging, get_logger
+from src.utils.metricas import Metricas, metricas
+from src.utils.perfil import perfilar
+from src.models.pipeline import Pipeline
+
+
+class Caro:
+    """Objeto cuja conversão para texto denuncia formatação desnecessária."""
+
+    def __init__(self):
+        self.formatado = 0
+
+    def __str__(self):
+        self.formatado += 1
+        return "caro"
+
+
+class TestMetricas(unittest.TestCase):
+
+    def test_contadores_e_cronometros(self):
+        registro = Metricas()
+        registro.incrementar("eventos")
+        registro.incrementar("eventos", 4)
+
+        @registro.medir("soma")
+        def soma(a, b):
+            return a + b
+
+        self.assertEqual(soma(1, 2), 3)
+        soma(3, 4)
+        with registro.cronometrar("bloco"):
+            pass
+        dados = json.loads(registro.exportar_json())
+        self.assertEqual(dados["contadores"], {"eventos": 5})
+        self.assertEqual(dados["tempos"]["soma"]["chamadas"], 2)
+        self.assertEqual(dados["tempos"]["bloco"]["chamadas"], 1)
+        self.assertGreaterEqual(dados["tempos"]["soma"]["max_s"], dados["tempos"]["soma"]["medio_s"])
+
+    def test_desativado_nao_mede(self):
+        registro = Metricas(ativo=False)
+        medida = registro.medir("f")(lambda: 1)
+        self.assertEqual(medida(), 1)
+        with registro.cronometrar("bloco"):
+            pass
+        registro.incrementar("n")
+        self.assertEqual(registro.instantaneo(), {"contadores": {}, "tempos": {}})
+
+    def test_modelos_instrumentados(self):
+        metricas.zerar()
+        duto = Pipeline(0.2032, 27000, 0.0001, 0.05, 3500000, 2500000, 0.02, 83.3)
+        duto.calcular_fluxo(50)
+        self.assertEqual(metricas.instantaneo()["tempos"], {})  # O registro global começa desligado
+        metricas.ativo = True
+        try:
+            for _ in range(3):
+                duto.calcular_fluxo(50)
+            duto.calcular_fluxo_lote([10.0, 50.0])
+            duto.calcular_vazao_darcy_weisbach_lote([850.0, 900.0])
+        finally:
+            metricas.ativo = False
+        tempos = metricas.instantaneo()["tempos"]
+        self.assertEqual(tempos["pipeline.calcular_fluxo"]["chamadas"], 3)
+        for nome in ("pipeline.calcular_fluxo_lote", "pipeline.calcular_vazao_lote"):
+            self.assertEqual(tempos[nome]["chamadas"], 1)
+
+    def test_perfilar(self):
+        resultado, relatorio = perfilar(sorted, [3, 1, 2], limite=5)
+        self.assertEqual(resultado, [1, 2, 3])
+        self.assertIn("function calls", relatorio)
+
+
+class TestLogging(unittest.TestCase):
+
+    def tearDown(self):
+        configurar_logging(nivel=logging.WARNING, arquivo=None)
+
+    def test_formatacao_adiada_quando_desligado(self):
+        configurar_logging(nivel=logging.WARNING, arquivo=None)
+        caro = Caro()
+        get_logger("src.teste").info("valor %s", caro)
+        self.assertEqual(caro.formatado, 0)
+
+    def test_log_json_com_campos_extras(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, "log.jsonl")
+            configurar_logging(nivel=logging.INFO, arquivo=caminho, formato="json")
+            get_logger("src.teste").info("Falha na aresta %s", "A-B", extra={"tempo_sim": 12.5})
+            configurar_logging(nivel=logging.WARNING, arquivo=None)  # Fecha o arquivo
+            with open(caminho, encoding="utf-8") as f:
+                evento = json.loads(f.readline())
+        self.assertEqual(evento["mensagem"], "Falha na aresta A-B")
+        self.assertEqual(evento["tempo_sim"], 12.5)
+        self.assertEqual(evento["logger"], "src.teste")
+
+    def test_formato_invalido(self):
+        with self.assertRaises(ValueError):
+            configurar_logging(formato="xml")
+
+
+if __name__ == '__main__':
+    unittest.main()
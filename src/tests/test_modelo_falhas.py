@@ -0,0 +1,95 @@
+import unittest
+import sys
+import os
+import random
+import networkx as nx
+import numpy as np
+import simpy
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from src.historico_eventos import EVENTO_FALHA, EVENTO_FLUXO
+from src.simulacao import Simulacao
+
+
+def criar_grafo():
+    grafo = nx.DiGraph()
+    grafo.add_edge("Refinaria_A", "Porto", custo=5, capacidade=80)
+    grafo.add_edge("Porto", "Distribuidora", custo=7, capacidade=60)
+    grafo.add_edge("Refinaria_B", "Porto", custo=4, capacidade=70)
+    grafo.add_edge("Refinaria_B", "Distribuidora", custo=10, capacidade=90)
+    return grafo
+
+
+class TestModeloFalhas(unittest.TestCase):
+
+    def test_todas_as_arestas_falham_e_sao_reparadas(self):
+        env = simpy.Environment()
+        simulacao = Simulacao(env, criar_grafo(), rng=random.Random(0), verbose=False)
+        modelo = simulacao.modelar_falhas(mtbf=20.0, mttr=5.0)
+        env.run(until=1000)
+        self.assertEqual(set(simulacao.falhas_por_aresta), set(simulacao.grafo.edges))
+        for aresta in modelo.arestas_inativas():
+            self.assertFalse(simulacao.grafo.edges[aresta]["ativa"])
+        disponibilidade = 1 - sum(simulacao.tempo_inativo_por_aresta().values()) / (4 * 1000)
+        self.assertAlmostEqual(disponibilidade, 20 / 25, delta=0.05)
+
+    def test_transporte_desviado_ou_interrompido(self):
+        grafo = criar_grafo()
+        grafo["Refinaria_B"]["Distribuidora"].update(mtbf=1e9)  # Nunca falha
+        env = simpy.Environment()
+        simulacao = Simulacao(env, grafo, rng=random.Random(3), verbose=False)
+        simulacao.modelar_falhas(mtbf=15.0, mttr=10.0)
+        env.process(simulacao.transportar_petroleo("Refinaria_A", "Distribuidora"))
+        env.process(simulacao.transportar_petroleo("Refinaria_B", "Distribuidora"))
+        env.run(until=2000)
+
+        historico = simulacao.historico
+        indice_a = historico.indice_aresta(("Refinaria_A", "Distribuidora"))
+        indice_b = historico.indice_aresta(("Refinaria_B", "Distribuidora"))
+        transporte = historico.tipos == EVENTO_FLUXO
+        arestas = historico.coluna("aresta")
+        self.assertTrue(np.any(historico.fluxos[transporte & (arestas == indice_a)] == 0))
+        self.assertTrue(np.all(historico.fluxos[transporte & (arestas == indice_b)] > 0))
+        self.assertGreater(simulacao.desvios, 0)
+        self.assertTrue(np.all(historico.fluxos[historico.tipos == EVENTO_FALHA] == 0))
+
+    def test_reativacao_descarta_rotas_calculadas_durante_a_falha(self):
+        simulacao = Simulacao(simpy.Environment(), criar_grafo(), verbose=False)
+        simulacao.encontrar_melhor_rota("Refinaria_A", "Porto")
+        simulacao.atualizar_aresta("Porto", "Distribuidora", ativa=False)
+        self.assertEqual(simulacao.encontrar_melhor_rota("Refinaria_B", "Distribuidora"), ["Refinaria_B", "Distribuidora"])
+        simulacao.atualizar_aresta("Porto", "Distribuidora", ativa=True)
+        self.assertEqual(simulacao.cache_rotas.obter("Refinaria_A", "Porto"), ["Refinaria_A", "Porto"])
+        self.assertIsNone(simulacao.cache_rotas.obter("Refinaria_B", "Distribuidora"))
+
+    def test_falhas_sobrepostas_de_fontes_diferentes(self):
+        env = simpy.Environment()
+        simulacao = Simulacao(env, criar_grafo(), rng=random.Random(0), verbose=False)
+        aresta = ("Refinaria_B", "Distribuidora")
+        env.process(simulacao.introduzir_falhas(*aresta))
+        modelo = simulacao.modelar_falhas(mtbf=30.0, mttr=5.0)
+        env.run(until=2000)  # Antes, a recuperação de uma fonte encerrava a falha da outra (KeyError)
+        self.assertGreater(simulacao.falhas_por_aresta[aresta], modelo.n_eventos / 8)
+        self.assertLessEqual(simulacao.tempo_inativo_por_aresta()[aresta], 2000)
+        for a in simulacao.grafo.edges:
+            self.assertEqual(simulacao.grafo.edges[a]["ativa"], a not in modelo.arestas_inativas())
+
+        # Uma reativação só vale quando todas as falhas que desativaram a aresta terminam
+        outra = Simulacao(simpy.Environment(), criar_grafo(), verbose=False)
+        outra.abrir_falha(aresta)
+        outra.env.run(until=2)
+        outra.abrir_falha(aresta)
+        outra.abrir_falha(aresta, desativar=False)
+        outra.env.run(until=5)
+        outra.fechar_falha(aresta)
+        outra.fechar_falha(aresta, desativar=False)
+        self.assertFalse(outra.grafo.edges[aresta]["ativa"])
+        outra.env.run(until=9)
+        outra.fechar_falha(aresta)
+        self.assertTrue(outra.grafo.edges[aresta]["ativa"])
+        self.assertEqual((outra.falhas_por_aresta[aresta], outra.tempo_inativo[aresta]), (3, 9))
+        with self.assertRaises(ValueError):
+            outra.fechar_falha(aresta)
+
+
+if __name__ == "__main__":
+    unittest.main()
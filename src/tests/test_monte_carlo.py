@@ -0,0 +1,41 @@
+import unittest
+import sys
+import os
+import networkx as nx
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from src.monte_carlo import MonteCarloSimulacao
+
+
+def criar_grafo():
+    grafo = nx.DiGraph()
+    grafo.add_edge("Refinaria_A", "Porto", custo=5, capacidade=80)
+    grafo.add_edge("Porto", "Distribuidora", custo=7, capacidade=60)
+    grafo.add_edge("Refinaria_B", "Porto", custo=4, capacidade=70)
+    grafo.add_edge("Refinaria_B", "Distribuidora", custo=10, capacidade=90)
+    return grafo
+
+
+class TestMonteCarlo(unittest.TestCase):
+
+    def setUp(self):
+        self.parametros = dict(rotas=[("Refinaria_A", "Distribuidora")],
+                               arestas_falha=[("Refinaria_A", "Porto")], duracao=200, semente=7)
+
+    def test_reprodutivel_e_independente_do_pool(self):
+        serial = MonteCarloSimulacao(criar_grafo(), n_processos=1, **self.parametros).executar(8)
+        paralelo = MonteCarloSimulacao(criar_grafo(), n_processos=2, **self.parametros).executar(8)
+        np.testing.assert_array_equal(serial.histograma, paralelo.histograma)
+        self.assertEqual(serial.falhas, paralelo.falhas)
+        self.assertAlmostEqual(serial.soma_fluxo, paralelo.soma_fluxo)
+
+    def test_estatisticas(self):
+        resultado = MonteCarloSimulacao(criar_grafo(), n_processos=1, **self.parametros).executar(20)
+        p5, p50, p95 = resultado.percentis()
+        self.assertTrue(20 <= p5 <= p50 <= p95 <= 100)
+        self.assertGreater(resultado.falhas_medias()[("Refinaria_A", "Porto")], 0)
+        self.assertGreater(resultado.tempo_inativo_medio()[("Refinaria_A", "Porto")], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
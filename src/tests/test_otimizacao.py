@@ -0,0 +1,73 @@
+import unittest
+import sys
+import os
+import random
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from src.otimizacao import OtimizadorRotas
+
+
+def criar_otimizador(n_nos=300, n_arestas=900, semente=0):
+    rng = random.Random(semente)
+    otimizador = OtimizadorRotas()
+    for i in range(n_nos):
+        otimizador.adicionar_no(f"N{i}")
+    for _ in range(n_arestas):
+        u, v = rng.sample(range(n_nos), 2)
+        otimizador.adicionar_aresta(f"N{u}", f"N{v}", custo=rng.uniform(1, 10),
+                                    distancia=rng.uniform(5, 50), capacidade=rng.uniform(50, 100))
+    otimizador.adicionar_no("Isolado")
+    return otimizador
+
+
+def custo_rota(otimizador, rota, indice):
+    return sum(min(a[indice] for a in otimizador.nos[u] if a[0] == v) for u, v in zip(rota, rota[1:]))
+
+
+class TestOtimizadorRotas(unittest.TestCase):
+
+    def test_alt_encontra_rotas_otimas(self):
+        otimizador = criar_otimizador()
+        rng = random.Random(1)
+        pares = [(f"N{rng.randrange(300)}", f"N{rng.randrange(300)}") for _ in range(50)]
+        referencia = {c: [otimizador.a_star(o, d, c) for o, d in pares] for c in ("custo", "distancia")}
+
+        otimizador.preparar(n_marcos=4)
+        for criterio, indice in (("custo", 1), ("distancia", 2)):
+            for (origem, destino), rota_ref in zip(pares, referencia[criterio]):
+                rota = otimizador.a_star(origem, destino, criterio)
+                self.assertEqual((rota[0], rota[-1]), (origem, destino))
+                self.assertAlmostEqual(custo_rota(otimizador, rota, indice), custo_rota(otimizador, rota_ref, indice))
+
+    def test_destino_inalcancavel(self):
+        otimizador = criar_otimizador()
+        otimizador.preparar(n_marcos=2)
+        self.assertIsNone(otimizador.a_star("N0", "Isolado"))
+
+    def test_preparo_descartado_ao_alterar_grafo(self):
+        otimizador = OtimizadorRotas()
+        for nome in "ABC":
+            otimizador.adicionar_no(nome)
+        otimizador.adicionar_aresta("A", "B", custo=5, distancia=1, capacidade=10)
+        otimizador.adicionar_aresta("B", "C", custo=5, distancia=1, capacidade=10)
+        otimizador.preparar(n_marcos=2)
+        otimizador.adicionar_aresta("A", "C", custo=1, distancia=1, capacidade=10)
+        self.assertEqual(otimizador.a_star("A", "C"), ["A", "C"])
+
+    def test_capacidade_favorece_dutos_largos(self):
+        otimizador = OtimizadorRotas()
+        for nome in "ABCD":
+            otimizador.adicionar_no(nome)
+        otimizador.adicionar_aresta("A", "B", custo=1, distancia=1, capacidade=100)
+        otimizador.adicionar_aresta("B", "C", custo=1, distancia=1, capacidade=100)
+        otimizador.adicionar_aresta("A", "C", custo=1, distancia=1, capacidade=5)  # Atalho estreito
+        otimizador.adicionar_aresta("C", "D", custo=1, distancia=1, capacidade=0)  # Sem capacidade: inutilizável
+        self.assertEqual(otimizador.a_star("A", "C", "capacidade"), ["A", "B", "C"])
+        self.assertIsNone(otimizador.a_star("A", "D", "capacidade"))
+        otimizador.preparar(n_marcos=2)
+        self.assertIn("capacidade", otimizador._marcos)
+        self.assertEqual(otimizador.a_star("A", "C", "capacidade"), ["A", "B", "C"])
+        self.assertIsNone(otimizador.a_star("A", "D", "capacidade"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+import sys
+import os
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from src.models.pipeline import Pipeline, calcular_fluxo_dutos, calcular_vazao_dutos
+
+PARAMETROS = dict(diametro=0.2032, comprimento=27000, rugosidade=0.0001, viscosidade=0.05,
+                  pressao_inicial=3500000, pressao_final=2500000, perda_carga=0.02, capacidade_maxima=83.3)
+
+
+class TestPipelineLote(unittest.TestCase):
+
+    def test_fluxo_lote_igual_ao_escalar(self):
+        duto = Pipeline(**PARAMETROS)
+        entradas = np.linspace(-10, 200, 101)
+        esperado = [duto.calcular_fluxo(e) for e in entradas]
+        np.testing.assert_array_equal(duto.calcular_fluxo_lote(entradas), esperado)
+
+    def test_darcy_weisbach_lote_igual_ao_escalar(self):
+        duto = Pipeline(**PARAMETROS)
+        densidades = np.array([820.0, 850.0, 900.0])
+        vazoes = duto.calcular_vazao_darcy_weisbach_lote(densidades)
+        self.assertEqual(vazoes.shape, densidades.shape)
+        self.assertTrue(np.all(vazoes == duto.calcular_vazao_darcy_weisbach(850.0)))
+
+    def test_frota_de_dutos(self):
+        dutos = [Pipeline(**PARAMETROS), Pipeline(**dict(PARAMETROS, comprimento=54000, capacidade_maxima=120.0))]
+        entradas = np.array([[50.0, 100.0], [90.0, 150.0]])
+        resultado = calcular_fluxo_dutos(dutos, entradas)
+        for j, duto in enumerate(dutos):
+            np.testing.assert_array_equal(resultado[:, j], [duto.calcular_fluxo(e) for e in entradas[:, j]])
+        np.testing.assert_array_equal(calcular_vazao_dutos(dutos), [d.calcular_vazao_darcy_weisbach(850) for d in dutos])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+import sys
+import os
+import random
+import networkx as nx
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from src.planejamento_capacidade import PlanejadorCapacidade
+
+
+def criar_grafo(semente):
+    rng = random.Random(semente)
+    grafo = nx.gnm_random_graph(20, 70, seed=semente, directed=True)
+    for u, v in grafo.edges:
+        grafo[u][v].update(capacidade=rng.randint(1, 20), custo=rng.randint(1, 10))
+    return grafo
+
+
+class TestPlanejadorCapacidade(unittest.TestCase):
+
+    def test_igual_ao_networkx(self):
+        grafo = criar_grafo(1)
+        planejador = PlanejadorCapacidade(grafo, [0, 1], [18, 19]).resolver()
+
+        estendido = grafo.copy()
+        for fonte in (0, 1):
+            estendido.add_edge("S", fonte, capacidade=10 ** 6, custo=0)
+        for sumidouro in (18, 19):
+            estendido.add_edge(sumidouro, "T", capacidade=10 ** 6, custo=0)
+        fluxo = nx.max_flow_min_cost(estendido, "S", "T", capacity="capacidade", weight="custo")
+        self.assertEqual(planejador.fluxo_total, sum(fluxo["S"].values()))
+        self.assertEqual(planejador.custo_total, nx.cost_of_flow(estendido, fluxo, weight="custo"))
+
+    def test_resolucao_incremental_igual_a_resolucao_completa(self):
+        for semente in range(20):
+            rng = random.Random(semente)
+            grafo = criar_grafo(semente)
+            planejador = PlanejadorCapacidade(grafo, [0, 1], [18, 19]).resolver()
+            for _ in range(4):
+                u, v = rng.choice(list(grafo.edges))
+                grafo[u][v]["capacidade"] = rng.randint(0, 25)
+                planejador.atualizar_capacidade(u, v, grafo[u][v]["capacidade"])
+                completo = PlanejadorCapacidade(grafo, [0, 1], [18, 19]).resolver()
+                self.assertEqual((planejador.fluxo_total, planejador.custo_total),
+                                 (completo.fluxo_total, completo.custo_total))
+
+    def test_ofertas_limitadas(self):
+        grafo = nx.DiGraph()
+        grafo.add_edge("Refinaria_A", "Porto", custo=5, capacidade=80)
+        grafo.add_edge("Porto", "Distribuidora", custo=7, capacidade=60)
+        grafo.add_edge("Refinaria_B", "Porto", custo=4, capacidade=70)
+        grafo.add_edge("Refinaria_B", "Distribuidora", custo=10, capacidade=90)
+        planejador = PlanejadorCapacidade(grafo, {"Refinaria_A": 30, "Refinaria_B": 100}, ["Distribuidora"]).resolver()
+        self.assertEqual(planejador.fluxo_total, 130)
+        self.assertEqual(planejador.fluxo("Refinaria_B", "Distribuidora"), 90)
+        self.assertEqual(planejador.custo_total, 30 * 12 + 10 * 11 + 90 * 10)
+        planejador.atualizar_capacidade("Porto", "Distribuidora", 10)
+        self.assertEqual(planejador.fluxo_total, 100)
+        self.assertEqual(planejador.fluxos()[("Refinaria_B", "Distribuidora")], 90)
+
+
+if __name__ == "__main__":
+    unittest.main()
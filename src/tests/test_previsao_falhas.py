@@ -0,0 +1,54 @@
+import unittest
+import sys
+import os
+import random
+import tempfile
+import networkx as nx
+import numpy as np
+import simpy
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from src.models.previsao_falhas import PreditorFalhasOnline, SimulacaoML
+
+
+def criar_simulacao(semente):
+    grafo = nx.DiGraph()
+    grafo.add_edge("Refinaria_A", "Porto", custo=5, capacidade=80)
+    env = simpy.Environment()
+    simulacao = SimulacaoML(env, grafo, rng=random.Random(semente), verbose=False)
+    env.process(simulacao.transportar_petroleo("Refinaria_A", "Porto"))
+    env.process(simulacao.introduzir_falhas("Refinaria_A", "Porto"))
+    env.run(until=3000)
+    return simulacao
+
+
+class TestPreditorFalhasOnline(unittest.TestCase):
+
+    def test_aprende_em_lotes(self):
+        rng = np.random.default_rng(0)
+        preditor = PreditorFalhasOnline()
+        for _ in range(20):
+            fluxos = rng.uniform(0, 100, 1000)
+            preditor.atualizar(rng.uniform(0, 100, 1000), fluxos, rng.integers(0, 32, 1000), (fluxos < 30).astype(int))
+        previsto = preditor.prever(np.full(2, 50.0), np.array([10.0, 90.0]), np.zeros(2, dtype=int))
+        np.testing.assert_array_equal(previsto, [1, 0])
+        self.assertEqual(preditor.n_amostras, 20000)
+
+    def test_consumo_incremental_e_persistencia(self):
+        simulacao = criar_simulacao(1)
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, "preditor.pkl")
+            preditor = simulacao.treinar_modelo_online(caminho)
+            self.assertEqual(preditor.n_amostras, len(simulacao.historico))
+            preditor.consumir(simulacao.historico)  # Nada novo para consumir
+            self.assertEqual(preditor.n_amostras, len(simulacao.historico))
+
+            outra = criar_simulacao(2)
+            continuado = outra.treinar_modelo_online(caminho)
+            self.assertEqual(continuado.n_amostras, len(simulacao.historico) + len(outra.historico))
+
+        probabilidades = outra.prever_falhas_lote(continuado, [10.0, 20.0], [30.0, 90.0], [("Refinaria_A", "Porto")] * 2)
+        self.assertGreater(probabilidades[0], probabilidades[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import sys
+import os
+import networkx as nx
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from src.models.pipeline import Pipeline
+from src.models.rede_dutos import RedeDutos
+
+PARAMETROS = dict(diametro=0.2032, comprimento=27000, rugosidade=0.0001, viscosidade=0.05,
+                  pressao_inicial=3500000, pressao_final=2500000, perda_carga=0.02, capacidade_maxima=83.3)
+
+
+def criar_malha(n):
+    grafo = nx.DiGraph()
+    rng = np.random.default_rng(0)
+    for i in range(n):
+        for j in range(n):
+            if i + 1 < n:
+                grafo.add_edge((i, j), (i + 1, j), duto=Pipeline(**dict(PARAMETROS, comprimento=float(rng.uniform(5000, 30000)))))
+            if j + 1 < n:
+                grafo.add_edge((i, j), (i, j + 1), duto=Pipeline(**dict(PARAMETROS, comprimento=float(rng.uniform(5000, 30000)))))
+    return grafo
+
+
+class TestRedeDutos(unittest.TestCase):
+
+    def test_conservacao_de_massa(self):
+        grafo = criar_malha(6)
+        grafo.nodes[(2, 3)]["demanda"] = 30.0
+        rede = RedeDutos(grafo)
+        resultado = rede.resolver()
+        self.assertTrue(resultado.convergiu)
+        entrada = sum(resultado.vazao(*a) for a in grafo.in_edges((2, 3)))
+        saida = sum(resultado.vazao(*a) for a in grafo.out_edges((2, 3)))
+        self.assertAlmostEqual(entrada - saida, 30.0, places=4)
+        self.assertGreater(resultado.pressao((0, 0)), resultado.pressao((5, 5)))
+
+    def test_partida_a_quente_apos_alterar_segmento(self):
+        rede = RedeDutos(criar_malha(10))
+        fria = rede.resolver()
+        rede.atualizar_segmento((3, 3), (4, 3), diametro=0.15)
+        quente = rede.resolver()
+        referencia = rede.resolver(partida_fria=True)
+        self.assertTrue(quente.convergiu)
+        self.assertLess(quente.iteracoes, fria.iteracoes)
+        np.testing.assert_allclose(quente.vazoes, referencia.vazoes, atol=1e-4)
+
+    def test_alterar_segmento_nao_modifica_o_duto_do_grafo(self):
+        grafo = criar_malha(3)
+        original = grafo[(1, 1)][(2, 1)]["duto"]
+        rede = RedeDutos(grafo)
+        rede.atualizar_segmento((1, 1), (2, 1), comprimento=original.comprimento * 2)
+        self.assertEqual(original.comprimento, grafo[(1, 1)][(2, 1)]["duto"].comprimento)
+        novo = rede._dutos[rede._indice_arestas[((1, 1), (2, 1))]]
+        self.assertIsNot(novo, original)
+        self.assertAlmostEqual(novo.perda_por_km, original.perda_por_km / 2)
+        self.assertEqual(novo.diametro, original.diametro)
+        with self.assertRaises(TypeError):
+            rede.atualizar_segmento((1, 1), (2, 1), diametros=0.1)
+
+    def test_rede_sem_pressao_fixa(self):
+        grafo = nx.DiGraph()
+        grafo.add_edge("A", "B", duto=Pipeline(**PARAMETROS))
+        grafo.add_edge("B", "A", duto=Pipeline(**PARAMETROS))
+        with self.assertRaises(ValueError):
+            RedeDutos(grafo)
+
+    def test_componente_sem_pressao_fixa(self):
+        grafo = criar_malha(3)
+        grafo.add_edge("X", "Y", duto=Pipeline(**PARAMETROS))  # Laço isolado: sem nó de entrada ou saída
+        grafo.add_edge("Y", "X", duto=Pipeline(**PARAMETROS))
+        with self.assertRaisesRegex(ValueError, "X, Y"):
+            RedeDutos(grafo)
+
+
+if __name__ == "__main__":
+    unittest.main()
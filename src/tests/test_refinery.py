@@ -0,0 +1,56 @@
+import unittest
+import sys
+import os
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from src.models.refinery import Refinery
+from src.models.rendimento import MotorRendimento
+
+
+def processar_hora_a_hora(refinaria, entradas):
+    estoque, processado, vertido = 0.0, [], []
+    for entrada in entradas:
+        estoque += entrada
+        processado.append(min(estoque, refinaria.capacidade_processamento))
+        estoque -= processado[-1]
+        vertido.append(max(estoque - refinaria.capacidade_tanque, 0.0))
+        estoque -= vertido[-1]
+    return np.array(processado), np.array(vertido)
+
+
+class TestMotorRendimento(unittest.TestCase):
+
+    def setUp(self):
+        self.refinarias = [
+            Refinery(100, 0.9),
+            Refinery(80, 0.85, capacidade_tanque=300),
+            Refinery(120, 0.95, rendimentos={"gasolina": 0.3, "diesel": 0.5, "asfalto": 0.2}, capacidade_tanque=1e9),
+        ]
+        self.entrada = np.random.default_rng(0).uniform(0, 200, (3, 500))
+
+    def test_igual_ao_processamento_hora_a_hora(self):
+        resultado = MotorRendimento.de_refinarias(self.refinarias).processar(self.entrada)
+        for i, refinaria in enumerate(self.refinarias):
+            processado, vertido = processar_hora_a_hora(refinaria, self.entrada[i])
+            np.testing.assert_allclose(resultado.processado[i], processado, atol=1e-6)
+            np.testing.assert_allclose(resultado.vertido[i], vertido, atol=1e-6)
+        self.assertTrue(np.all(resultado.processado <= np.array([100, 80, 120])[:, None] + 1e-9))
+
+    def test_produtos_seguem_tabela_de_rendimento(self):
+        motor = MotorRendimento.de_refinarias(self.refinarias)
+        resultado = motor.processar(self.entrada)
+        self.assertEqual(resultado.nomes_produtos, ["gasolina", "diesel", "querosene", "residuos", "asfalto"])
+        np.testing.assert_allclose(resultado.produto("asfalto")[2], 0.2 * 0.95 * resultado.processado[2])
+        self.assertTrue(np.all(resultado.produto("asfalto")[:2] == 0))
+        hora = self.refinarias[0].processar_petroleo(resultado.processado[0, 7])
+        self.assertAlmostEqual(resultado.produto("diesel")[0, 7], hora["diesel"])
+
+    def test_estoque_mantido_entre_chamadas(self):
+        inteiro = MotorRendimento.de_refinarias(self.refinarias).processar(self.entrada)
+        motor = MotorRendimento.de_refinarias(self.refinarias)
+        partes = [motor.processar(self.entrada[:, :200]), motor.processar(self.entrada[:, 200:])]
+        np.testing.assert_allclose(np.concatenate([p.processado for p in partes], axis=1), inteiro.processado, atol=1e-6)
+
+
+if __name__ == "__main__":
+    unittest.main()
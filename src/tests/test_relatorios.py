@@ -0,0 +1,67 @@
+import unittest
+import sys
+import os
+import tempfile
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from src.relatorios import Relatorio, decimar_min_max, figura_fluxo_eventos, figura_produtos, renderizar_relatorios
+from src.visualizacao import plot_fluxo_tempo
+
+
+def figura_com_falha():
+    raise AssertionError("Figura construída sem necessidade")
+
+
+class TestDecimacao(unittest.TestCase):
+
+    def test_serie_curta_inalterada(self):
+        x = np.arange(10.0)
+        xd, yd = decimar_min_max(x, x ** 2, max_pontos=100)
+        np.testing.assert_array_equal(yd, x ** 2)
+
+    def test_preserva_extremos_e_ordem(self):
+        rng = np.random.default_rng(0)
+        x = np.arange(100_003, dtype=float)
+        y = rng.normal(size=x.size)
+        y[12_345], y[99_999] = 50.0, -50.0  # Picos isolados
+        xd, yd = decimar_min_max(x, y, max_pontos=1000)
+        self.assertLessEqual(len(xd), 1002)
+        self.assertTrue(np.all(np.diff(xd) >= 0))
+        self.assertIn(50.0, yd)
+        self.assertIn(-50.0, yd)
+        self.assertEqual(yd.max(), y.max())
+        self.assertEqual(yd.min(), y.min())
+
+
+class TestRelatorio(unittest.TestCase):
+
+    def test_figuras_construidas_so_ao_salvar(self):
+        relatorio = Relatorio("nao_usado.pdf")
+        relatorio.adicionar(figura_com_falha)
+        self.assertEqual(len(relatorio), 1)  # Nada é construído ao adicionar
+
+    def test_salvar_e_renderizar_em_paralelo(self):
+        tempos = np.linspace(0, 50, 200_000)
+        with tempfile.TemporaryDirectory() as diretorio:
+            relatorios = []
+            for i in range(2):
+                relatorio = Relatorio(os.path.join(diretorio, f"cenario_{i}.pdf"))
+                relatorio.adicionar(figura_fluxo_eventos, tempos, np.sin(tempos + i))
+                relatorio.adicionar(figura_produtos, {"gasolina": 30.0 + i, "diesel": 26.0, "querosene": 11.0})
+                relatorios.append(relatorio)
+            caminhos = renderizar_relatorios(relatorios, n_processos=2)
+            for caminho in caminhos:
+                with open(caminho, "rb") as f:
+                    self.assertEqual(f.read(4), b"%PDF")
+
+    def test_decimacao_no_grafico(self):
+        figura = figura_fluxo_eventos(np.arange(50_000.0), np.zeros(50_000), max_pontos=500)
+        self.assertLessEqual(len(figura.axes[0].lines[0].get_xdata()), 500)
+
+    def test_visualizacao_sem_janela(self):
+        figura = plot_fluxo_tempo(np.arange(10), np.ones(10), mostrar=False)
+        self.assertEqual(figura.axes[0].get_title(), "Variação do Fluxo de Petróleo no Duto")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+import sys
+import os
+import random
+import tempfile
+import numpy as np
+import simpy
+import networkx as nx
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from src.models.previsao_falhas import PreditorFalhasOnline
+from src.resultados import EscritorResultados, LeitorResultados
+from src.simulacao import Simulacao
+
+
+class TestResultados(unittest.TestCase):
+
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self.diretorio.name, "resultados.bin")
+
+    def tearDown(self):
+        self.diretorio.cleanup()
+
+    def test_gravacao_em_blocos_e_leitura(self):
+        with EscritorResultados(self.caminho, tamanho_bloco=10) as escritor:
+            for i in range(95):
+                escritor.registrar(i * 0.5, ((0, 1), (1, 1)) if i % 3 else ("A", "B"), float(i), i % 3)
+                self.assertLessEqual(escritor.n_eventos, 10)
+            self.assertEqual(len(escritor), 95)
+        leitor = LeitorResultados(self.caminho)
+        self.assertEqual(len(leitor), 95)
+        np.testing.assert_array_equal(leitor.tempos, np.arange(95) * 0.5)
+        self.assertEqual(leitor.arestas, [("A", "B"), ((0, 1), (1, 1))])
+        self.assertEqual(sum(len(b) for b in leitor.blocos(40)), 95)
+
+    def test_simulacao_em_disco_igual_a_memoria(self):
+        grafo = nx.DiGraph()
+        grafo.add_edge("Refinaria_A", "Porto", custo=5, capacidade=80)
+        colunas = []
+        for historico in (None, EscritorResultados(self.caminho, tamanho_bloco=4)):
+            env = simpy.Environment()
+            simulacao = Simulacao(env, grafo, rng=random.Random(5), verbose=False, historico=historico)
+            env.process(simulacao.transportar_petroleo("Refinaria_A", "Porto"))
+            env.process(simulacao.introduzir_falhas("Refinaria_A", "Porto"))
+            env.run(until=300)
+            colunas.append(simulacao.historico)
+        colunas[1].fechar()
+        leitor = LeitorResultados(self.caminho)
+        np.testing.assert_array_equal(leitor.fluxos, colunas[0].fluxos)
+        np.testing.assert_array_equal(leitor.tempos_falha(), colunas[0].tempos_falha())
+
+        caminho_csv = os.path.join(self.diretorio.name, "resultados.csv")
+        leitor.exportar_csv(caminho_csv)
+        with open(caminho_csv, encoding="utf-8") as f:
+            self.assertEqual(sum(1 for _ in f), len(leitor) + 1)
+
+    def test_colunas_incluem_eventos_gravados(self):
+        grafo = nx.DiGraph()
+        grafo.add_edge("Refinaria_A", "Porto", custo=5, capacidade=80)
+        simulacoes, preditores = [], []
+        for historico in (None, EscritorResultados(self.caminho, tamanho_bloco=8)):
+            env = simpy.Environment()
+            simulacao = Simulacao(env, grafo.copy(), rng=random.Random(3), verbose=False, historico=historico)
+            env.process(simulacao.transportar_petroleo("Refinaria_A", "Porto"))
+            env.process(simulacao.introduzir_falhas("Refinaria_A", "Porto"))
+            preditor = PreditorFalhasOnline()
+            for ate in range(50, 501, 50):  # Consumo incremental, atravessando vários descarregamentos
+                env.run(until=ate)
+                preditor.consumir(simulacao.historico)
+            simulacoes.append(simulacao)
+            preditores.append(preditor)
+
+        memoria, disco = simulacoes
+        self.assertGreater(disco.historico.n_gravados, 8)
+        self.assertEqual(len(disco.historico.tempos), len(memoria.historico))
+        self.assertEqual(disco.historico_fluxo, memoria.historico_fluxo)
+        np.testing.assert_array_equal(disco.tempo_falhas, memoria.tempo_falhas)
+        for inicio, fim in ((0, 5), (3, 20), (len(memoria.historico) - 3, None)):
+            for nome, coluna in memoria.historico.intervalo(inicio, fim).items():
+                np.testing.assert_array_equal(disco.historico.intervalo(inicio, fim)[nome], coluna)
+        self.assertEqual(preditores[1].n_amostras, preditores[0].n_amostras)
+        np.testing.assert_array_equal(preditores[1].modelo.coef_, preditores[0].modelo.coef_)
+        disco.historico.fechar()
+        np.testing.assert_array_equal(disco.historico.fluxos, memoria.historico.fluxos)
+
+
+if __name__ == "__main__":
+    unittest.main()
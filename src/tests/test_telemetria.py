@@ -0,0 +1,183 @@
+import unittest
+import sys
+import os
+import asyncio
+import random
+import tempfile
+import networkx as nx
+import numpy as np
+import simpy
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from src.historico_eventos import EVENTO_FALHA, EVENTO_MEDICAO, EVENTO_RECUPERACAO
+from src.simulacao import Simulacao
+from src.telemetria import (DTYPE_LEITURA, Decodificador, DestinoSimulacao, IngestorTelemetria, criar_leituras,
+                            gravar_leituras, ler_arquivo)
+
+SENSORES = [("A", "B"), ("B", "C"), ("A", "C")]
+
+
+def criar_grafo():
+    grafo = nx.DiGraph()
+    grafo.add_edge("A", "B", custo=1, capacidade=80)
+    grafo.add_edge("B", "C", custo=1, capacidade=80)
+    grafo.add_edge("A", "C", custo=5, capacidade=80)
+    return grafo
+
+
+async def em_blocos(leituras, tamanho):
+    for inicio in range(0, len(leituras), tamanho):
+        yield leituras[inicio:inicio + tamanho]
+
+
+class Coletor:
+    def __init__(self, espera=0.0):
+        self.janelas = []
+        self.espera = espera
+
+    async def receber(self, janela):
+        self.janelas.append(janela)
+        await asyncio.sleep(self.espera)
+
+
+class TestTelemetria(unittest.TestCase):
+
+    def test_decodificador_binario_e_csv(self):
+        leituras = criar_leituras([0.1, 0.2, 0.3], [0, 1, 2], [10.0, 20.0, 30.0], [1e6, 2e6, 3e6])
+        dados = leituras.tobytes()
+        decodificador = Decodificador("binario")
+        partes = [decodificador.alimentar(dados[:40]), decodificador.alimentar(dados[40:])]
+        np.testing.assert_array_equal(np.concatenate(partes), leituras)
+        self.assertEqual(len(decodificador.finalizar()), 0)
+        decodificador.alimentar(dados[:10])
+        with self.assertRaises(ValueError):
+            decodificador.finalizar()
+
+        decodificador = Decodificador("csv")
+        texto = b"tempo,sensor,vazao,pressao\n0.1,0,10,1e6\n0.2,1,2,2e6"
+        primeira = decodificador.alimentar(texto[:35])
+        resto = decodificador.alimentar(texto[35:])
+        final = decodificador.finalizar()  # Última linha sem quebra de linha
+        lidas = np.concatenate([primeira, resto, final])
+        np.testing.assert_array_equal(lidas["sensor"], [0, 1])
+        np.testing.assert_allclose(lidas["vazao"], [10.0, 2.0])
+
+    def test_arquivos_reproduzidos(self):
+        rng = np.random.default_rng(0)
+        leituras = criar_leituras(np.sort(rng.uniform(0, 1, 5000)), rng.integers(0, 3, 5000),
+                                  rng.uniform(0, 100, 5000), rng.uniform(1e6, 3e6, 5000))
+        with tempfile.TemporaryDirectory() as diretorio:
+            for nome, formato in (("l.bin", "binario"), ("l.csv", "csv")):
+                caminho = os.path.join(diretorio, nome)
+                gravar_leituras(caminho, leituras, formato)
+                coletor = Coletor()
+                ingestor = asyncio.run(IngestorTelemetria(SENSORES, janela=0.1, destinos=[coletor])
+                                       .executar(ler_arquivo(caminho, tamanho_bloco=4096)))
+                self.assertEqual(ingestor.leituras, 5000)
+                self.assertEqual(sum(len(j) for j in coletor.janelas), 5000)
+                np.testing.assert_allclose(np.concatenate([j.leituras["vazao"] for j in coletor.janelas]),
+                                           leituras["vazao"], rtol=1e-8)
+
+    def test_janelas_e_atrasadas(self):
+        leituras = criar_leituras([0.01, 0.02, 0.05, 0.12, 0.03, 0.25], [0, 0, 1, 0, 1, 2],
+                                  [10.0, 20.0, 30.0, 40.0, 50.0, 60.0], np.zeros(6))
+        coletor = Coletor()
+        ingestor = asyncio.run(IngestorTelemetria(SENSORES, janela=0.1, destinos=[coletor]).executar(em_blocos(leituras, 4)))
+        self.assertEqual([len(j) for j in coletor.janelas], [3, 2, 1])
+        self.assertEqual(ingestor.atrasadas, 1)  # 0.03 chegou depois da janela [0.1, 0.2) ser aberta
+        np.testing.assert_allclose(coletor.janelas[0].vazao_media[:2], [15.0, 30.0])
+        self.assertAlmostEqual(coletor.janelas[1].vazao_media[1], 50.0)
+        self.assertTrue(np.isnan(coletor.janelas[0].vazao_media[2]))
+        self.assertEqual(ingestor.resumo()["leituras"], 6)
+
+    def test_contrapressao_sem_perda(self):
+        leituras = criar_leituras(np.linspace(0, 1, 2000, endpoint=False), np.zeros(2000, dtype=int),
+                                  np.ones(2000), np.zeros(2000))
+        coletor = Coletor(espera=0.001)  # Destino lento
+        ingestor = IngestorTelemetria(SENSORES, janela=0.01, destinos=[coletor], tamanho_fila=1)
+        asyncio.run(ingestor.executar(em_blocos(leituras, 10), em_blocos(leituras, 10)))
+        self.assertGreater(ingestor.esperas, 0)
+        self.assertEqual(sum(len(j) for j in coletor.janelas), 4000)
+
+    def test_erro_no_destino_interrompe_fontes(self):
+        class Falha:
+            def receber(self, janela):
+                raise RuntimeError("destino indisponível")
+
+        leituras = criar_leituras(np.arange(100) / 10, np.zeros(100, dtype=int), np.ones(100), np.zeros(100))
+        ingestor = IngestorTelemetria(SENSORES, janela=0.1, destinos=[Falha()], tamanho_fila=1)
+        with self.assertRaises(RuntimeError):
+            asyncio.run(ingestor.executar(em_blocos(leituras, 1)))
+
+    def test_destino_simulacao_e_socket(self):
+        simulacao = Simulacao(simpy.Environment(), criar_grafo(), verbose=False)
+        destino = DestinoSimulacao(simulacao, SENSORES, vazao_minima=5.0)
+        # B -> C para entre 1h e 2h
+        tempos = np.repeat(np.arange(0.5, 3.0, 0.5), 3)
+        sensores = np.tile([0, 1, 2], 5)
+        vazoes = np.where((sensores == 1) & (tempos >= 1.0) & (tempos < 2.0), 0.0, 60.0)
+        leituras = criar_leituras(tempos, sensores, vazoes, np.full(15, 2e6))
+
+        async def executar():
+            ingestor = IngestorTelemetria(SENSORES, janela=0.5, destinos=[destino])
+            servidor = await ingestor.servir()
+            _, escritor = await asyncio.open_connection(*servidor.sockets[0].getsockname()[:2])
+            rotas = []
+            for i in range(0, len(leituras), 3):
+                escritor.write(leituras[i:i + 3].tobytes())
+                await escritor.drain()
+                while ingestor.leituras < i + 3:  # Espera o servidor processar o bloco
+                    await asyncio.sleep(0.001)
+                rotas.append(simulacao.encontrar_melhor_rota("A", "C"))
+            escritor.close()
+            servidor.close()
+            return await ingestor.concluir(), rotas
+
+        ingestor, rotas = asyncio.run(executar())
+        self.assertEqual(ingestor.leituras, 15)
+        self.assertIn(["A", "C"], rotas)          # Desvio enquanto B -> C estava parada
+        self.assertEqual(rotas[-1], ["A", "B", "C"])
+        self.assertEqual(simulacao.falhas_por_aresta, {("B", "C"): 1})
+        self.assertAlmostEqual(simulacao.tempo_inativo[("B", "C")], 1.0)
+        self.assertEqual(simulacao.env.now, 3.0)
+        tipos = simulacao.historico.tipos
+        self.assertEqual(np.count_nonzero(tipos == EVENTO_MEDICAO), 15)
+        self.assertEqual(np.count_nonzero(tipos == EVENTO_FALHA), 1)
+        self.assertEqual(np.count_nonzero(tipos == EVENTO_RECUPERACAO), 1)
+        self.assertEqual(simulacao.grafo["A"]["B"]["vazao_medida"], 60.0)
+
+    def test_parada_medida_e_falhas_simuladas_na_mesma_aresta(self):
+        simulacao = Simulacao(simpy.Environment(), criar_grafo(), rng=random.Random(0), verbose=False)
+        destino = DestinoSimulacao(simulacao, SENSORES, vazao_minima=5.0)
+        aresta = ("A", "B")
+        simulacao.env.process(simulacao.introduzir_falhas(*aresta))  # Falha entre 10 e 30h, recupera 5 a 10h depois
+        modelo = simulacao.modelar_falhas(mtbf=1.0, mttr=1.0, arestas=[aresta])
+
+        # O medidor de A -> B fica parado de 0 a 60h; a cada hora, uma janela com todos os sensores
+        tempos = np.repeat(np.arange(0.5, 80.0, 1.0), 3)
+        sensores = np.tile([0, 1, 2], 80)
+        vazoes = np.where((sensores == 0) & (tempos < 60.0), 0.0, 60.0)
+        leituras = criar_leituras(tempos, sensores, vazoes, np.full(len(tempos), 2e6))
+
+        ativa_enquanto_parada = []
+
+        class Observador:
+            def receber(self, janela):
+                if janela.fim <= 60.0:
+                    ativa_enquanto_parada.append(simulacao.grafo.edges[aresta]["ativa"])
+
+        ingestor = IngestorTelemetria(SENSORES, janela=1.0, destinos=[destino, Observador()])
+        asyncio.run(ingestor.executar(em_blocos(leituras, 30)))  # Antes: KeyError na recuperação da telemetria
+
+        self.assertGreater(modelo.n_eventos, 20)
+        self.assertGreater(np.count_nonzero(simulacao.historico.tipos == EVENTO_FALHA), 10)
+        self.assertFalse(any(ativa_enquanto_parada))  # Reparos simulados não reativam a aresta parada
+        self.assertNotIn(aresta, destino.paradas)
+        self.assertEqual(simulacao.grafo.edges[aresta]["ativa"], aresta not in modelo.arestas_inativas())
+        self.assertGreaterEqual(simulacao.tempo_inativo_por_aresta()[aresta], 60.0)
+
+    def test_registro_binario_compacto(self):
+        self.assertEqual(DTYPE_LEITURA.itemsize, 28)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+import sys
+import os
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from src.models.pipeline import Pipeline, parametros_dutos
+from src.models.rede_dutos import coeficientes_perda
+from src.models.transiente import ModeloTransiente, simular_duto
+
+PARAMETROS = dict(diametro=0.2032, comprimento=27000, rugosidade=0.0001, viscosidade=0.05,
+                  pressao_inicial=3500000, pressao_final=2500000, perda_carga=0.02, capacidade_maxima=83.3)
+
+
+class TestModeloTransiente(unittest.TestCase):
+
+    def test_regime_permanente(self):
+        modelo = ModeloTransiente([PARAMETROS], vazao_inicial=83.3)
+        resultado = modelo.avancar(np.full(120, 83.3))
+        np.testing.assert_allclose(resultado.vazao_saida, 83.3)
+        np.testing.assert_allclose(resultado.empacotamento[:, 0], modelo.empacotamento()[0])
+        # Na vazão de referência a queda de pressão é a da lei quadrática de `RedeDutos`
+        queda = coeficientes_perda(parametros_dutos([PARAMETROS]))[0] * (83.3 / 3600) ** 2
+        self.assertAlmostEqual(resultado.pressao_entrada[-1, 0], PARAMETROS["pressao_final"] + queda, delta=1.0)
+
+    def test_balanco_de_massa_apos_degrau(self):
+        modelo = ModeloTransiente([PARAMETROS], vazao_inicial=20.0, passo=1 / 3600)
+        inicial = modelo.empacotamento()[0]
+        resultado = modelo.avancar(np.full(600, 80.0))
+        # A saída responde com atraso ao degrau e converge para a nova vazão
+        self.assertLess(resultado.vazao_saida[0, 0], 79.0)
+        self.assertAlmostEqual(resultado.vazao_saida[-1, 0], 80.0, places=3)
+        acumulado = np.sum(resultado.vazao_entrada - resultado.vazao_saida) * modelo.passo
+        self.assertAlmostEqual(modelo.empacotamento()[0] - inicial, acumulado, places=6)
+        self.assertAlmostEqual(resultado.empacotamento[-1, 0], modelo.empacotamento()[0], places=6)
+        self.assertGreater(modelo.empacotamento()[0], inicial)  # Mais pressão, mais petróleo empacotado
+
+    def test_lote_chega_apos_tempo_de_transito(self):
+        modelo = ModeloTransiente([PARAMETROS], vazao_inicial=60.0, produtos=("leve", "pesado"))
+        programacao = np.array(["leve"] * 1200, dtype=object)
+        programacao[:30] = "pesado"  # 30 min de pesado = 30 m³
+        resultado = modelo.avancar(np.full(1200, 60.0), programacao)
+
+        transito = modelo.volumes[0] / 60.0  # h
+        (_, chegada_pesado, sai, chega), (_, chegada_leve, _, _) = resultado.chegadas
+        self.assertEqual((sai, chega), ("leve", "pesado"))
+        self.assertAlmostEqual(chegada_pesado, transito, delta=0.02)
+        self.assertAlmostEqual(chegada_leve - chegada_pesado, 0.5, delta=0.02)
+        entregue = resultado.entregue_por_produto()
+        self.assertAlmostEqual(entregue["pesado"], 30.0, delta=1.5)
+        self.assertAlmostEqual(sum(entregue.values()), 1200.0, places=6)
+
+    def test_lotes_em_transito(self):
+        modelo = ModeloTransiente([PARAMETROS], vazao_inicial=60.0, produtos=("leve", "pesado"))
+        modelo.avancar(np.full(120, 60.0), np.r_[np.zeros(60, int), np.ones(60, int)])
+        lotes = modelo.lotes()
+        self.assertEqual([l[1] for l in lotes], ["leve", "pesado"])
+        self.assertAlmostEqual(lotes[1][4], 60.0, delta=1.0)  # 1 h de pesado a 60 m³/h
+        self.assertAlmostEqual(sum(l[4] for l in lotes), modelo.volumes[0])
+
+    def test_vetorizado_igual_a_dutos_isolados(self):
+        dutos = [PARAMETROS, dict(PARAMETROS, comprimento=12000, diametro=0.3)]
+        rng = np.random.default_rng(0)
+        vazoes = rng.uniform(20, 80, size=(300, 2))
+        produtos = (np.arange(300)[:, None] // np.array([40, 70])) % 2
+        conjunto = ModeloTransiente(dutos, vazao_inicial=50, produtos=("a", "b")).avancar(vazoes, produtos)
+        for d, duto in enumerate(dutos):
+            isolado = ModeloTransiente([duto], vazao_inicial=50, produtos=("a", "b")).avancar(vazoes[:, d], produtos[:, d])
+            np.testing.assert_allclose(conjunto.vazao_saida[:, d], isolado.vazao_saida[:, 0])
+            np.testing.assert_allclose(conjunto.entregue[d], isolado.entregue[0])
+            self.assertEqual([c[1:] for c in conjunto.chegadas if c[0] == d], [c[1:] for c in isolado.chegadas])
+
+    def test_capacidade_e_produto_desconhecido(self):
+        resultado = simular_duto(Pipeline(**PARAMETROS), [100.0, 100.0])
+        np.testing.assert_allclose(resultado.vazao_entrada, 83.3)
+        with self.assertRaises(ValueError):
+            ModeloTransiente([PARAMETROS]).avancar([10.0], ["diesel"])
+
+
+if __name__ == '__main__':
+    unittest.main()
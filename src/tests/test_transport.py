@@ -0,0 +1,88 @@
+import unittest
+import sys
+import os
+import random
+import networkx as nx
+import simpy
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from src.models.transport import Transport
+from src.models.despacho import DespachoFrota, Pedido
+from src.historico_eventos import EVENTO_ENTREGA
+from src.simulacao import Simulacao
+
+
+class TestDespachoFrota(unittest.TestCase):
+
+    def setUp(self):
+        self.frota = [Transport(30, 120, 0.95), Transport(20, 120, 0.9)]
+        self.despacho = DespachoFrota(self.frota, velocidade=60.0)
+
+    def test_todos_os_pedidos_sao_entregues(self):
+        rng = random.Random(0)
+        pedidos = [Pedido(rng.choice(["gasolina", "diesel"]), rng.uniform(1, 70), "Refinaria", rng.choice(["D1", "D2"]),
+                          prioridade=rng.randint(0, 3), liberacao=rng.uniform(0, 100)) for _ in range(300)]
+        viagens = self.despacho.despachar(pedidos)
+
+        carregado = {}
+        for viagem in viagens:
+            caminhao = self.frota[viagem.caminhao]
+            self.assertLessEqual(viagem.carga, caminhao.capacidade_caminhao + 1e-9)
+            self.assertEqual(len({pedido.rota for pedido, _ in viagem.parcelas}), 1)
+            self.assertAlmostEqual(viagem.entregue, viagem.carga * caminhao.eficiencia_transporte)
+            for pedido, quantidade in viagem.parcelas:
+                self.assertGreaterEqual(viagem.partida, pedido.liberacao)
+                carregado[id(pedido)] = carregado.get(id(pedido), 0.0) + quantidade
+        for pedido in pedidos:
+            self.assertAlmostEqual(carregado[id(pedido)], pedido.quantidade)
+
+    def test_caminhao_nao_faz_duas_viagens_ao_mesmo_tempo(self):
+        pedidos = [Pedido("diesel", 25, "R", "D", liberacao=i * 0.5) for i in range(40)]
+        viagens = self.despacho.despachar(pedidos)
+        por_caminhao = {}
+        for viagem in viagens:
+            por_caminhao.setdefault(viagem.caminhao, []).append(viagem)
+        for lista in por_caminhao.values():
+            for anterior, seguinte in zip(lista, lista[1:]):
+                self.assertGreaterEqual(seguinte.partida, anterior.retorno)
+
+    def test_prioridade_e_consolidacao(self):
+        pedidos = [
+            Pedido("diesel", 10, "R", "D1", prioridade=0),
+            Pedido("gasolina", 30, "R", "D2", prioridade=5),
+            Pedido("diesel", 15, "R", "D1", prioridade=1),
+        ]
+        viagens = DespachoFrota([Transport(30, 60, 1.0)]).despachar(pedidos)
+        self.assertEqual(viagens[0].parcelas[0][0].produto, "gasolina")
+        # Os dois pedidos de diesel para D1 dividem o mesmo caminhão
+        self.assertEqual(len(viagens), 2)
+        self.assertEqual([p.prioridade for p, _ in viagens[1].parcelas], [1, 0])
+
+    def test_pedido_maior_que_o_caminhao_e_dividido(self):
+        viagens = DespachoFrota([Transport(30, 60, 1.0)]).despachar([Pedido("diesel", 75, "R", "D")])
+        self.assertEqual([v.carga for v in viagens], [30, 30, 15])
+        self.assertEqual([v.partida for v in viagens], [0.0, 2.0, 4.0])
+        self.assertEqual(DespachoFrota.resumo(viagens)["espera_maxima"], 4.0)
+
+
+class TestFrotaSimPy(unittest.TestCase):
+
+    def test_entregas_registradas_no_historico(self):
+        env = simpy.Environment()
+        grafo = nx.DiGraph()
+        grafo.add_edge("Refinaria", "Distribuidora", capacidade=100, custo=1)
+        simulacao = Simulacao(env, grafo, rng=random.Random(0), verbose=False)
+        pedidos = [Pedido("diesel", 50, "Refinaria", "Distribuidora", liberacao=0.0),
+                   Pedido("gasolina", 10, "Refinaria", "Distribuidora", prioridade=1, liberacao=0.5)]
+        frota = simulacao.despachar_pedidos(pedidos, [Transport(30, 60, 0.9)], velocidade=60.0)
+        env.run(until=20)
+
+        entregas = simulacao.historico.tipos == EVENTO_ENTREGA
+        self.assertEqual(frota.atendidos, 2)
+        self.assertAlmostEqual(simulacao.historico.fluxos[entregas].sum(), 60 * 0.9)
+        # A gasolina, mais prioritária, passa na frente da segunda viagem de diesel
+        self.assertEqual(simulacao.historico.tempos[entregas].tolist(), [1.0, 3.0, 5.0])
+        self.assertAlmostEqual(frota.espera_maxima, 2.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
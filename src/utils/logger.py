@@ -1,11 +1,64 @@
+import json
 import logging
+import sys
+
+FORMATO_TEXTO = "%(asctime)s - %(levelname)s - %(message)s"
+
+# Atributos padrão de LogRecord; o que sobrar veio de `extra=` e vai como campo no JSON
+_ATRIBUTOS_PADRAO = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_handlers_configurados = []
+
+
+class FormatadorJSON(logging.Formatter):
+    """Uma linha JSON por registro, com os campos passados em `extra=` (ex.: aresta, tempo_sim)."""
+
+    def format(self, record):
+        evento = {
+            "tempo": self.formatTime(record),
+            "nivel": record.levelname,
+            "logger": record.name,
+            "mensagem": record.getMessage(),
+        }
+        for chave, valor in vars(record).items():
+            if chave not in _ATRIBUTOS_PADRAO:
+                evento[chave] = valor
+        if record.exc_info:
+            evento["excecao"] = self.formatException(record.exc_info)
+        return json.dumps(evento, ensure_ascii=False, default=str)
+
+
+def configurar_logging(nivel=logging.INFO, arquivo="simulacao.log", formato="texto", console=False):
+    """
+    Configura o logging do simulador. Nada é configurado na importação dos módulos:
+    quem executa (main, CLI, testes) decide destino e nível.
+
+    Pode ser chamada de novo; os handlers instalados antes são substituídos.
+
+    :param nivel: Nível mínimo (ex.: logging.INFO, logging.DEBUG)
+    :param arquivo: Arquivo de log (None = sem arquivo)
+    :param formato: "texto" ou "json" (uma linha JSON por evento)
+    :param console: Se True, também escreve no stderr
+    """
+    if formato not in ("texto", "json"):
+        raise ValueError(f"Formato de log inválido: {formato!r} (use 'texto' ou 'json')")
+    raiz = logging.getLogger()
+    for handler in _handlers_configurados:
+        raiz.removeHandler(handler)
+        handler.close()
+    _handlers_configurados.clear()
+
+    formatador = FormatadorJSON() if formato == "json" else logging.Formatter(FORMATO_TEXTO)
+    if arquivo is not None:
+        _handlers_configurados.append(logging.FileHandler(arquivo, encoding="utf-8"))
+    if console:
+        _handlers_configurados.append(logging.StreamHandler(sys.stderr))
+    for handler in _handlers_configurados:
+        handler.setFormatter(formatador)
+        raiz.addHandler(handler)
+    raiz.setLevel(nivel)
+    return raiz
 
-# Configuração do logger
-logging.basicConfig(
-    filename="simulacao.log",  # Salva os logs em um arquivo
-    level=logging.INFO,        # Define o nível de log
-    format="%(asctime)s - %(levelname)s - %(message)s"
-)
 
 def get_logger(name):
     """Retorna um logger configurado."""
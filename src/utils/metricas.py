@@ -0,0 +1,106 @@
+import json
+import time
+from functools import wraps
+
+
+class _Cronometro:
+    __slots__ = ("metricas", "nome", "inicio")
+
+    def __init__(self, metricas, nome):
+        self.metricas = metricas
+        self.nome = nome
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *excecao):
+        self.metricas.registrar_tempo(self.nome, time.perf_counter() - self.inicio)
+        return False
+
+
+class _Nulo:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        return False
+
+
+_NULO = _Nulo()
+
+
+class Metricas:
+    """
+    Contadores e cronômetros por componente (ex.: 'pipeline.calcular_fluxo', 'rotas.consulta').
+
+    Cada cronômetro acumula chamadas, tempo total e tempo máximo (s). Desativadas, as
+    chamadas retornam sem medir nada.
+    """
+
+    def __init__(self, ativo=True):
+        self.ativo = ativo
+        self.contadores = {}
+        self.tempos = {}  # nome -> [chamadas, total, máximo]
+
+    def incrementar(self, nome, n=1):
+        if self.ativo:
+            self.contadores[nome] = self.contadores.get(nome, 0) + n
+
+    def registrar_tempo(self, nome, segundos):
+        tempo = self.tempos.get(nome)
+        if tempo is None:
+            self.tempos[nome] = [1, segundos, segundos]
+        else:
+            tempo[0] += 1
+            tempo[1] += segundos
+            if segundos > tempo[2]:
+                tempo[2] = segundos
+
+    def cronometrar(self, nome):
+        """Gerenciador de contexto que soma o tempo do bloco ao cronômetro `nome`."""
+        return _Cronometro(self, nome) if self.ativo else _NULO
+
+    def medir(self, nome):
+        """Decorador que cronometra cada chamada da função."""
+        def decorador(funcao):
+            @wraps(funcao)
+            def medida(*args, **kwargs):
+                if not self.ativo:
+                    return funcao(*args, **kwargs)
+                inicio = time.perf_counter()
+                try:
+                    return funcao(*args, **kwargs)
+                finally:
+                    self.registrar_tempo(nome, time.perf_counter() - inicio)
+            return medida
+        return decorador
+
+    def zerar(self):
+        self.contadores.clear()
+        self.tempos.clear()
+
+    def instantaneo(self):
+        """Dicionário serializável com contadores e tempos (total, médio e máximo em segundos)."""
+        return {
+            "contadores": dict(sorted(self.contadores.items())),
+            "tempos": {
+                nome: {"chamadas": n, "total_s": total, "medio_s": total / n, "max_s": maximo}
+                for nome, (n, total, maximo) in sorted(self.tempos.items())
+            },
+        }
+
+    def exportar_json(self, caminho=None):
+        """Retorna as métricas em JSON e, se `caminho` for informado, grava o arquivo."""
+        texto = json.dumps(self.instantaneo(), indent=2, ensure_ascii=False)
+        if caminho is not None:
+            with open(caminho, "w", encoding="utf-8") as f:
+                f.write(texto)
+        return texto
+
+
+# Registro global usado pelos modelos e pela simulação. Começa desligado para não pesar nos
+# caminhos quentes; `main.py --perfil` e `python -m src simulate --metricas` o ligam
+metricas = Metricas(ativo=False)
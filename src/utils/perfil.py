@@ -0,0 +1,21 @@
+import cProfile
+import io
+import pstats
+
+
+def perfilar(funcao, *args, ordenar="cumulative", limite=25, caminho=None, **kwargs):
+    """
+    Executa `funcao(*args, **kwargs)` sob o cProfile para mostrar onde o tempo é gasto.
+
+    :param ordenar: Chave de ordenação do pstats ("cumulative", "tottime", ...)
+    :param limite: Número de funções listadas no relatório
+    :param caminho: Se informado, grava as estatísticas brutas (abríveis com snakeviz/pstats)
+    :return: (resultado da função, relatório em texto)
+    """
+    perfil = cProfile.Profile()
+    resultado = perfil.runcall(funcao, *args, **kwargs)
+    if caminho is not None:
+        perfil.dump_stats(caminho)
+    saida = io.StringIO()
+    pstats.Stats(perfil, stream=saida).strip_dirs().sort_stats(ordenar).print_stats(limite)
+    return resultado, saida.getvalue()
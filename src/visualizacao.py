@@ -1,35 +1,107 @@
-import numpy as np
-import matplotlib.pyplot as plt
 import networkx as nx
+import numpy as np
+
+from src.relatorios import decimar_min_max, nova_figura
+
+
+def _figura(figsize, mostrar):
+    """Figura do pyplot se for exibida na tela; caso contrário, figura Agg sem janela."""
+    if mostrar:
+        import matplotlib.pyplot as plt
+        return plt.figure(figsize=figsize)
+    return nova_figura(figsize)
+
+
+def _exibir(mostrar):
+    if mostrar:
+        import matplotlib.pyplot as plt
+        plt.show()
+
 
-def plot_fluxo_tempo(tempo, fluxo):
-    """Gera um gráfico do fluxo de petróleo ao longo do tempo."""
-    plt.figure(figsize=(10, 5))
-    plt.plot(tempo, fluxo, marker='o', linestyle='-', color='b', label="Fluxo de Petróleo")
-    plt.xlabel("Tempo (horas)")
-    plt.ylabel("Fluxo (barris/hora)")
-    plt.title("Variação do Fluxo de Petróleo no Duto")
-    plt.legend()
-    plt.grid()
-    plt.show()
-
-def plot_mapa_dutos(edges):
+def plot_fluxo_tempo(tempo, fluxo, mostrar=True, max_pontos=None):
+    """
+    Gera um gráfico do fluxo de petróleo ao longo do tempo.
+
+    :param mostrar: Se False, não abre janela (uso em lote); a figura é apenas retornada
+    :param max_pontos: Se informado, a série é decimada por mínimo/máximo antes do gráfico
+    """
+    if max_pontos is not None:
+        tempo, fluxo = decimar_min_max(tempo, fluxo, max_pontos)
+    figura = _figura((10, 5), mostrar)
+    ax = figura.add_subplot()
+    ax.plot(tempo, fluxo, marker='o', linestyle='-', color='b', label="Fluxo de Petróleo")
+    ax.set_xlabel("Tempo (horas)")
+    ax.set_ylabel("Fluxo (barris/hora)")
+    ax.set_title("Variação do Fluxo de Petróleo no Duto")
+    ax.legend()
+    ax.grid()
+    _exibir(mostrar)
+    return figura
+
+def plot_mapa_dutos(edges, mostrar=True):
     """Gera um mapa de dutos usando NetworkX."""
     G = nx.Graph()
     G.add_edges_from(edges)
 
-    plt.figure(figsize=(6, 6))
-    nx.draw(G, with_labels=True, node_color='skyblue', edge_color='gray', node_size=2000, font_size=12)
-    plt.title("Mapa da Rede de Dutos")
-    plt.show()
+    figura = _figura((6, 6), mostrar)
+    ax = figura.add_subplot()
+    nx.draw(G, ax=ax, with_labels=True, node_color='skyblue', edge_color='gray', node_size=2000, font_size=12)
+    ax.set_title("Mapa da Rede de Dutos")
+    _exibir(mostrar)
+    return figura
 
-def plot_custos_dutos(dutos, custos):
+def plot_custos_dutos(dutos, custos, mostrar=True):
     """Gera um gráfico de barras comparando os custos dos dutos."""
-    plt.figure(figsize=(8, 5))
-    plt.bar(dutos, custos, color=['red', 'blue', 'green', 'purple'])
-    plt.xlabel("Dutos")
-    plt.ylabel("Custo ($)")
-    plt.title("Comparação de Custos entre Diferentes Dutos")
-    plt.grid(axis="y")
-    plt.show()
+    figura = _figura((8, 5), mostrar)
+    ax = figura.add_subplot()
+    ax.bar(dutos, custos, color=['red', 'blue', 'green', 'purple'])
+    ax.set_xlabel("Dutos")
+    ax.set_ylabel("Custo ($)")
+    ax.set_title("Comparação de Custos entre Diferentes Dutos")
+    ax.grid(axis="y")
+    _exibir(mostrar)
+    return figura
+
+def plot_rede(grafo, mostrar=True, max_arestas=200_000, semente=0):
+    """
+    Desenha um `GrafoCompacto` com coleções do matplotlib, sem um objeto por nó ou aresta.
+
+    Usa os atributos de nó `x` e `y` quando existem (ex.: `gerar_rede_sintetica`); senão,
+    dispõe os nós em círculo. Os nós são coloridos pelo atributo `tipo`.
+
+    :param max_arestas: Acima disso, desenha uma amostra aleatória das arestas
+    """
+    from matplotlib.collections import LineCollection
+    from src.grafo_compacto import TIPOS_NO
+
+    n, m = grafo.number_of_nodes(), grafo.number_of_edges()
+    if "x" in grafo.atributos_nos and "y" in grafo.atributos_nos:
+        pontos = np.column_stack([grafo.atributos_nos["x"], grafo.atributos_nos["y"]])
+    else:
+        angulos = np.linspace(0, 2 * np.pi, n, endpoint=False)
+        pontos = np.column_stack([np.cos(angulos), np.sin(angulos)])
+
+    arestas = np.arange(m)
+    if m > max_arestas:
+        arestas = np.sort(np.random.default_rng(semente).choice(m, max_arestas, replace=False))
+    segmentos = np.stack([pontos[grafo.origens[arestas]], pontos[grafo.destinos[arestas]]], axis=1)
 
+    figura = _figura((10, 10), mostrar)
+    ax = figura.add_subplot()
+    ax.add_collection(LineCollection(segmentos, colors="gray", linewidths=0.3, alpha=0.5))
+    tipos = grafo.atributos_nos.get("tipo")
+    if tipos is None:
+        ax.scatter(pontos[:, 0], pontos[:, 1], s=4, color="skyblue")
+    else:
+        tamanhos = (40, 20, 40, 2)  # Distribuidoras são a maioria dos nós: pontos menores
+        for codigo, nome in enumerate(TIPOS_NO):
+            selecionados = tipos == codigo
+            if selecionados.any():
+                ax.scatter(pontos[selecionados, 0], pontos[selecionados, 1], s=tamanhos[codigo], label=nome, zorder=2)
+        ax.legend(loc="upper right")
+    ax.autoscale()
+    ax.set_aspect("equal")
+    amostra = f" ({len(arestas):,} de {m:,} arestas)" if len(arestas) < m else ""
+    ax.set_title(f"Rede de Transporte: {n:,} nós, {m:,} arestas{amostra}")
+    _exibir(mostrar)
+    return figura